@@ -0,0 +1,161 @@
+# Copyright 2024 Pulser Development Team
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Idempotent hashing of Pulser objects, based on their contents."""
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import struct
+import types
+from enum import Enum
+from typing import Any
+
+import numpy as np
+
+from pulser.parametrized.paramobj import ParamObj
+from pulser.register.base_register import BaseRegister
+from pulser.register.traps import Traps
+from pulser.sampler._run_length import RunLengthArray
+from pulser.waveforms import Waveform
+
+
+def static_hash(*objs: Any) -> str:
+    """Returns an idempotent hash of the contents of the given objects.
+
+    Unlike Python's standard hash, this hash does not change between
+    sessions. Objects holding the same contents get the same hash, which
+    is given as an hexstring.
+
+    Raises:
+        TypeError: If one of the objects (or of their contents) can't be
+            hashed.
+    """
+    hash_ = hashlib.sha256()
+    for obj in objs:
+        _update_hash(hash_, obj)
+    return hash_.hexdigest()
+
+
+def _digest(obj: Any) -> bytes:
+    hash_ = hashlib.sha256()
+    _update_hash(hash_, obj)
+    return hash_.digest()
+
+
+def _type_name(obj: Any) -> bytes:
+    return f"{type(obj).__module__}.{type(obj).__qualname__}".encode()
+
+
+def _update_hash(hash_: hashlib._Hash, obj: Any) -> None:
+    """Feeds an unambiguous encoding of the object's contents to the hash."""
+
+    def update(tag: bytes, *chunks: bytes) -> None:
+        hash_.update(tag)
+        for chunk in chunks:
+            # The length prefix prevents ambiguities between the chunks
+            hash_.update(struct.pack("<Q", len(chunk)))
+            hash_.update(chunk)
+
+    if obj is None:
+        update(b"N")
+    elif isinstance(obj, bool):
+        update(b"B", bytes([obj]))
+    elif isinstance(obj, int):
+        update(b"I", str(obj).encode())
+    elif isinstance(obj, float):
+        update(b"F", struct.pack("<d", obj))
+    elif isinstance(obj, complex):
+        update(b"C", struct.pack("<dd", obj.real, obj.imag))
+    elif isinstance(obj, str):
+        update(b"S", obj.encode())
+    elif isinstance(obj, bytes):
+        update(b"Y", obj)
+    elif isinstance(obj, np.generic):
+        _update_hash(hash_, obj.item())
+    elif isinstance(obj, (np.ndarray, RunLengthArray)):
+        # Run-length arrays are hashed like the equivalent dense arrays
+        arr = np.asarray(obj)
+        if arr.dtype == object:
+            update(b"O", struct.pack(f"<{arr.ndim}Q", *arr.shape))
+            for item in arr.flat:
+                _update_hash(hash_, item)
+        else:
+            update(
+                b"A",
+                arr.dtype.str.encode(),
+                struct.pack(f"<{arr.ndim}Q", *arr.shape),
+                np.ascontiguousarray(arr).tobytes(),
+            )
+    elif isinstance(obj, Enum):
+        update(b"E", _type_name(obj))
+        _update_hash(hash_, obj.value)
+    elif isinstance(
+        obj,
+        (type, types.FunctionType, types.BuiltinFunctionType, np.ufunc),
+    ):
+        update(
+            b"T",
+            str(getattr(obj, "__module__", "")).encode(),
+            getattr(obj, "__qualname__", obj.__name__).encode(),
+        )
+    elif isinstance(obj, types.MethodType):
+        update(b"M")
+        _update_hash(hash_, obj.__self__)
+        _update_hash(hash_, obj.__func__)
+    elif isinstance(obj, (list, tuple)):
+        # Named tuples also include their type
+        update(b"L" if isinstance(obj, list) else b"U", _type_name(obj))
+        hash_.update(struct.pack("<Q", len(obj)))
+        for item in obj:
+            _update_hash(hash_, item)
+    elif isinstance(obj, (set, frozenset)):
+        # The items are sorted by their own hash, since their order in the
+        # set changes between sessions
+        update(
+            b"Z",
+            struct.pack("<Q", len(obj)),
+            *sorted(_digest(item) for item in obj),
+        )
+    elif isinstance(obj, dict):
+        update(
+            b"D",
+            struct.pack("<Q", len(obj)),
+            *sorted(_digest(key) + _digest(val) for key, val in obj.items()),
+        )
+    elif isinstance(obj, slice):
+        update(b"X")
+        _update_hash(hash_, (obj.start, obj.stop, obj.step))
+    elif isinstance(obj, BaseRegister):
+        # The hash of the coordinates doesn't include the qubit IDs
+        update(b"R", _type_name(obj), obj._safe_hash())
+        _update_hash(hash_, (obj.qubit_ids, obj.qubits, obj.layout))
+    elif isinstance(obj, Traps):
+        update(b"H", _type_name(obj), obj._safe_hash())
+    elif isinstance(obj, Waveform):
+        update(b"W", _type_name(obj))
+        _update_hash(hash_, obj.samples)
+    elif isinstance(obj, ParamObj):
+        # Leaves out the state of the last build
+        update(b"P")
+        _update_hash(hash_, (obj.cls, obj.args, obj.kwargs))
+    elif dataclasses.is_dataclass(obj):
+        update(b"K", _type_name(obj))
+        for field in dataclasses.fields(obj):
+            update(b"", field.name.encode())
+            _update_hash(hash_, getattr(obj, field.name))
+    elif hasattr(obj, "__dict__"):
+        update(b"V", _type_name(obj))
+        _update_hash(hash_, vars(obj))
+    else:
+        raise TypeError(f"Can't compute a static hash for {type(obj)}.")
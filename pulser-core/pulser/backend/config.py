@@ -19,6 +19,7 @@ from typing import Any, Literal, Sequence, get_args
 
 import numpy as np
 
+from pulser._hashing import static_hash
 from pulser.backend.noise_model import NoiseModel
 
 EVAL_TIMES_LITERAL = Literal["Full", "Minimal", "Final"]
@@ -34,6 +35,14 @@ class BackendConfig:
 
     backend_options: dict[str, Any] = field(default_factory=dict)
 
+    def static_hash(self) -> str:
+        """Returns the idempotent hash of the configuration's contents.
+
+        Returns:
+            str: An hexstring encoding the hash.
+        """
+        return static_hash(self)
+
 
 @dataclass(frozen=True)
 class EmulatorConfig(BackendConfig):
@@ -24,6 +24,10 @@ NOISE_TYPES = Literal[
     "doppler", "amplitude", "SPAM", "dephasing", "depolarizing", "eff_noise"
 ]
 
+NOISE_SAMPLERS = Literal[
+    "random", "stratified", "sobol", "halton", "antithetic"
+]
+
 
 @dataclass(frozen=True)
 class NoiseModel:
@@ -80,6 +84,20 @@ class NoiseModel:
         eff_noise_probs: (Deprecated) The rate associated to each effective
             noise operator (in rad/µs). Use `eff_noise_rate` instead.
         eff_noise_opers: The operators for the effective noise model.
+        noise_sampler: How the random noise parameters of the runs (the
+            badly prepared atoms, the Doppler detunings and the amplitude
+            fluctuations) are drawn. Available options:
+
+            - "random": Independently at random for each run.
+            - "stratified": Using a Latin hypercube, so that each parameter
+              takes values in every quantile of its distribution.
+            - "sobol": Using a scrambled Sobol' sequence.
+            - "halton": Using a scrambled Halton sequence.
+            - "antithetic": In pairs of runs whose parameters mirror each
+              other with respect to the median of their distribution.
+
+            Except for "random", the runs are not independent, which makes
+            the averages over them converge faster.
     """
 
     noise_types: tuple[NOISE_TYPES, ...] = ()
@@ -98,6 +116,7 @@ class NoiseModel:
     dephasing_prob: float | None = None
     depolarizing_prob: float | None = None
     eff_noise_probs: list[float] = field(default_factory=list)
+    noise_sampler: NOISE_SAMPLERS = "random"
 
     def __post_init__(self) -> None:
         default_field_value = {
@@ -173,6 +192,12 @@ class NoiseModel:
 
         self._check_noise_types()
         self._check_eff_noise()
+        if self.noise_sampler not in get_args(NOISE_SAMPLERS):
+            raise ValueError(
+                f"'{self.noise_sampler}' is not a valid noise sampler. "
+                + "Valid noise samplers: "
+                + ", ".join(get_args(NOISE_SAMPLERS))
+            )
 
     def _change_attribute(self, attr_name: str, new_value: Any) -> None:
         object.__setattr__(self, attr_name, new_value)
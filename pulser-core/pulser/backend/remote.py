@@ -60,6 +60,8 @@ class RemoteResults(Results):
             status and fetch the results.
     """
 
+    _results: tuple[Result, ...]
+
     def __init__(self, submission_id: str, connection: RemoteConnection):
         """Instantiates a new collection of remote results."""
         self._submission_id = submission_id
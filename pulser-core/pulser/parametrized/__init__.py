@@ -16,5 +16,6 @@
 from pulser.parametrized.paramabc import Parametrized
 from pulser.parametrized.paramobj import ParamObj
 from pulser.parametrized.variable import Variable
+from pulser.parametrized.plan import EvaluationPlan
 
-__all__ = ["Parametrized", "ParamObj", "Variable"]
+__all__ = ["Parametrized", "ParamObj", "Variable", "EvaluationPlan"]
@@ -0,0 +1,327 @@
+# Copyright 2024 Pulser Development Team
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compiles parametrized objects into flat evaluation plans."""
+
+from __future__ import annotations
+
+import collections.abc as abc  # To use collections.abc.Sequence
+import operator
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from numbers import Number
+from typing import Any, Optional, Union, cast
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from pulser.parametrized.paramabc import Parametrized
+from pulser.parametrized.paramobj import ParamObj
+from pulser.parametrized.variable import Variable, VariableItem
+
+# The element-wise operations that can be applied to a whole batch at once
+_VECTORIZABLE: frozenset[Callable] = frozenset(
+    {
+        operator.neg,
+        operator.abs,
+        operator.add,
+        operator.sub,
+        operator.mul,
+        operator.truediv,
+        operator.pow,
+        operator.mod,
+        np.ceil,
+        np.floor,
+        np.round,
+        np.sqrt,
+        np.exp,
+        np.log2,
+        np.log,
+        np.sin,
+        np.cos,
+        np.tan,
+    }
+)
+
+
+@dataclass(frozen=True)
+class _Ref:
+    """A reference to the value computed by a previous step of the plan."""
+
+    index: int
+
+
+@dataclass(frozen=True)
+class _Step:
+    """A single step of an evaluation plan.
+
+    Calls ``func(*args, **kwargs)`` after replacing every ``_Ref`` by the
+    value it points to. A step without a function reads the value of the
+    variable named ``var``.
+    """
+
+    func: Union[Callable, _Ref, None]
+    args: tuple[Any, ...] = ()
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    var: Optional[str] = None
+    vectorizable: bool = False
+
+
+def _get_item(value: Any, key: Union[int, slice, abc.Sequence[int]]) -> Any:
+    """Gets the items of a variable's value, like ``VariableItem.build()``."""
+    if isinstance(key, abc.Sequence):
+        return [value[k] for k in key]
+    return value[key]
+
+
+class EvaluationPlan:
+    """A flat evaluation plan for a collection of parametrized objects.
+
+    The plan lists, in dependency order, every distinct node of the
+    expression trees of the given objects, so that each of them is computed
+    exactly once per evaluation. Unlike ``Parametrized.build()``, evaluating
+    a plan does not rely on the values assigned to the variables and is
+    therefore safe to use from multiple threads at once.
+
+    Args:
+        objects: The objects to evaluate. Objects that are not parametrized
+            are returned unchanged.
+    """
+
+    def __init__(self, objects: Iterable[Any]):
+        """Compiles the plan for the given objects."""
+        self._steps: list[_Step] = []
+        self._variables: dict[str, Variable] = {}
+        self._outputs: list[Any] = []
+        memo: dict[int, _Ref] = {}
+        for obj in objects:
+            self._outputs.append(
+                self._compile(obj, memo)
+                if isinstance(obj, Parametrized)
+                else obj
+            )
+
+    @property
+    def variables(self) -> dict[str, Variable]:
+        """The variables involved in the plan."""
+        return dict(self._variables)
+
+    @property
+    def num_steps(self) -> int:
+        """The number of steps in the plan."""
+        return len(self._steps)
+
+    def _add_step(self, step: _Step) -> _Ref:
+        self._steps.append(step)
+        return _Ref(len(self._steps) - 1)
+
+    def _compile(self, obj: Parametrized, memo: dict[int, _Ref]) -> _Ref:
+        if id(obj) in memo:
+            return memo[id(obj)]
+
+        def compile_arg(arg: Any) -> Any:
+            if isinstance(arg, Parametrized):
+                return self._compile(arg, memo)
+            return arg
+
+        if isinstance(obj, Variable):
+            self._variables[obj.name] = obj
+            ref = self._add_step(_Step(None, var=obj.name, vectorizable=True))
+        elif isinstance(obj, VariableItem):
+            ref = self._add_step(
+                _Step(
+                    _get_item,
+                    (compile_arg(obj.var), obj.key),
+                    # Indexing with a sequence of keys returns a list
+                    vectorizable=not isinstance(obj.key, abc.Sequence),
+                )
+            )
+        elif isinstance(obj, ParamObj):
+            func = compile_arg(obj.cls)
+            args = tuple(compile_arg(arg) for arg in obj.args)
+            ref = self._add_step(
+                _Step(
+                    func,
+                    args,
+                    {key: compile_arg(val) for key, val in obj.kwargs.items()},
+                    vectorizable=isinstance(func, abc.Hashable)
+                    and func in _VECTORIZABLE
+                    and not obj.kwargs
+                    and all(
+                        isinstance(arg, (_Ref, Number, np.ndarray))
+                        for arg in args
+                    ),
+                )
+            )
+        else:
+            raise TypeError(
+                f"Can't compile an evaluation plan for {type(obj)}."
+            )
+        memo[id(obj)] = ref
+        return ref
+
+    def _validate_vars(self, vars: Mapping[str, Any]) -> None:
+        missing_vars = self._variables.keys() - vars.keys()
+        if missing_vars:
+            raise TypeError(
+                "Did not receive values for variables: "
+                + ", ".join(sorted(missing_vars))
+            )
+
+    def evaluate(
+        self, vars: Mapping[str, Union[ArrayLike, float, int]]
+    ) -> list[Any]:
+        """Evaluates the plan for a single set of variable values.
+
+        Args:
+            vars: The value of each variable, by name. Values given to
+                variables that are not part of the plan are ignored.
+
+        Returns:
+            The built objects, in the order they were given to the plan.
+        """
+        self._validate_vars(vars)
+        values: list[Any] = []
+
+        def resolve(arg: Any) -> Any:
+            return values[arg.index] if isinstance(arg, _Ref) else arg
+
+        for step in self._steps:
+            if step.var is not None:
+                values.append(
+                    self._variables[step.var]._validate_value(vars[step.var])
+                )
+                continue
+            func = resolve(step.func)
+            values.append(
+                func(
+                    *(resolve(arg) for arg in step.args),
+                    **{key: resolve(val) for key, val in step.kwargs.items()},
+                )
+            )
+        return [resolve(out) for out in self._outputs]
+
+    def evaluate_batch(
+        self, vars: Mapping[str, abc.Sequence[Union[ArrayLike, float, int]]]
+    ) -> list[list[Any]]:
+        """Evaluates the plan for a batch of variable values.
+
+        The element-wise arithmetic on the variables is computed at once for
+        the whole batch, while the remaining steps (e.g. the instantiation of
+        waveforms and pulses) are called once per element.
+
+        Args:
+            vars: The values of each variable, by name, as a sequence with
+                one value per element of the batch. All variables must have
+                the same number of values.
+
+        Returns:
+            For each element of the batch, the built objects in the order
+            they were given to the plan.
+        """
+        self._validate_vars(vars)
+        batch_sizes = {len(vars[name]) for name in self._variables}
+        if len(batch_sizes) > 1:
+            raise ValueError(
+                "All variables must be given the same number of values."
+            )
+        # Without variables, the batch holds a single element
+        batch_size = batch_sizes.pop() if batch_sizes else 1
+        if batch_size == 0:
+            return []
+
+        # Each value is either stored for the whole batch in a single array
+        # (whose first axis is the batch axis) or as one value per element
+        batched: list[Optional[np.ndarray]] = []
+        elements: list[Optional[list[Any]]] = []
+
+        def get_elements(ref: _Ref) -> list[Any]:
+            if elements[ref.index] is None:
+                arr = batched[ref.index]
+                assert arr is not None
+                elements[ref.index] = list(arr)
+            return elements[ref.index]  # type: ignore[return-value]
+
+        def resolve(arg: Any, i: int) -> Any:
+            return get_elements(arg)[i] if isinstance(arg, _Ref) else arg
+
+        for step in self._steps:
+            if step.var is not None:
+                var = self._variables[step.var]
+                batched.append(
+                    np.stack([var._validate_value(v) for v in vars[step.var]])
+                )
+                elements.append(None)
+                continue
+
+            refs = [arg for arg in step.args if isinstance(arg, _Ref)]
+            if step.vectorizable and all(
+                batched[ref.index] is not None for ref in refs
+            ):
+                batched.append(self._apply_vectorized(step, batched))
+                elements.append(None)
+                continue
+
+            batched.append(None)
+            elements.append(
+                [
+                    resolve(step.func, i)(
+                        *(resolve(arg, i) for arg in step.args),
+                        **{
+                            key: resolve(val, i)
+                            for key, val in step.kwargs.items()
+                        },
+                    )
+                    for i in range(batch_size)
+                ]
+            )
+
+        return [
+            [resolve(out, i) for out in self._outputs]
+            for i in range(batch_size)
+        ]
+
+    @staticmethod
+    def _apply_vectorized(
+        step: _Step, batched: list[Optional[np.ndarray]]
+    ) -> np.ndarray:
+        if step.func is _get_item:
+            var_ref, key = step.args
+            values = batched[var_ref.index]
+            assert values is not None
+            return cast(np.ndarray, values[:, key])
+        # The values of the elements are aligned on their last axes, so the
+        # batch axis is kept first by padding the elements' shapes with ones
+        args = [
+            batched[arg.index] if isinstance(arg, _Ref) else arg
+            for arg in step.args
+        ]
+        elem_ndim = max(
+            (
+                np.ndim(arg) - isinstance(step_arg, _Ref)
+                for arg, step_arg in zip(args, step.args)
+            ),
+            default=0,
+        )
+        aligned = [
+            arg.reshape(
+                arg.shape[:1]
+                + (1,) * (elem_ndim + 1 - arg.ndim)
+                + arg.shape[1:]
+            )
+            if isinstance(step_arg, _Ref)
+            else arg
+            for arg, step_arg in zip(args, step.args)
+        ]
+        assert callable(step.func)
+        return np.asarray(step.func(*aligned))
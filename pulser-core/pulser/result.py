@@ -18,15 +18,23 @@ import collections.abc
 import typing
 from abc import ABC, abstractmethod
 from collections import Counter
+from collections.abc import Mapping
 from dataclasses import dataclass
-from typing import Any, TypeVar, overload
+from typing import Any, TypeVar, cast, overload
 
 import matplotlib.pyplot as plt
 import numpy as np
+from numpy.typing import ArrayLike
 
 from pulser.register import QubitId
 
-__all__ = ["Result", "SampledResult", "Results", "ResultType"]
+__all__ = [
+    "BitstringCounts",
+    "Result",
+    "SampledResult",
+    "Results",
+    "ResultType",
+]
 
 
 @dataclass
@@ -45,12 +53,8 @@ class Result(ABC):
                 represent the measured states.
             meas_basis: The measurement basis.
         """
-        n = self._size
-        return {
-            np.binary_repr(ind, width=n): prob
-            for ind, prob in enumerate(self._weights())
-            if prob != 0
-        }
+        bits, probs = self._sparse_weights()
+        return dict(zip(_bits_to_strings(bits), probs))
 
     @property
     @abstractmethod
@@ -70,6 +74,21 @@ class Result(ABC):
         """The sampling rate for every state in an ordered array."""
         pass
 
+    def _sparse_weights(self) -> tuple[np.ndarray, np.ndarray]:
+        """The non-zero sampling rates, along with their bitstrings.
+
+        Unlike ``_weights()``, its size grows with the number of possible
+        outcomes instead of the number of states.
+
+        Returns:
+            The bitstrings, as an array of bits of shape (K, size) in
+            increasing order, and the sampling rate of each of them.
+        """
+        weights = self._weights()
+        inds = np.flatnonzero(weights)
+        bits = (inds[:, np.newaxis] >> np.arange(self._size)[::-1]) & 1
+        return bits.astype(np.uint8), weights[inds]
+
     def get_samples(self, n_samples: int) -> Counter[str]:
         """Takes multiple samples from the sampling distribution.
 
@@ -79,13 +98,28 @@ class Result(ABC):
         Returns:
             Samples of bitstrings corresponding to measured quantum states.
         """
-        dist = np.random.multinomial(n_samples, self._weights())
-        return Counter(
-            {
-                np.binary_repr(i, self._size): dist[i]
-                for i in np.nonzero(dist)[0]
-            }
-        )
+        return self.get_packed_samples(n_samples).to_counter()
+
+    def get_packed_samples(self, n_samples: int) -> BitstringCounts:
+        """Takes multiple samples from the sampling distribution.
+
+        Unlike `get_samples()`, the bitstrings are never converted to
+        strings.
+
+        Args:
+            n_samples: Number of samples to return.
+
+        Returns:
+            The counts of the sampled bitstrings.
+        """
+        bits, probs = self._sparse_weights()
+        if len(bits) == 0 or not bits[-1].all():
+            # With an extra last outcome of zero probability, the samples
+            # are the same as when drawn from the weights of all the states
+            probs = np.append(probs, 0.0)
+        dist = np.random.multinomial(n_samples, probs)[: len(bits)]
+        sampled = np.flatnonzero(dist)
+        return BitstringCounts(bits[sampled], dist[sampled], size=self._size)
 
     def get_state(self) -> Any:
         """Gets the quantum state associated with the result.
@@ -160,6 +194,288 @@ class SampledResult(Result):
             weights[int(bitstr, base=2)] = counts / self.n_samples
         return weights / sum(weights)
 
+    @property
+    def packed_counts(self) -> BitstringCounts:
+        """The number of times each bitstring was measured, packed."""
+        return BitstringCounts.from_counter(
+            self.bitstring_counts, size=self._size
+        )
+
+    def _sparse_weights(self) -> tuple[np.ndarray, np.ndarray]:
+        # Only goes through the measured bitstrings, in increasing order
+        bitstrings = sorted(
+            bitstr
+            for bitstr, counts in self.bitstring_counts.items()
+            if counts != 0
+        )
+        weights = (
+            np.array([self.bitstring_counts[b] for b in bitstrings])
+            / self.n_samples
+        )
+        return _bits_from_strings(bitstrings, self._size), weights / sum(
+            weights
+        )
+
+
+class BitstringCounts:
+    """The counts of measured bitstrings, packed into integers.
+
+    Each distinct bitstring is stored once, as ``ceil(size / 64)`` unsigned
+    64-bit integers (the first bit being the most significant one), along
+    with the number of times it was measured. Unlike a ``Counter[str]``,
+    it can be processed without going through the strings of the bitstrings.
+
+    Args:
+        bits: The measured bitstrings, as an array of 0s and 1s with one
+            bitstring per row. The same bitstring can appear in multiple
+            rows, in which case its counts are added.
+        counts: The number of times the bitstring of each row was
+            measured. Defaults to once per row.
+        size: The number of bits of each bitstring. Only needed when
+            there are no bitstrings.
+    """
+
+    def __init__(
+        self,
+        bits: ArrayLike,
+        counts: ArrayLike | None = None,
+        size: int | None = None,
+    ):
+        """Initializes the counts of the given bitstrings."""
+        bits = np.asarray(bits)
+        if bits.ndim != 2 or (size is not None and bits.shape[1] != size):
+            raise ValueError(
+                "`bits` must be a 2D array with one bitstring per row, not "
+                f"an array of shape {bits.shape}."
+            )
+        if not np.all((bits == 0) | (bits == 1)):
+            raise ValueError("`bits` must only hold 0s and 1s.")
+        counts = (
+            np.ones(len(bits), dtype=np.int64)
+            if counts is None
+            else np.asarray(counts, dtype=np.int64)
+        )
+        if counts.shape != (len(bits),):
+            raise ValueError(
+                "There must be one count per bitstring, not "
+                f"{counts.shape} counts for {len(bits)} bitstrings."
+            )
+        self._size = bits.shape[1]
+        # Sorts and merges the distinct bitstrings, dropping those that
+        # were never measured
+        packed = _pack_bits(bits, self._size)
+        if packed.shape[1] == 1:
+            # A single word per bitstring is much faster to sort in 1D
+            words = packed[:, 0]
+            if np.all(words[1:] > words[:-1]):
+                # Already sorted and distinct
+                merged_counts = counts
+            else:
+                words, inverse = np.unique(words, return_inverse=True)
+                merged_counts = np.bincount(
+                    inverse, weights=counts, minlength=len(words)
+                ).astype(np.int64)
+            packed = words[:, np.newaxis]
+        else:
+            packed, inverse = np.unique(packed, axis=0, return_inverse=True)
+            merged_counts = np.zeros(len(packed), dtype=np.int64)
+            np.add.at(merged_counts, inverse.ravel(), counts)
+        measured = merged_counts != 0
+        self._packed: np.ndarray = packed[measured]
+        self._counts: np.ndarray = merged_counts[measured]
+
+    @classmethod
+    def from_counter(
+        cls, counter: Mapping[str, int], size: int | None = None
+    ) -> BitstringCounts:
+        """Packs the counts of bitstrings given as strings.
+
+        Args:
+            counter: The number of times each bitstring was measured.
+            size: The number of bits of each bitstring. Only needed when
+                there are no bitstrings.
+        """
+        bitstrings = list(counter)
+        if size is None:
+            if not bitstrings:
+                raise ValueError(
+                    "The `size` of the bitstrings must be given when there "
+                    "are none."
+                )
+            size = len(bitstrings[0])
+        return cls(
+            _bits_from_strings(bitstrings, size),
+            [counter[b] for b in bitstrings],
+            size=size,
+        )
+
+    @classmethod
+    def from_ints(
+        cls, ints: ArrayLike, counts: ArrayLike | None = None, *, size: int
+    ) -> BitstringCounts:
+        """Creates the counts of bitstrings given by their integer values.
+
+        Args:
+            ints: The integer value of each measured bitstring (the first
+                bit being the most significant one).
+            counts: The number of times each bitstring was measured.
+                Defaults to once per value.
+            size: The number of bits of each bitstring, at most 64.
+        """
+        if not 0 < size <= 64:
+            raise ValueError(
+                "Only bitstrings of 1 to 64 bits can be given as integers."
+            )
+        ints = np.asarray(ints, dtype=np.uint64).reshape(-1, 1)
+        shifts = np.arange(size - 1, -1, -1, dtype=np.uint64)
+        return cls((ints >> shifts) & np.uint64(1), counts, size=size)
+
+    @property
+    def size(self) -> int:
+        """The number of bits of each bitstring."""
+        return self._size
+
+    @property
+    def ints(self) -> np.ndarray:
+        """The integer value of each distinct bitstring, in increasing order.
+
+        Only defined for bitstrings of at most 64 bits.
+        """
+        if self._size > 64:
+            raise ValueError(
+                "Only bitstrings of at most 64 bits can be given as integers."
+            )
+        return cast(
+            np.ndarray, self._packed[:, 0] >> np.uint64(64 - self._size)
+        )
+
+    @property
+    def packed(self) -> np.ndarray:
+        """The distinct bitstrings in increasing order, packed.
+
+        An array of unsigned 64-bit integers, of shape
+        (len(self), ceil(size / 64)).
+        """
+        return self._packed
+
+    @property
+    def counts(self) -> np.ndarray:
+        """The number of times each distinct bitstring was measured."""
+        return self._counts
+
+    @property
+    def bits(self) -> np.ndarray:
+        """The distinct bitstrings, as an array of bits of shape (K, size)."""
+        return np.unpackbits(
+            self._packed.astype(">u8").view(np.uint8), axis=1
+        )[:, : self._size]
+
+    @property
+    def n_samples(self) -> int:
+        """The total number of measured bitstrings."""
+        return int(np.sum(self._counts))
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __eq__(self, other: Any) -> bool:
+        return (
+            isinstance(other, BitstringCounts)
+            and self._size == other._size
+            and np.array_equal(self._packed, other._packed)
+            and np.array_equal(self._counts, other._counts)
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"BitstringCounts(size={self._size}, "
+            f"n_samples={self.n_samples}, n_bitstrings={len(self)})"
+        )
+
+    def to_counter(self) -> Counter[str]:
+        """Converts the counts to a Counter of bitstrings as strings."""
+        return Counter(dict(zip(_bits_to_strings(self.bits), self._counts)))
+
+    def probabilities(self) -> np.ndarray:
+        """The sampling rate of each distinct bitstring."""
+        return cast(np.ndarray, self._counts / self.n_samples)
+
+    def marginal(
+        self, indices: collections.abc.Sequence[int]
+    ) -> BitstringCounts:
+        """The counts of the bitstrings restricted to some of their bits.
+
+        Args:
+            indices: The indices of the bits to keep, in the order in which
+                they appear in the new bitstrings.
+        """
+        return BitstringCounts(
+            self.bits[:, list(indices)], self._counts, size=len(indices)
+        )
+
+    def mean(self) -> np.ndarray:
+        """The rate at which each bit was measured as 1."""
+        return cast(np.ndarray, self._counts @ self.bits / self.n_samples)
+
+    def correlation(self) -> np.ndarray:
+        """The rate at which each pair of bits was measured as 1 together.
+
+        Returns:
+            A (size, size) array whose entry (i, j) is the rate at which
+            bits i and j were both measured as 1 (its diagonal being the
+            `mean()`).
+        """
+        bits = self.bits.astype(float)
+        return cast(
+            np.ndarray, (bits.T * self._counts) @ bits / self.n_samples
+        )
+
+    def most_common(self, n: int | None = None) -> list[tuple[str, int]]:
+        """Lists the n most measured bitstrings, with their counts.
+
+        Only these bitstrings are converted to strings.
+
+        Args:
+            n: The number of bitstrings to list. Defaults to all of them.
+
+        Returns:
+            The bitstrings and their counts, from the most measured to the
+            least, like ``Counter.most_common()``.
+        """
+        order = np.argsort(-self._counts, kind="stable")[:n]
+        return list(
+            zip(
+                _bits_to_strings(self.bits[order]),
+                self._counts[order].tolist(),
+            )
+        )
+
+
+def _pack_bits(bits: np.ndarray, size: int) -> np.ndarray:
+    """Packs an array of bits of shape (K, size) into uint64 words."""
+    n_words = max(1, -(-size // 64))
+    padded = np.zeros((len(bits), 64 * n_words), dtype=np.uint8)
+    padded[:, :size] = bits
+    return cast(
+        np.ndarray,
+        np.packbits(padded, axis=1).view(">u8").astype(np.uint64),
+    )
+
+
+def _bits_from_strings(
+    bitstrings: collections.abc.Sequence[str], size: int
+) -> np.ndarray:
+    """Converts bitstrings into an array of bits of shape (K, size)."""
+    chars = np.frombuffer("".join(bitstrings).encode("ascii"), dtype=np.uint8)
+    return cast(np.ndarray, chars.reshape(len(bitstrings), size) - ord("0"))
+
+
+def _bits_to_strings(bits: np.ndarray) -> list[str]:
+    """Converts an array of bits of shape (K, size) into bitstrings."""
+    size = bits.shape[1]
+    chars = (bits.astype(np.uint8) + ord("0")).tobytes().decode("ascii")
+    return [chars[i : i + size] for i in range(0, len(chars), size)]
+
 
 ResultType = TypeVar("ResultType", bound=Result)
 
@@ -167,7 +483,7 @@ ResultType = TypeVar("ResultType", bound=Result)
 class Results(typing.Sequence[ResultType]):
     """An immutable sequence of results."""
 
-    _results: tuple[ResultType, ...]
+    _results: typing.Sequence[ResultType]
 
     @overload
     def __getitem__(self, key: int) -> ResultType:
@@ -180,6 +496,8 @@ class Results(typing.Sequence[ResultType]):
     def __getitem__(
         self, key: int | slice
     ) -> ResultType | tuple[ResultType, ...]:
+        if isinstance(key, slice):
+            return tuple(self._results[key])
         return self._results[key]
 
     def __len__(self) -> int:
@@ -18,3 +18,4 @@ The samples of a sequence are organized in channels and are used for
 plotting and simulation.
 """
 from pulser.sampler.sampler import sample as sample
+from pulser.sampler.sampler import sample_batch as sample_batch
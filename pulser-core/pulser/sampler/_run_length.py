@@ -0,0 +1,240 @@
+"""A run-length encoded array, used to store compressed samples."""
+from __future__ import annotations
+
+import operator
+from numbers import Number
+from typing import Any, Callable, Iterable, Optional, Union, cast
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+
+class RunLengthArray:
+    """A one-dimensional array stored as runs of repeated values.
+
+    Consecutive runs always hold different values, so a constant array takes
+    a single run regardless of its size. Slicing and arithmetic with scalars
+    or other run-length arrays keep the encoding, while any other operation
+    goes through the dense array (obtained with ``np.asarray()``).
+
+    Args:
+        values: The value of each run (real or complex).
+        run_ends: The (exclusive) index at which each run ends, in
+            non-decreasing order.
+    """
+
+    def __init__(self, values: ArrayLike, run_ends: ArrayLike):
+        """Initializes a new run-length array."""
+        values = np.array(values, ndmin=1)
+        if not np.iscomplexobj(values):
+            values = values.astype(float)
+        run_ends = np.array(run_ends, dtype=int, ndmin=1)
+        if values.shape != run_ends.shape or values.ndim != 1:
+            raise ValueError(
+                "'values' and 'run_ends' must be 1D arrays of the same size."
+            )
+        lengths = np.diff(run_ends, prepend=0)
+        if np.any(lengths < 0):
+            raise ValueError("'run_ends' must be in non-decreasing order.")
+        # Drops the empty runs and merges the runs of equal values
+        values, run_ends = values[lengths > 0], run_ends[lengths > 0]
+        last_of_value = np.ones(values.size, dtype=bool)
+        last_of_value[:-1] = values[1:] != values[:-1]
+        self.values: np.ndarray = values[last_of_value]
+        self.run_ends: np.ndarray = run_ends[last_of_value]
+
+    @classmethod
+    def full(cls, size: int, value: float) -> RunLengthArray:
+        """Creates an array of a given size filled with a single value."""
+        return cls([value], [size])
+
+    @classmethod
+    def zeros(cls, size: int) -> RunLengthArray:
+        """Creates an array of zeros of a given size."""
+        return cls.full(size, 0.0)
+
+    @classmethod
+    def from_array(cls, array: ArrayLike) -> RunLengthArray:
+        """Compresses a dense one-dimensional array."""
+        array = np.asarray(array)
+        if array.ndim != 1:
+            raise ValueError("Only 1D arrays can be run-length encoded.")
+        if array.size == 0:
+            return cls([], [])
+        run_ends = np.append(np.flatnonzero(array[1:] != array[:-1]) + 1, 0)
+        run_ends[-1] = array.size
+        return cls(array[run_ends - 1], run_ends)
+
+    @classmethod
+    def concatenate(cls, arrays: Iterable[RunLengthArray]) -> RunLengthArray:
+        """Joins a sequence of run-length arrays."""
+        values, run_ends, offset = [], [], 0
+        for arr in arrays:
+            values.append(arr.values)
+            run_ends.append(arr.run_ends + offset)
+            offset += arr.size
+        if not values:
+            return cls([], [])
+        return cls(np.concatenate(values), np.concatenate(run_ends))
+
+    @property
+    def size(self) -> int:
+        """The number of elements in the array."""
+        return int(self.run_ends[-1]) if self.run_ends.size else 0
+
+    @property
+    def shape(self) -> tuple[int]:
+        """The shape of the equivalent dense array."""
+        return (self.size,)
+
+    @property
+    def ndim(self) -> int:
+        """The number of dimensions of the array (always 1)."""
+        return 1
+
+    @property
+    def dtype(self) -> np.dtype:
+        """The data type of the elements."""
+        return cast(np.dtype, self.values.dtype)
+
+    @property
+    def run_lengths(self) -> np.ndarray:
+        """The number of elements in each run."""
+        return np.diff(self.run_ends, prepend=0)
+
+    def to_array(self) -> np.ndarray:
+        """Expands the runs into a dense array."""
+        return np.repeat(self.values, self.run_lengths)
+
+    def copy(self) -> RunLengthArray:
+        """Returns a copy of the array."""
+        return RunLengthArray(self.values, self.run_ends)
+
+    def count_nonzero(self) -> int:
+        """Counts the number of non-zero elements."""
+        return int(np.sum(self.run_lengths[self.values != 0]))
+
+    def take(self, indices: ArrayLike) -> np.ndarray:
+        """Gets the elements at the given (non-negative) indices."""
+        return self.values[
+            np.searchsorted(self.run_ends, indices, side="right")
+        ]
+
+    def __array__(self, dtype: Optional[Any] = None) -> np.ndarray:
+        arr = self.to_array()
+        return arr if dtype is None else arr.astype(dtype)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Any:
+        return iter(self.to_array())
+
+    def __repr__(self) -> str:
+        return (
+            f"RunLengthArray(values={self.values!r}, "
+            f"run_ends={self.run_ends!r})"
+        )
+
+    def _slice(self, start: int, stop: int) -> RunLengthArray:
+        if stop <= start:
+            return RunLengthArray([], [])
+        first = np.searchsorted(self.run_ends, start, side="right")
+        last = np.searchsorted(self.run_ends, stop, side="left")
+        return RunLengthArray(
+            self.values[first : last + 1],
+            np.minimum(self.run_ends[first : last + 1], stop) - start,
+        )
+
+    def _contiguous_slice(self, key: slice) -> Optional[tuple[int, int]]:
+        start, stop, step = key.indices(self.size)
+        return (start, max(start, stop)) if step == 1 else None
+
+    def __getitem__(self, key: Any) -> Any:
+        if isinstance(key, (int, np.integer)):
+            index = int(key) + (self.size if key < 0 else 0)
+            if not 0 <= index < self.size:
+                raise IndexError(
+                    f"Index {key} is out of bounds for size {self.size}."
+                )
+            return self.values[
+                np.searchsorted(self.run_ends, index, side="right")
+            ]
+        if isinstance(key, slice) and (bounds := self._contiguous_slice(key)):
+            return self._slice(*bounds)
+        return self.to_array()[key]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        bounds = (
+            self._contiguous_slice(key) if isinstance(key, slice) else None
+        )
+        if bounds is None:
+            arr = self.to_array()
+            arr[key] = np.asarray(value)
+            new = RunLengthArray.from_array(arr)
+        else:
+            start, stop = bounds
+            if np.ndim(value) == 0:
+                value = RunLengthArray.full(stop - start, float(value))
+            elif not isinstance(value, RunLengthArray):
+                value = RunLengthArray.from_array(
+                    np.broadcast_to(value, (stop - start,))
+                )
+            if value.size != stop - start:
+                raise ValueError(
+                    f"Can't assign {value.size} elements to a slice of "
+                    f"{stop - start} elements."
+                )
+            new = RunLengthArray.concatenate(
+                [self._slice(0, start), value, self._slice(stop, self.size)]
+            )
+        self.values, self.run_ends = new.values, new.run_ends
+
+    def _apply(
+        self, other: Any, op: Callable[[Any, Any], Any], reflected: bool
+    ) -> Union[RunLengthArray, np.ndarray]:
+        def call(a: Any, b: Any) -> Any:
+            return op(b, a) if reflected else op(a, b)
+
+        if isinstance(other, Number):
+            return RunLengthArray(call(self.values, other), self.run_ends)
+        if isinstance(other, RunLengthArray):
+            if other.size != self.size:
+                raise ValueError(
+                    "Can't operate on run-length arrays of different sizes "
+                    f"({self.size} and {other.size})."
+                )
+            # Each run of the result ends at a run end of either operand
+            run_ends = np.union1d(self.run_ends, other.run_ends)
+            return RunLengthArray(
+                call(
+                    self.values[np.searchsorted(self.run_ends, run_ends)],
+                    other.values[np.searchsorted(other.run_ends, run_ends)],
+                ),
+                run_ends,
+            )
+        return np.asarray(call(self.to_array(), other))
+
+    def __add__(self, other: Any) -> Any:
+        return self._apply(other, operator.add, False)
+
+    def __radd__(self, other: Any) -> Any:
+        return self._apply(other, operator.add, True)
+
+    def __sub__(self, other: Any) -> Any:
+        return self._apply(other, operator.sub, False)
+
+    def __rsub__(self, other: Any) -> Any:
+        return self._apply(other, operator.sub, True)
+
+    def __mul__(self, other: Any) -> Any:
+        return self._apply(other, operator.mul, False)
+
+    def __rmul__(self, other: Any) -> Any:
+        return self._apply(other, operator.mul, True)
+
+    def __truediv__(self, other: Any) -> Any:
+        return self._apply(other, operator.truediv, False)
+
+    def __neg__(self) -> RunLengthArray:
+        return RunLengthArray(-self.values, self.run_ends)
@@ -1,12 +1,23 @@
 """The main function for sequence sampling."""
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Optional
+import itertools
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from dataclasses import replace
+from typing import TYPE_CHECKING, Any, Optional, Union, cast
 
-from pulser.sampler.samples import SequenceSamples, _SlmMask
+import numpy as np
+from numpy.typing import ArrayLike
+
+from pulser.parametrized import Parametrized
+from pulser.pulse import Pulse
+from pulser.sampler.samples import ChannelSamples, SequenceSamples, _SlmMask
 
 if TYPE_CHECKING:
     from pulser import Sequence
+    from pulser.register.base_register import QubitId
+    from pulser.sequence._call import _Call
 
 IGNORE_DETUNED_DELAY_PHASE = True
 
@@ -15,6 +26,7 @@ def sample(
     seq: Sequence,
     modulation: bool = False,
     extended_duration: Optional[int] = None,
+    compressed: bool = False,
 ) -> SequenceSamples:
     """Construct samples of a Sequence.
 
@@ -23,6 +35,10 @@ def sample(
         modulation: Whether to modulate the samples.
         extended_duration: If defined, extends the samples duration to the
             desired value.
+        compressed: Whether to store the samples as run-length encoded
+            arrays, in which constant stretches take a single value. They
+            are only expanded into dense arrays when asked (e.g. through
+            `SequenceSamples.decompress()` or ``np.asarray()``).
     """
     if seq.is_parametrized():
         raise NotImplementedError("Parametrized sequences can't be sampled.")
@@ -30,7 +46,8 @@ def sample(
     samples_list = []
     for ch_schedule in seq._schedule.values():
         kwargs: dict[str, Any] = dict(
-            ignore_detuned_delay_phase=IGNORE_DETUNED_DELAY_PHASE
+            ignore_detuned_delay_phase=IGNORE_DETUNED_DELAY_PHASE,
+            compressed=compressed,
         )
         if hasattr(ch_schedule, "detuning_map"):
             if seq.is_register_mappable():
@@ -69,3 +86,276 @@ def sample(
         seq._basis_ref,
         **optionals,
     )
+
+
+def sample_batch(
+    seq: Sequence,
+    vars_list: Iterable[Mapping[str, Union[ArrayLike, float, int]]],
+    modulation: bool = False,
+    extended_duration: Optional[int] = None,
+    *,
+    qubits: Optional[Mapping[QubitId, int]] = None,
+) -> dict[str, dict[str, np.ndarray]]:
+    """Samples a parametrized sequence for a batch of variable values.
+
+    The swept variables may only change the content of the pulses, so that
+    every built sequence has the same schedule (i.e. the same durations and
+    targets in every channel).
+
+    When the swept variables are only used in the pulses given to
+    ``Sequence.add()``, the sequence is built and sampled only once, for
+    the first element of the batch. The samples of the other elements are
+    then obtained by writing the samples of their pulses, evaluated for
+    the whole batch at once, in the slots of the first element's schedule.
+    Otherwise (e.g. when the variables set a phase shift or a delay, or
+    when a channel is in EOM mode), the sequence is built and sampled for
+    each element in turn, without keeping the built sequences around.
+
+    Args:
+        seq: The parametrized (or register mappable) sequence to sample.
+        vars_list: The values for all the variables declared in the
+            sequence, for each element of the batch.
+        modulation: Whether to modulate the samples.
+        extended_duration: If defined, extends the samples duration to the
+            desired value.
+        qubits: A mapping between qubit IDs and trap IDs used to define
+            the register, if the sequence's register is mappable.
+
+    Returns:
+        For each channel, the amplitude, detuning and phase samples
+        (under the keys "amp", "det" and "phase") stacked in arrays of shape
+        ``(len(vars_list), duration)``.
+    """
+    all_vars = seq._check_build_many_inputs(vars_list, qubits)
+    if not all_vars:
+        return {}
+    builder = seq._get_builder(qubits)
+    all_args = builder.evaluate_batch(all_vars)
+    ref_seq = cast("Sequence", builder.build_from_args(all_args[0]))
+    batch = _sample_batch_from_reference(
+        seq, ref_seq, all_args, modulation, extended_duration
+    )
+    if batch is not None:
+        return batch
+
+    ref_schedule: dict[str, Any] = {}
+    for i, built_args in enumerate(all_args):
+        built_seq = (
+            ref_seq
+            if i == 0
+            else cast("Sequence", builder.build_from_args(built_args))
+        )
+        samples = sample(built_seq, modulation, extended_duration)
+        schedule = {
+            ch: _get_schedule_structure(ch_samples)
+            for ch, ch_samples in samples.channel_samples.items()
+        }
+        if i == 0:
+            ref_schedule = schedule
+            batch = {
+                ch: {
+                    key: np.empty(
+                        (len(all_vars), ch_samples.duration),
+                        dtype=np.asarray(getattr(ch_samples, key)).dtype,
+                    )
+                    for key in ("amp", "det", "phase")
+                }
+                for ch, ch_samples in samples.channel_samples.items()
+            }
+        elif schedule != ref_schedule:
+            raise ValueError(
+                "The schedule of the sequence built with "
+                f"{all_vars[i]} differs from the one built with "
+                f"{all_vars[0]}. Only sequences whose durations and targets "
+                "don't depend on the swept variables can be batch sampled."
+            )
+        assert batch is not None
+        for ch, ch_samples in samples.channel_samples.items():
+            for key, arr in batch[ch].items():
+                arr[i] = getattr(ch_samples, key)
+    assert batch is not None
+    return batch
+
+
+# The name of the channel argument of the calls adding pulses, which is
+# their second positional argument
+_PULSE_CALLS = {"add": "channel", "add_dmm_detuning": "dmm_name"}
+
+
+def _get_pulse_channel(call: _Call) -> Optional[str]:
+    """The channel a call adds a pulse to, if it adds one."""
+    if call.name not in _PULSE_CALLS:
+        return None
+    return cast(
+        str,
+        call.args[1]
+        if len(call.args) > 1
+        else call.kwargs[_PULSE_CALLS[call.name]],
+    )
+
+
+def _get_swept_pulses(
+    seq: Sequence,
+) -> Optional[tuple[list[tuple[int, str, int]], Counter[str]]]:
+    """Finds the pulses of a sequence that depend on its variables.
+
+    Returns:
+        For each pulse given to ``Sequence.add()`` that depends on the
+        variables, its index in the arguments of the calls to build (as
+        evaluated by ``Sequence._get_build_plan()``), its channel and its
+        index among the pulses added to the channel. Also returns the
+        number of pulses added to each channel. None if the variables are
+        used anywhere else.
+    """
+    n_pulses: Counter[str] = Counter()
+    for call in seq._calls[1:]:
+        channel = _get_pulse_channel(call)
+        if channel is not None:
+            n_pulses[channel] += 1
+    swept_pulses: list[tuple[int, str, int]] = []
+    arg_ind = 0
+    for call in seq._to_build_calls:
+        swept = [
+            i
+            for i, arg in enumerate(
+                itertools.chain(call.args, call.kwargs.values())
+            )
+            if isinstance(arg, Parametrized)
+        ]
+        if swept:
+            if call.name != "add" or swept != [
+                0 if call.args else list(call.kwargs).index("pulse")
+            ]:
+                return None
+            channel = _get_pulse_channel(call)
+            assert channel is not None
+            swept_pulses.append(
+                (arg_ind + swept[0], channel, n_pulses[channel])
+            )
+        channel = _get_pulse_channel(call)
+        if channel is not None:
+            n_pulses[channel] += 1
+        arg_ind += len(call.args) + len(call.kwargs)
+    return swept_pulses, n_pulses
+
+
+def _sample_batch_from_reference(
+    seq: Sequence,
+    ref_seq: Sequence,
+    all_args: list[list[Any]],
+    modulation: bool,
+    extended_duration: Optional[int],
+) -> Optional[dict[str, dict[str, np.ndarray]]]:
+    """Samples a batch from the samples of its first element.
+
+    Args:
+        seq: The parametrized sequence.
+        ref_seq: The sequence built for the first element of the batch.
+        all_args: The arguments of the calls to build, evaluated for each
+            element of the batch.
+        modulation: Whether to modulate the samples.
+        extended_duration: If defined, extends the samples duration to the
+            desired value.
+
+    Returns:
+        The samples of the batch (see `sample_batch()`), or None if they
+        can't be obtained from the samples of the first element.
+    """
+    found = _get_swept_pulses(seq)
+    if found is None or ref_seq._slm_mask_dmm is not None:
+        # The mask of the SLM depends on the amplitude of the first pulse
+        return None
+    swept_pulses, n_pulses = found
+    channel_slots = {
+        ch: ch_schedule.slots.select(lambda t: isinstance(t, Pulse))
+        for ch, ch_schedule in ref_seq._schedule.items()
+    }
+    if any(
+        ch_schedule.eom_blocks or len(channel_slots[ch]) != n_pulses[ch]
+        for ch, ch_schedule in ref_seq._schedule.items()
+    ):
+        # Some pulses were not added through the calls
+        return None
+
+    ref_samples = sample(ref_seq, extended_duration=extended_duration)
+    batch = {
+        ch: {
+            key: np.tile(
+                np.asarray(getattr(ch_samples, key)), (len(all_args), 1)
+            )
+            for key in ("amp", "det", "phase")
+        }
+        for ch, ch_samples in ref_samples.channel_samples.items()
+    }
+    for arg_ind, ch, pulse_ind in swept_pulses:
+        ch_schedule = ref_seq._schedule[ch]
+        ch_obj = ch_schedule.channel_obj
+        slot = channel_slots[ch][pulse_ind]
+        # The pulse as added to the sequence, and as given to Sequence.add()
+        ref_pulse = cast(Pulse, slot.type)
+        ref_arg = cast(Pulse, all_args[0][arg_ind])
+        # The times during which the phase is that of the pulse, if any
+        phase_starts = ch_schedule._get_phase_starts(
+            channel_slots[ch], IGNORE_DETUNED_DELAY_PHASE
+        )
+        phase_times: Optional[slice] = None
+        for i, (ind, start) in enumerate(phase_starts):
+            if ind == pulse_ind:
+                phase_times = slice(
+                    start,
+                    phase_starts[i + 1][1]
+                    if i + 1 < len(phase_starts)
+                    else None,
+                )
+        ch_batch = batch[ch]
+        for i, built_args in enumerate(all_args[1:], start=1):
+            pulse = built_args[arg_ind]
+            if not isinstance(pulse, Pulse):
+                return None
+            # Validates the pulse like Sequence.add() does
+            pulse = ref_seq._validate_and_adjust_pulse(pulse, ch)
+            if (
+                pulse.duration != slot.tf - slot.ti
+                or pulse.fall_time(ch_obj) != ref_pulse.fall_time(ch_obj)
+                or pulse.post_phase_shift != ref_pulse.post_phase_shift
+                or ch_schedule.is_detuned_delay(pulse)
+                != ch_schedule.is_detuned_delay(ref_pulse)
+            ):
+                # The schedule (or the phase references) would change
+                return None
+            ch_batch["amp"][i, slot.ti : slot.tf] = pulse.amplitude.samples
+            ch_batch["det"][i, slot.ti : slot.tf] = pulse.detuning.samples
+            if phase_times is not None and pulse.phase != ref_arg.phase:
+                # Shifted by the same phase reference as the first element
+                ch_batch["phase"][i, phase_times] = (
+                    pulse.phase + ref_pulse.phase - ref_arg.phase
+                ) % (2 * np.pi)
+
+    if modulation:
+        for ch, ch_samples in ref_samples.channel_samples.items():
+            ch_schedule = ref_seq._schedule[ch]
+            modulated = [
+                replace(
+                    ch_samples,
+                    **{key: arr[i] for key, arr in batch[ch].items()},
+                ).modulate(
+                    ch_schedule.channel_obj,
+                    max_duration=extended_duration
+                    or ch_schedule.get_duration(include_fall_time=True),
+                )
+                for i in range(len(all_args))
+            ]
+            batch[ch] = {
+                key: np.stack([getattr(mod, key) for mod in modulated])
+                for key in ("amp", "det", "phase")
+            }
+    return batch
+
+
+def _get_schedule_structure(ch_samples: ChannelSamples) -> tuple:
+    """The durations and targets of a channel's samples."""
+    return (
+        ch_samples.duration,
+        [(s.ti, s.tf, s.targets) for s in ch_samples.slots],
+        [(s.ti, s.tf, s.targets) for s in ch_samples.target_time_slots],
+    )
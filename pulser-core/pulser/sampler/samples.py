@@ -4,14 +4,17 @@ from __future__ import annotations
 import itertools
 from collections import defaultdict
 from dataclasses import dataclass, field, replace
-from typing import TYPE_CHECKING, Optional, cast
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Optional, Union, cast
 
 import numpy as np
 
+from pulser._hashing import static_hash
 from pulser.channels.base_channel import Channel
 from pulser.channels.eom import BaseEOM
 from pulser.register import QubitId
 from pulser.register.weight_maps import DetuningMap
+from pulser.sampler._run_length import RunLengthArray
 from pulser.sequence._basis_ref import _QubitRef
 
 if TYPE_CHECKING:
@@ -24,18 +27,25 @@ _AMP = "amp"
 _DET = "det"
 _PHASE = "phase"
 
+_Samples = Union[np.ndarray, RunLengthArray]
 
-def _prepare_dict(N: int, in_xy: bool = False) -> dict:
+
+def _prepare_dict(
+    N: int, in_xy: bool = False, compressed: bool = False
+) -> dict:
     """Constructs empty dict of size N.
 
     Usually N is the duration of seq.
     """
+    zeros: Callable[[int], _Samples] = np.zeros
+    if compressed:
+        zeros = RunLengthArray.zeros
 
     def new_qty_dict() -> dict:
         return {
-            _AMP: np.zeros(N),
-            _DET: np.zeros(N),
-            _PHASE: np.zeros(N),
+            _AMP: zeros(N),
+            _DET: zeros(N),
+            _PHASE: zeros(N),
         }
 
     def new_qdict() -> dict:
@@ -53,6 +63,86 @@ def _prepare_dict(N: int, in_xy: bool = False) -> dict:
         }
 
 
+def _pad_end(samples: _Samples, extension: int, value: float) -> _Samples:
+    """Pads the end of the samples with a constant value."""
+    if isinstance(samples, RunLengthArray):
+        return RunLengthArray.concatenate(
+            [samples, RunLengthArray.full(extension, value)]
+        )
+    return np.pad(samples, (0, extension), constant_values=(value,))
+
+
+def _modulate_compressed(
+    channel_obj: Channel, samples: RunLengthArray, keep_ends: bool = False
+) -> RunLengthArray:
+    """Modulates run-length encoded samples, like `Channel.modulate()`.
+
+    Far enough from any change of value, the modulation leaves the samples
+    unchanged, so only the neighbourhoods of these changes are filtered.
+    """
+    if not samples.size or not channel_obj.mod_bandwidth:
+        return RunLengthArray.from_array(
+            channel_obj.modulate(np.asarray(samples), keep_ends=keep_ends)
+        )
+    padding = channel_obj._modulation_padding
+    start_value = end_value = 0.0
+    if keep_ends:
+        padding += channel_obj.rise_time
+        start_value, end_value = samples[0], samples[-1]
+    padded = RunLengthArray.concatenate(
+        [
+            RunLengthArray.full(padding, start_value),
+            samples,
+            RunLengthArray.full(padding, end_value),
+        ]
+    )
+    size = padded.size
+    # Beyond this distance, the modulation's impulse response is
+    # negligible (below 1e-17 of its peak)
+    fc = channel_obj.mod_bandwidth * 1e-3 / np.sqrt(np.log(2))
+    reach = int(np.ceil(2 / fc))
+    # The modulation is periodic, so the samples' end is followed by
+    # their start
+    changes = padded.run_ends[:-1].tolist()
+    if padded.values[0] != padded.values[-1]:
+        changes.append(size)
+    regions: list[list[int]] = []
+    for change in changes:
+        if regions and change - reach <= regions[-1][1]:
+            regions[-1][1] = change + reach
+        else:
+            regions.append([change - reach, change + reach])
+
+    if sum(stop - start for start, stop in regions) >= size:
+        # The changes are too close together to gain from the compression
+        modulated = RunLengthArray.from_array(
+            channel_obj.apply_modulation(
+                np.asarray(padded), channel_obj.mod_bandwidth
+            )
+        )
+    else:
+        modulated = padded.copy()
+        for start, stop in regions:
+            window = padded.take(np.arange(start - reach, stop + reach) % size)
+            filtered = channel_obj.apply_modulation(
+                window, channel_obj.mod_bandwidth
+            )[reach:-reach]
+            # The regions can go over the edges, in which case they wrap
+            if start < 0:
+                modulated[start + size :] = filtered[:-start]
+                modulated[:stop] = filtered[-start:]
+            elif stop > size:
+                modulated[start:] = filtered[: size - start]
+                modulated[: stop - size] = filtered[size - start :]
+            else:
+                modulated[start:stop] = filtered
+    if keep_ends:
+        # Cut off the extra ends
+        rise_time = channel_obj.rise_time
+        return cast(RunLengthArray, modulated[rise_time:-rise_time])
+    return modulated
+
+
 def _default_to_regular(d: dict | defaultdict) -> dict:
     """Helper function to convert defaultdicts to regular dicts."""
     if isinstance(d, dict):
@@ -87,11 +177,15 @@ class _SlmMask:
 
 @dataclass
 class ChannelSamples:
-    """Gathers samples of a channel."""
+    """Gathers samples of a channel.
 
-    amp: np.ndarray
-    det: np.ndarray
-    phase: np.ndarray
+    The amplitude, detuning and phase samples are either dense arrays or,
+    when compressed, run-length encoded arrays (see `compress()`).
+    """
+
+    amp: _Samples
+    det: _Samples
+    phase: _Samples
     slots: list[_PulseTargetSlot] = field(default_factory=list)
     eom_blocks: list[_EOMSettings] = field(default_factory=list)
     eom_start_buffers: list[tuple[int, int]] = field(default_factory=list)
@@ -107,6 +201,35 @@ class ChannelSamples:
         for t1, t2 in zip(self.slots, self.slots[1:]):
             assert t1.tf <= t2.ti  # no overlaps on a given channel
 
+    @property
+    def compressed(self) -> bool:
+        """Whether the samples are stored as run-length encoded arrays."""
+        return isinstance(self.amp, RunLengthArray)
+
+    def compress(self) -> ChannelSamples:
+        """Stores the samples as run-length encoded arrays.
+
+        Runs of repeated values (e.g. from constant waveforms or delays)
+        are then stored as a single value, regardless of their duration.
+        """
+        return replace(
+            self,
+            **{
+                key: RunLengthArray.from_array(getattr(self, key))
+                for key in ("amp", "det", "phase")
+            },
+        )
+
+    def decompress(self) -> ChannelSamples:
+        """Stores the samples as dense arrays."""
+        return replace(
+            self,
+            **{
+                key: np.asarray(getattr(self, key))
+                for key in ("amp", "det", "phase")
+            },
+        )
+
     @property
     def initial_targets(self) -> set[QubitId]:
         """Returns the initial targets."""
@@ -133,22 +256,17 @@ class ChannelSamples:
         if extension < 0:
             raise ValueError("Can't extend samples to a lower duration.")
 
-        new_amp = np.pad(self.amp, (0, extension))
+        new_amp = _pad_end(self.amp, extension, 0.0)
         # When in EOM mode, we need to keep the detuning at detuning_off
         if self.eom_blocks and self.eom_blocks[-1].tf is None:
             final_detuning = self.eom_blocks[-1].detuning_off
         else:
             final_detuning = 0.0
-        new_detuning = np.pad(
-            self.det,
-            (0, extension),
-            constant_values=(final_detuning,),
-            mode="constant",
-        )
-        new_phase = np.pad(
+        new_detuning = _pad_end(self.det, extension, final_detuning)
+        new_phase = _pad_end(
             self.phase,
-            (0, extension),
-            mode="edge" if self.phase.size > 0 else "constant",
+            extension,
+            self.phase[-1] if len(self.phase) > 0 else 0.0,
         )
         return replace(self, amp=new_amp, det=new_detuning, phase=new_phase)
 
@@ -158,6 +276,10 @@ class ChannelSamples:
         The channel is considered empty if all amplitude and detuning
         samples are zero.
         """
+        if isinstance(self.amp, RunLengthArray) and isinstance(
+            self.det, RunLengthArray
+        ):
+            return self.amp.count_nonzero() + self.det.count_nonzero() == 0
         return np.count_nonzero(self.amp) + np.count_nonzero(self.det) == 0
 
     def _generate_std_samples(self) -> ChannelSamples:
@@ -205,9 +327,21 @@ class ChannelSamples:
                 defined, truncates them to have a duration less than or equal
                 to the given value.
 
+        Note:
+            Compressed samples are modulated without being expanded, unless
+            they include EOM blocks.
+
         Returns:
             The modulated channel samples.
         """
+        if self.compressed and self.eom_blocks:
+            # The modulation in EOM mode relies on masks spanning the whole
+            # duration, so it is done on the dense samples
+            return (
+                self.decompress()
+                .modulate(channel_obj, max_duration)
+                .compress()
+            )
 
         def masked(
             samples: np.ndarray,
@@ -246,7 +380,10 @@ class ChannelSamples:
                 new_samples[~mask] = 0
             return new_samples
 
-        new_samples: dict[str, np.ndarray] = {}
+        new_samples: dict[str, _Samples] = {}
+        modulate: Callable[..., _Samples] = channel_obj.modulate
+        if self.compressed:
+            modulate = partial(_modulate_compressed, channel_obj)
 
         eom_samples = {
             key: getattr(self, key).copy() for key in ("amp", "det")
@@ -367,10 +504,10 @@ class ChannelSamples:
                     new_samples[key] = new_samples[key] + arr
 
         else:
-            new_samples["amp"] = channel_obj.modulate(self.amp)
-            new_samples["det"] = channel_obj.modulate(self.det, keep_ends=True)
+            new_samples["amp"] = modulate(self.amp)
+            new_samples["det"] = modulate(self.det, keep_ends=True)
 
-        new_samples["phase"] = channel_obj.modulate(self.phase, keep_ends=True)
+        new_samples["phase"] = modulate(self.phase, keep_ends=True)
         for key in new_samples:
             new_samples[key] = new_samples[key][slice(0, max_duration)]
         return replace(self, **new_samples)
@@ -406,6 +543,17 @@ class SequenceSamples:
         """Mapping between the channel name and its samples."""
         return dict(zip(self.channels, self.samples_list))
 
+    def static_hash(self) -> str:
+        """Returns the idempotent hash of the samples' contents.
+
+        Compressed and dense samples holding the same values have the same
+        hash.
+
+        Returns:
+            str: An hexstring encoding the hash.
+        """
+        return static_hash(self)
+
     @property
     def max_duration(self) -> int:
         """The maximum duration among the channel samples."""
@@ -432,6 +580,31 @@ class SequenceSamples:
             in_xy = True
         return in_xy
 
+    @property
+    def compressed(self) -> bool:
+        """Whether all the channel samples are compressed."""
+        return all(samples.compressed for samples in self.samples_list)
+
+    def compress(self) -> SequenceSamples:
+        """Stores the samples of every channel as run-length encoded arrays.
+
+        See Also:
+            ChannelSamples.compress()
+        """
+        return replace(
+            self,
+            samples_list=[samples.compress() for samples in self.samples_list],
+        )
+
+    def decompress(self) -> SequenceSamples:
+        """Stores the samples of every channel as dense arrays."""
+        return replace(
+            self,
+            samples_list=[
+                samples.decompress() for samples in self.samples_list
+            ],
+        )
+
     def extend_duration(self, new_duration: int) -> SequenceSamples:
         """Extend the duration of each samples to a new duration."""
         return replace(
@@ -454,9 +627,12 @@ class SequenceSamples:
         Returns:
             A nested dictionary splitting the samples according to their
             addressing ('Global' or 'Local'), the targeted basis
-            and, in the 'Local' case, the targeted qubit.
+            and, in the 'Local' case, the targeted qubit. If the samples
+            are compressed, so are the samples in the dictionary.
         """
-        d = _prepare_dict(self.max_duration, in_xy=self._in_xy)
+        d = _prepare_dict(
+            self.max_duration, in_xy=self._in_xy, compressed=self.compressed
+        )
         for chname, samples in zip(self.channels, self.samples_list):
             cs = (
                 samples.extend_duration(self.max_duration)
@@ -14,6 +14,7 @@
 """Class for tracking the phase and usage of a qubit over time."""
 from __future__ import annotations
 
+import bisect
 from typing import Generator, Union
 
 import numpy as np
@@ -53,9 +54,8 @@ class _PhaseTracker:
         time_scale: float = 1.0,
     ) -> Generator[tuple[float, float], None, None]:
         """Changes in phases within ]ti, tf]."""
-        start, end = np.searchsorted(
-            self._times, (ti * time_scale, tf * time_scale), side="right"
-        )
+        start = bisect.bisect_right(self._times, ti * time_scale)
+        end = bisect.bisect_right(self._times, tf * time_scale)
         for i in range(start, end):
             change = self._phases[i] - self._phases[i - 1]
             yield (self._times[i] / time_scale, change)
@@ -65,14 +65,14 @@ class _PhaseTracker:
 
     def __setitem__(self, t: int, phi: float) -> None:
         phase = self._format(phi)
-        if t in self._times:
-            ind = self._times.index(t)
-            self._phases[ind] = phase
+        # The times are sorted, so the phase is usually set at the end
+        ind = bisect.bisect_right(self._times, t)
+        if ind and self._times[ind - 1] == t:
+            self._phases[ind - 1] = phase
         else:
-            ind = int(np.searchsorted(self._times, t, side="right"))
             self._times.insert(ind, t)
             self._phases.insert(ind, phase)
 
     def __getitem__(self, t: int) -> float:
-        ind = int(np.searchsorted(self._times, t, side="right")) - 1
+        ind = bisect.bisect_right(self._times, t) - 1
         return self._phases[ind]
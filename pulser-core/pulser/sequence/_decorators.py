@@ -93,6 +93,8 @@ def store(func: F) -> F:
         storage = self._calls if self._building else self._to_build_calls
         func(self, *args, **kwargs)
         storage.append(_Call(func.__name__, args, kwargs))
+        # The stored calls changed, so the build plan must be recompiled
+        self._build_plan = None
 
     return cast(F, wrapper)
 
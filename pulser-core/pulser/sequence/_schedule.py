@@ -14,10 +14,22 @@
 """Special containers to store the schedule of operations in the Sequence."""
 from __future__ import annotations
 
+import bisect
 import warnings
-from collections.abc import Iterator
+from array import array
+from collections.abc import Hashable, Iterable, Iterator
 from dataclasses import dataclass, fields
-from typing import Dict, NamedTuple, Optional, Union, cast, overload
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    MutableSequence,
+    NamedTuple,
+    Optional,
+    Union,
+    cast,
+    overload,
+)
 
 import numpy as np
 
@@ -26,8 +38,9 @@ from pulser.channels.dmm import DMM
 from pulser.pulse import Pulse
 from pulser.register.base_register import QubitId
 from pulser.register.weight_maps import DetuningMap
+from pulser.sampler._run_length import RunLengthArray
 from pulser.sampler.samples import ChannelSamples, DMMSamples, _PulseTargetSlot
-from pulser.waveforms import ConstantWaveform
+from pulser.waveforms import ConstantWaveform, Waveform
 
 
 class _TimeSlot(NamedTuple):
@@ -39,6 +52,194 @@ class _TimeSlot(NamedTuple):
     targets: set[QubitId]
 
 
+class _SlotStore(MutableSequence[_TimeSlot]):
+    """A list of time slots stored in columns.
+
+    The start and end times are kept in integer arrays, while the types
+    (deduplicated pulses) and the targets (interned as frozensets) are
+    kept in tables and referred to by index. The time slots are rebuilt
+    when accessed, so a store behaves like a list of time slots but takes
+    far less memory and is much cheaper to copy.
+
+    Copies share their columns until one of them is modified (copy on
+    write). The tables only ever grow and are also shared between copies,
+    which fork them before adding new entries.
+    """
+
+    def __init__(self, slots: Iterable[_TimeSlot] = ()):
+        """Initializes a store with the given time slots."""
+        self._ti = array("q")
+        self._tf = array("q")
+        self._type_inds = array("q")
+        self._targets_inds = array("q")
+        self._types: list[Union[Pulse, str]] = []
+        self._type_lookup: dict[Hashable, int] = {}
+        self._targets: list[frozenset[QubitId]] = []
+        self._targets_lookup: dict[frozenset[QubitId], int] = {}
+        self._owns_columns = True
+        self._owns_tables = True
+        for slot in slots:
+            self.append(slot)
+
+    def _writable_columns(self) -> tuple[array, array, array, array]:
+        if not self._owns_columns:
+            self._ti, self._tf, self._type_inds, self._targets_inds = (
+                array("q", column)
+                for column in (
+                    self._ti,
+                    self._tf,
+                    self._type_inds,
+                    self._targets_inds,
+                )
+            )
+            self._owns_columns = True
+        return self._ti, self._tf, self._type_inds, self._targets_inds
+
+    def _fork_tables(self) -> None:
+        self._types = list(self._types)
+        self._type_lookup = dict(self._type_lookup)
+        self._targets = list(self._targets)
+        self._targets_lookup = dict(self._targets_lookup)
+        self._owns_tables = True
+
+    def _encode(self, slot: _TimeSlot) -> tuple[int, int]:
+        type_key: Hashable = slot.type
+        if isinstance(slot.type, Pulse):
+            # Pulses are rebuilt when added to a sequence but keep their
+            # waveforms, which are therefore compared by identity
+            type_key = (
+                id(slot.type.amplitude),
+                id(slot.type.detuning),
+                slot.type.phase,
+                slot.type.post_phase_shift,
+            )
+        targets = frozenset(slot.targets)
+        if (
+            type_key not in self._type_lookup
+            or targets not in self._targets_lookup
+        ) and not self._owns_tables:
+            self._fork_tables()
+        if type_key not in self._type_lookup:
+            self._type_lookup[type_key] = len(self._types)
+            self._types.append(slot.type)
+        if targets not in self._targets_lookup:
+            self._targets_lookup[targets] = len(self._targets)
+            self._targets.append(targets)
+        return self._type_lookup[type_key], self._targets_lookup[targets]
+
+    def _decode(self, ind: int) -> _TimeSlot:
+        return _TimeSlot(
+            self._types[self._type_inds[ind]],
+            self._ti[ind],
+            self._tf[ind],
+            cast(set, self._targets[self._targets_inds[ind]]),
+        )
+
+    def _normalize_index(self, ind: int) -> int:
+        if ind < 0:
+            ind += len(self._ti)
+        if not 0 <= ind < len(self._ti):
+            raise IndexError("Time slot index out of range.")
+        return ind
+
+    @overload
+    def __getitem__(self, key: int) -> _TimeSlot:
+        pass
+
+    @overload
+    def __getitem__(self, key: slice) -> list[_TimeSlot]:
+        pass
+
+    def __getitem__(
+        self, key: Union[int, slice]
+    ) -> Union[_TimeSlot, list[_TimeSlot]]:
+        if isinstance(key, slice):
+            return [
+                self._decode(ind) for ind in range(*key.indices(len(self)))
+            ]
+        return self._decode(self._normalize_index(key))
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        if isinstance(key, slice):
+            raise TypeError("Time slots can only be replaced one at a time.")
+        ind = self._normalize_index(key)
+        slot = cast(_TimeSlot, value)
+        ti, tf, type_inds, targets_inds = self._writable_columns()
+        type_inds[ind], targets_inds[ind] = self._encode(slot)
+        ti[ind], tf[ind] = slot.ti, slot.tf
+
+    def __delitem__(self, key: Any) -> None:
+        for column in self._writable_columns():
+            del column[key]
+
+    def __len__(self) -> int:
+        return len(self._ti)
+
+    def __iter__(self) -> Iterator[_TimeSlot]:
+        for ind in range(len(self._ti)):
+            yield self._decode(ind)
+
+    def __reversed__(self) -> Iterator[_TimeSlot]:
+        for ind in range(len(self._ti) - 1, -1, -1):
+            yield self._decode(ind)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, (_SlotStore, list)):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def insert(self, index: int, value: _TimeSlot) -> None:
+        """Inserts a time slot before the given index."""
+        ti, tf, type_inds, targets_inds = self._writable_columns()
+        type_ind, targets_ind = self._encode(value)
+        ti.insert(index, value.ti)
+        tf.insert(index, value.tf)
+        type_inds.insert(index, type_ind)
+        targets_inds.insert(index, targets_ind)
+
+    def append(self, value: _TimeSlot) -> None:
+        """Adds a time slot to the end of the store."""
+        ti, tf, type_inds, targets_inds = self._writable_columns()
+        type_ind, targets_ind = self._encode(value)
+        ti.append(value.ti)
+        tf.append(value.tf)
+        type_inds.append(type_ind)
+        targets_inds.append(targets_ind)
+
+    def select(
+        self, condition: Callable[[Union[Pulse, str]], bool]
+    ) -> list[_TimeSlot]:
+        """The time slots whose type meets a condition.
+
+        The condition is checked only once per distinct type.
+        """
+        selected = [condition(type_) for type_ in self._types]
+        return [
+            self._decode(ind)
+            for ind, type_ind in enumerate(self._type_inds)
+            if selected[type_ind]
+        ]
+
+    def end_times(self) -> array:
+        """The end time of each time slot (not to be modified)."""
+        return self._tf
+
+    def __deepcopy__(self, memo: dict) -> _SlotStore:
+        # The columns and tables are shared until they are modified
+        new = _SlotStore.__new__(_SlotStore)
+        new.__dict__.update(self.__dict__)
+        self._owns_columns = new._owns_columns = False
+        self._owns_tables = new._owns_tables = False
+        return new
+
+    def __reduce__(self) -> tuple:
+        # The type lookup relies on object ids, so it can't be pickled
+        return (_SlotStore, (list(self),))
+
+
 @dataclass
 class _EOMSettings:
     rabi_freq: float
@@ -64,19 +265,60 @@ class _ChannelSchedule:
     channel_obj: Channel
 
     def __post_init__(self) -> None:
-        self.slots: list[_TimeSlot] = []
+        self.slots = _SlotStore()
         self.eom_blocks: list[_EOMSettings] = []
+        self._reset_index()
+
+    def _reset_index(self) -> None:
+        """Clears the index of the slots (to rebuild it from scratch).
+
+        Must be called whenever existing slots are modified; appending new
+        slots is picked up automatically.
+        """
+        self._num_indexed = 0
+        self._last_pulse_ind_all: Optional[int] = None
+        self._last_target_ind: Optional[int] = None
+        # The index of the last pulse slot targeting each qubit
+        self._last_pulse_ind_by_target: dict[QubitId, int] = {}
+
+    def _update_index(self) -> None:
+        """Indexes the slots added since the last update."""
+        for ind in range(self._num_indexed, len(self.slots)):
+            slot = self.slots[ind]
+            if isinstance(slot.type, Pulse):
+                self._last_pulse_ind_all = ind
+                for q in slot.targets:
+                    self._last_pulse_ind_by_target[q] = ind
+            elif slot.type == "target":
+                self._last_target_ind = ind
+        self._num_indexed = len(self.slots)
+
+    def _last_pulse_ind(
+        self, targets: Optional[set[QubitId]] = None
+    ) -> Optional[int]:
+        """The index of the last pulse slot, optionally sharing targets."""
+        self._update_index()
+        if targets is None:
+            return self._last_pulse_ind_all
+        return max(
+            (
+                self._last_pulse_ind_by_target[q]
+                for q in targets
+                if q in self._last_pulse_ind_by_target
+            ),
+            default=None,
+        )
 
     def last_target(self) -> int:
         """Last time a target happened on the channel."""
-        for slot in self.slots[::-1]:
-            if slot.type == "target":
-                return slot.tf
-        return 0  # pragma: no cover
+        self._update_index()
+        if self._last_target_ind is None:
+            return 0  # pragma: no cover
+        return self.slots[self._last_target_ind].tf
 
     def last_pulse_slot(self, ignore_detuned_delay: bool = False) -> _TimeSlot:
         """The last slot with a Pulse."""
-        for slot in self.slots[::-1]:
+        for slot in reversed(self.slots):
             if isinstance(slot.type, Pulse) and not (
                 ignore_detuned_delay and self.is_detuned_delay(slot.type)
             ):
@@ -92,6 +334,27 @@ class _ChannelSchedule:
             for start, end in self.get_eom_mode_intervals()
         )
 
+    def _in_eom_mode_flags(
+        self, time_slots: Iterable[_TimeSlot]
+    ) -> list[bool]:
+        """States if each time slot is inside an EOM mode block.
+
+        Equivalent to calling ``in_eom_mode()`` on each time slot, but
+        requires the time slots to be in chronological order.
+        """
+        intervals = self.get_eom_mode_intervals()
+        flags = []
+        i = 0
+        for time_slot in time_slots:
+            # Skips the intervals that end before the time slot starts
+            while i < len(intervals) and intervals[i][1] <= time_slot.ti:
+                i += 1
+            flags.append(
+                i < len(intervals)
+                and intervals[i][0] <= time_slot.ti < intervals[i][1]
+            )
+        return flags
+
     @staticmethod
     def is_detuned_delay(pulse: Pulse) -> bool:
         """Tells if a pulse is actually a delay with a constant detuning."""
@@ -113,7 +376,7 @@ class _ChannelSchedule:
 
     def get_duration(self, include_fall_time: bool = False) -> int:
         temp_tf = 0
-        for i, op in enumerate(self.slots[::-1]):
+        for i, op in enumerate(reversed(self.slots)):
             if i == 0:
                 # Start with the last slot found
                 temp_tf = op.tf
@@ -142,17 +405,50 @@ class _ChannelSchedule:
             )
 
     def get_samples(
-        self, ignore_detuned_delay_phase: bool = True
+        self,
+        ignore_detuned_delay_phase: bool = True,
+        *,
+        compressed: bool = False,
     ) -> ChannelSamples:
-        """Returns the samples of the channel."""
+        """Returns the samples of the channel.
+
+        If `compressed`, the samples are run-length encoded without ever
+        being expanded (apart from those of non-constant waveforms).
+        """
+
+        def add_runs(
+            runs: tuple[list[np.ndarray], list[np.ndarray]],
+            wf: Waveform,
+            gap: int,
+        ) -> None:
+            # Adds the runs of a waveform after 'gap' zeros
+            values, lengths = runs
+            values.append(np.zeros(1))
+            lengths.append(np.array([gap]))
+            if isinstance(wf, ConstantWaveform):
+                values.append(np.array([wf._value]))
+                lengths.append(np.array([wf.duration]))
+            else:
+                rle = RunLengthArray.from_array(wf.samples)
+                values.append(rle.values)
+                lengths.append(rle.run_lengths)
+
+        def join_runs(
+            runs: tuple[list[np.ndarray], list[np.ndarray]], size: int
+        ) -> RunLengthArray:
+            values, lengths = runs
+            run_ends = np.cumsum(np.concatenate([[0], *lengths]))[1:]
+            # Pads with zeros until the end of the samples
+            return RunLengthArray(
+                np.concatenate([*values, [0.0]]),
+                np.append(run_ends, size),
+            )
+
         # Keep only pulse slots
-        channel_slots = [s for s in self.slots if isinstance(s.type, Pulse)]
+        channel_slots = self.slots.select(lambda t: isinstance(t, Pulse))
         dt = self.get_duration()
-        amp, det, phase = np.zeros(dt), np.zeros(dt), np.zeros(dt)
         slots: list[_PulseTargetSlot] = []
-        target_time_slots: list[_TimeSlot] = [
-            s for s in self.slots if s.type == "target"
-        ]
+        target_time_slots = self.slots.select(lambda t: t == "target")
         # Extracting the EOM Buffers
         eom_intervals_ti = [block.ti for block in self.eom_blocks]
         nb_eom_intervals = len(eom_intervals_ti)
@@ -161,16 +457,33 @@ class _ChannelSchedule:
         in_eom_mode = False
         eom_block_n = -1
 
+        amp: np.ndarray | RunLengthArray
+        det: np.ndarray | RunLengthArray
+        phase: np.ndarray | RunLengthArray
+        if compressed:
+            # The runs of every pulse are joined at the end, to avoid
+            # splicing them into the samples one at a time
+            amp_runs: tuple[list[np.ndarray], list[np.ndarray]] = ([], [])
+            det_runs: tuple[list[np.ndarray], list[np.ndarray]] = ([], [])
+        else:
+            amp, det = np.zeros(dt), np.zeros(dt)
+        pulses_in_eom_mode = self._in_eom_mode_flags(channel_slots)
+
         for ind, s in enumerate(channel_slots):
             pulse = cast(Pulse, s.type)
-            amp[s.ti : s.tf] += pulse.amplitude.samples
-            det[s.ti : s.tf] += pulse.detuning.samples
+            if compressed:
+                gap = s.ti - (channel_slots[ind - 1].tf if ind else 0)
+                add_runs(amp_runs, pulse.amplitude, gap)
+                add_runs(det_runs, pulse.detuning, gap)
+            else:
+                amp[s.ti : s.tf] += pulse.amplitude.samples
+                det[s.ti : s.tf] += pulse.detuning.samples
 
             tf = s.tf
             # Account for the extended duration of the pulses
             # after modulation, which is at most fall_time
             fall_time = pulse.fall_time(
-                self.channel_obj, in_eom_mode=self.in_eom_mode(time_slot=s)
+                self.channel_obj, in_eom_mode=pulses_in_eom_mode[ind]
             )
             tf += (
                 min(fall_time, channel_slots[ind + 1].ti - s.tf)
@@ -179,37 +492,38 @@ class _ChannelSchedule:
             )
             slots.append(_PulseTargetSlot(s.ti, tf, s.targets))
 
-            if ignore_detuned_delay_phase and self.is_detuned_delay(pulse):
-                # The phase of detuned delays is not considered
-                continue
-
-            ph_jump_t = self.channel_obj.phase_jump_time
-            for last_pulse_ind in range(ind - 1, -1, -1):  # From ind-1 to 0
-                last_pulse_slot = channel_slots[last_pulse_ind]
-                # Skips over detuned delay pulses
-                if not (
-                    ignore_detuned_delay_phase
-                    and self.is_detuned_delay(
-                        cast(Pulse, last_pulse_slot.type)
-                    )
-                ):
-                    # Accounts for when pulse is added with 'no-delay'
-                    # i.e. there is no phase_jump_time in between a phase jump
-                    t_start = max(s.ti - ph_jump_t, last_pulse_slot.tf)
-                    break
-            else:
-                t_start = 0
-            # Overrides all values from t_start on. The next pulses will do
-            # the same, so the last phase is automatically kept till the end
-            phase[t_start:] = pulse.phase
+        # The times from which the phase takes the value of each pulse
+        phase_starts: list[int] = []
+        phases: list[float] = []
+        for ind, start in self._get_phase_starts(
+            channel_slots, ignore_detuned_delay_phase
+        ):
+            phase_starts.append(start)
+            phases.append(cast(Pulse, channel_slots[ind].type).phase)
+
+        phase_ends = phase_starts[1:] + [dt]
+        if compressed:
+            amp, det = join_runs(amp_runs, dt), join_runs(det_runs, dt)
+            phase = RunLengthArray(
+                phases if phases else [0.0], phase_ends if phases else [dt]
+            )
+        elif phases:
+            phase = np.repeat(
+                np.array(phases, dtype=float), np.diff(phase_starts + [dt])
+            )
+        else:
+            phase = np.zeros(dt)
 
         # Create EOM start and end buffers
-        for s in self.slots:
+        eom_slots = self.slots if self.eom_blocks else _SlotStore()
+        for s, slot_in_eom_mode in zip(
+            eom_slots, self._in_eom_mode_flags(eom_slots)
+        ):
             if s.ti == -1:
                 continue
 
             # If slot is not the first element in schedule
-            if self.in_eom_mode(s):
+            if slot_in_eom_mode:
                 # EOM mode starts
                 if not in_eom_mode:
                     in_eom_mode = True
@@ -239,6 +553,51 @@ class _ChannelSchedule:
             target_time_slots,
         )
 
+    def _get_phase_starts(
+        self,
+        channel_slots: list[_TimeSlot],
+        ignore_detuned_delay_phase: bool = True,
+    ) -> list[tuple[int, int]]:
+        """Finds the times from which the phase takes each pulse's value.
+
+        Args:
+            channel_slots: The time slots of the channel's pulses.
+            ignore_detuned_delay_phase: Whether the phase of the detuned
+                delays is ignored.
+
+        Returns:
+            The index (in `channel_slots`) of each pulse whose phase is
+            considered, along with the time from which the phase takes its
+            value. Each phase lasts until the start of the next one.
+        """
+        phase_starts: list[tuple[int, int]] = []
+        ph_jump_t = self.channel_obj.phase_jump_time
+        # The end of the last pulse whose phase is considered
+        last_pulse_tf: Optional[int] = None
+        for ind, s in enumerate(channel_slots):
+            if ignore_detuned_delay_phase and self.is_detuned_delay(
+                cast(Pulse, s.type)
+            ):
+                # The phase of detuned delays is not considered
+                continue
+
+            # The phase of the pulse starts when the last considered pulse
+            # ends, or earlier when there is a phase jump time in between
+            # (unless the pulse was added with 'no-delay'). Since the pulses
+            # don't overlap, the start times are strictly increasing.
+            phase_starts.append(
+                (
+                    ind,
+                    (
+                        0
+                        if last_pulse_tf is None
+                        else max(s.ti - ph_jump_t, last_pulse_tf)
+                    ),
+                )
+            )
+            last_pulse_tf = s.tf
+        return phase_starts
+
     @overload
     def __getitem__(self, key: int) -> _TimeSlot:
         pass
@@ -271,9 +630,12 @@ class _DMMSchedule(_ChannelSchedule):
         self,
         ignore_detuned_delay_phase: bool = True,
         qubits: dict[QubitId, np.ndarray] | None = None,
+        *,
+        compressed: bool = False,
     ) -> DMMSamples:
         ch_samples = super().get_samples(
-            ignore_detuned_delay_phase=ignore_detuned_delay_phase
+            ignore_detuned_delay_phase=ignore_detuned_delay_phase,
+            compressed=compressed,
         )
         init_fields = {
             f.name: getattr(ch_samples, f.name)
@@ -511,12 +873,36 @@ class _Schedule(Dict[str, _ChannelSchedule]):
 
     def _find_add_delay(self, t0: int, channel: str, protocol: str) -> int:
         current_max_t = t0
+        targets = self[channel][-1].targets
         for ch, ch_schedule in self.items():
             if ch == channel:
                 continue
             this_chobj = self[ch].channel_obj
             in_eom_mode = self[ch].in_eom_mode()
-            for op in ch_schedule[::-1]:
+            # Going back in time, no slot ending after 'current_max_t' can
+            # stop the search apart from a pulse sharing the targets (or
+            # any pulse, with 'wait-for-all'), so the last of these pulses
+            # is taken directly from the index
+            last_pulse_ind = ch_schedule._last_pulse_ind(
+                None if protocol == "wait-for-all" else targets
+            )
+            if (
+                last_pulse_ind is not None
+                and ch_schedule.slots[last_pulse_ind].tf > current_max_t
+            ):
+                op = ch_schedule.slots[last_pulse_ind]
+                current_max_t = op.tf + cast(Pulse, op.type).fall_time(
+                    this_chobj, in_eom_mode=in_eom_mode
+                )
+                continue
+            # Otherwise, the search starts from the last slot ending by
+            # 'current_max_t' (the end times never decrease, since the slots
+            # of a channel don't overlap)
+            start = bisect.bisect_right(
+                ch_schedule.slots.end_times(), current_max_t
+            )
+            for ind in range(start - 1, -1, -1):
+                op = ch_schedule.slots[ind]
                 if not isinstance(op.type, Pulse):
                     if op.tf + 2 * this_chobj.rise_time <= current_max_t:
                         # No pulse behind 'op' needing a delay
@@ -527,10 +913,7 @@ class _Schedule(Dict[str, _ChannelSchedule]):
                     <= current_max_t
                 ):
                     break
-                elif (
-                    op.targets & self[channel][-1].targets
-                    or protocol == "wait-for-all"
-                ):
+                elif op.targets & targets or protocol == "wait-for-all":
                     current_max_t = op.tf + op.type.fall_time(
                         this_chobj, in_eom_mode=in_eom_mode
                     )
@@ -16,10 +16,12 @@
 from __future__ import annotations
 
 import copy
+import itertools
 import json
 import os
 import warnings
-from collections.abc import Collection, Mapping
+from collections.abc import Collection, Iterable, Iterator, Mapping
+from concurrent.futures import ProcessPoolExecutor
 from typing import (
     Any,
     Generic,
@@ -40,7 +42,9 @@ from numpy.typing import ArrayLike
 
 import pulser
 import pulser.devices as devices
+import pulser.sampler as sampler
 import pulser.sequence._decorators as seq_decorators
+from pulser._hashing import static_hash
 from pulser.channels.base_channel import Channel
 from pulser.channels.dmm import DMM, _dmm_id_from_name, _get_dmm_name
 from pulser.channels.eom import RydbergEOM
@@ -52,12 +56,13 @@ from pulser.json.abstract_repr.serializer import serialize_abstract_sequence
 from pulser.json.coders import PulserDecoder, PulserEncoder
 from pulser.json.exceptions import AbstractReprError
 from pulser.json.utils import obj_to_dict
-from pulser.parametrized import Parametrized, Variable
+from pulser.parametrized import EvaluationPlan, Parametrized, Variable
 from pulser.parametrized.variable import VariableItem
 from pulser.pulse import Pulse
 from pulser.register.base_register import BaseRegister, QubitId
 from pulser.register.mappable_reg import MappableRegister
 from pulser.register.weight_maps import DetuningMap
+from pulser.sampler.samples import SequenceSamples
 from pulser.sequence._basis_ref import _QubitRef
 from pulser.sequence._call import _Call
 from pulser.sequence._schedule import (
@@ -165,6 +170,8 @@ class Sequence(Generic[DeviceType]):
         # Last time each qubit was used, by basis
         self._variables: dict[str, Variable] = {}
         self._to_build_calls: list[_Call] = []
+        # Plan compiled from the stored calls, cached until a call is stored
+        self._build_plan: Optional[EvaluationPlan] = None
         self._building: bool = True
         # Marks the sequence as empty until the first pulse is added
         self._empty_sequence: bool = True
@@ -1139,6 +1146,7 @@ class Sequence(Generic[DeviceType]):
         call_container = (
             self._to_build_calls if self.is_parametrized() else self._calls
         )
+        self._build_plan = None
         call_container.append(
             _Call(
                 "enable_eom_mode",
@@ -1571,34 +1579,10 @@ class Sequence(Generic[DeviceType]):
                 # Build a sequence with specific values for both variables
                 >>> seq1 = seq.build(x=0.5, y=[1, 2, 3])
         """
-        if self.is_register_mappable():
-            if qubits is None:
-                raise ValueError(
-                    "'qubits' must be specified when the sequence is created "
-                    "with a MappableRegister."
-                )
-
-        elif qubits is not None:
-            raise ValueError(
-                "'qubits' must not be specified when the sequence already has "
-                "a concrete register."
-            )
-
+        self._check_build_qubits(qubits)
         self._cross_check_vars(vars)
 
-        # Shallow copy with stored parametrized objects (if any)
-        # NOTE: While seq is a shallow copy, be extra careful with changes to
-        # attributes of seq pointing to mutable objects, as they might be
-        # inadvertedly done to self too
-        seq = copy.copy(self)
-
-        # Eliminates the source of recursiveness errors
-        seq._reset_parametrized()
-
-        # Deepcopy the base sequence (what remains)
-        seq = copy.deepcopy(seq)
-        # NOTE: Changes to seq are now safe to do
-
+        seq = self._get_build_base()
         if not (self.is_parametrized() or self.is_register_mappable()):
             warnings.warn(
                 "Building a non-parametrized sequence simply returns"
@@ -1607,25 +1591,107 @@ class Sequence(Generic[DeviceType]):
             )
             return seq
 
-        for name, value in vars.items():
-            self._variables[name]._assign(value)
+        reg = (
+            cast(MappableRegister, self._register).build_register(qubits)
+            if qubits
+            else None
+        )
+        self._apply_build_calls(
+            seq, reg, self._get_build_plan().evaluate(vars)
+        )
+        return seq
 
-        if qubits:
-            reg = cast(MappableRegister, self._register).build_register(qubits)
-            self._set_register(seq, reg)
+    @overload
+    def build_many(
+        self,
+        vars_list: Iterable[Mapping[str, Union[ArrayLike, float, int]]],
+        *,
+        qubits: Optional[Mapping[QubitId, int]] = None,
+        return_samples: Literal[False] = False,
+        n_workers: Optional[int] = None,
+    ) -> list[Sequence]:
+        pass
 
-        for call in self._to_build_calls:
-            args_ = [
-                arg.build() if isinstance(arg, Parametrized) else arg
-                for arg in call.args
-            ]
-            kwargs_ = {
-                key: val.build() if isinstance(val, Parametrized) else val
-                for key, val in call.kwargs.items()
-            }
-            getattr(seq, call.name)(*args_, **kwargs_)
+    @overload
+    def build_many(
+        self,
+        vars_list: Iterable[Mapping[str, Union[ArrayLike, float, int]]],
+        *,
+        qubits: Optional[Mapping[QubitId, int]] = None,
+        return_samples: Literal[True],
+        n_workers: Optional[int] = None,
+    ) -> list[SequenceSamples]:
+        pass
 
-        return seq
+    def build_many(
+        self,
+        vars_list: Iterable[Mapping[str, Union[ArrayLike, float, int]]],
+        *,
+        qubits: Optional[Mapping[QubitId, int]] = None,
+        return_samples: bool = False,
+        n_workers: Optional[int] = None,
+    ) -> list[Sequence] | list[SequenceSamples]:
+        """Builds the sequence for many assignments of its variables.
+
+        Equivalent to calling ``Sequence.build(qubits=qubits, **vars)`` for
+        each ``vars`` in `vars_list`, but the sequence's non-parametrized
+        part is only copied in full once. Every built sequence then starts
+        from a copy of it that shares its immutable components (like the
+        device, the register and the pulses).
+
+        Args:
+            vars_list: The values for all the variables declared in this
+                Sequence instance, for each sequence to build.
+            qubits: A mapping between qubit IDs and trap IDs used to define
+                the register of every built sequence. Must only be provided
+                when the sequence is initialized with a MappableRegister.
+            return_samples: Whether to return the samples of each built
+                sequence (as given by ``pulser.sampler.sample()``) instead of
+                the sequence itself.
+            n_workers: If given, the sequences are built across a pool of
+                `n_workers` processes.
+
+        Returns:
+            The built sequences (or their samples), in the order of
+            `vars_list`.
+
+        Example:
+            ::
+
+                >>> seqs = seq.build_many(
+                ...     [dict(x=x, y=[1, 2, 3]) for x in np.linspace(0, 1, 50)]
+                ... )
+        """
+        if n_workers is not None and (
+            not isinstance(n_workers, int) or n_workers < 1
+        ):
+            raise ValueError(
+                f"`n_workers` must be a positive integer, not {n_workers!r}."
+            )
+        all_vars = self._check_build_many_inputs(vars_list, qubits)
+        results: list
+        if n_workers is None or len(all_vars) < 2:
+            results = list(
+                _SequenceBuilder(self, qubits).iter_build(
+                    all_vars, return_samples
+                )
+            )
+        else:
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                initializer=_init_build_worker,
+                initargs=(self, qubits),
+            ) as executor:
+                results = list(
+                    executor.map(
+                        _build_worker,
+                        all_vars,
+                        itertools.repeat(return_samples),
+                        # Each process gets one contiguous chunk of the inputs
+                        chunksize=-(-len(all_vars) // n_workers),
+                    )
+                )
+        return results
 
     def serialize(self, **kwargs: Any) -> str:
         """Serializes the Sequence into a JSON formatted string.
@@ -1718,6 +1784,25 @@ class Sequence(Generic[DeviceType]):
                 ) from e
             raise e  # pragma: no cover
 
+    def static_hash(self) -> str:
+        """Returns the idempotent hash of the sequence's contents.
+
+        Python's standard hash is not idempotent as it changes between
+        sessions. This hash stays the same for sequences created with the
+        same calls (and arguments), so it can be used to identify a
+        sequence across sessions (e.g. to cache its results).
+
+        Returns:
+            str: An hexstring encoding the hash.
+
+        Note:
+            This hash will be returned as an hexstring without
+            the '0x' prefix (unlike what is returned by 'hex()').
+        """
+        return static_hash(
+            type(self), self._calls, self._to_build_calls, self._variables
+        )
+
     @staticmethod
     def deserialize(obj: str, **kwargs: Any) -> Sequence:
         """Deserializes a JSON formatted string.
@@ -2177,6 +2262,26 @@ class Sequence(Generic[DeviceType]):
     def __str__(self) -> str:
         return seq_to_str(self)
 
+    def __deepcopy__(self, memo: dict[int, Any]) -> Sequence:
+        # The device, the register, the channels, the detuning maps and the
+        # stored calls are never modified, so they are shared with the copy
+        # instead of copied. The time slots are only copied when modified.
+        shared: list[Any] = [self._device, self._register, *self._calls]
+        for ch_schedule in self._schedule.values():
+            shared.append(ch_schedule.channel_obj)
+            if isinstance(ch_schedule, _DMMSchedule):
+                shared.append(ch_schedule.detuning_map)
+        for obj in shared:
+            memo.setdefault(id(obj), obj)
+        cls = type(self)
+        new = cls.__new__(cls)
+        memo[id(self)] = new
+        for attr, value in self.__dict__.items():
+            setattr(new, attr, copy.deepcopy(value, memo))
+        # The cached plan refers to the original stored calls
+        new._build_plan = None
+        return new
+
     def _add_to_schedule(self, channel: str, timeslot: _TimeSlot) -> None:
         # Maybe get rid of this
         self._schedule[channel].slots.append(timeslot)
@@ -2284,6 +2389,98 @@ class Sequence(Generic[DeviceType]):
                 + ", ".join(valid_protocols)
             )
 
+    def _check_build_qubits(
+        self, qubits: Optional[Mapping[QubitId, int]]
+    ) -> None:
+        """Checks the qubits are given only for a mappable register."""
+        if self.is_register_mappable():
+            if qubits is None:
+                raise ValueError(
+                    "'qubits' must be specified when the sequence is created "
+                    "with a MappableRegister."
+                )
+
+        elif qubits is not None:
+            raise ValueError(
+                "'qubits' must not be specified when the sequence already has "
+                "a concrete register."
+            )
+
+    def _get_build_base(self) -> Sequence:
+        """Copies the non-parametrized part of the sequence."""
+        # Shallow copy with stored parametrized objects (if any)
+        # NOTE: While seq is a shallow copy, be extra careful with changes to
+        # attributes of seq pointing to mutable objects, as they might be
+        # inadvertedly done to self too
+        seq = copy.copy(self)
+
+        # Eliminates the source of recursiveness errors
+        seq._reset_parametrized()
+
+        # Deepcopy the base sequence (what remains)
+        return copy.deepcopy(seq)
+        # NOTE: Changes to the returned sequence are now safe to do
+
+    def _check_build_many_inputs(
+        self,
+        vars_list: Iterable[Mapping[str, Union[ArrayLike, float, int]]],
+        qubits: Optional[Mapping[QubitId, int]],
+    ) -> list[dict[str, Any]]:
+        """Checks the inputs for building the sequence many times."""
+        self._check_build_qubits(qubits)
+        all_vars: list[dict[str, Any]] = [dict(vars) for vars in vars_list]
+        for vars in all_vars:
+            self._cross_check_vars(vars)
+        if not (self.is_parametrized() or self.is_register_mappable()):
+            warnings.warn(
+                "Building a non-parametrized sequence simply returns"
+                " a copy of itself.",
+                stacklevel=3,
+            )
+        return all_vars
+
+    def _get_builder(
+        self, qubits: Optional[Mapping[QubitId, int]] = None
+    ) -> _SequenceBuilder:
+        """Gets a builder to build the sequence many times."""
+        return _SequenceBuilder(self, qubits)
+
+    def _get_build_plan(self) -> EvaluationPlan:
+        """Compiles the arguments of the stored calls into a single plan.
+
+        The plan is cached until a new call is stored.
+        """
+        if self._build_plan is None:
+            self._build_plan = EvaluationPlan(
+                arg
+                for call in self._to_build_calls
+                for arg in itertools.chain(call.args, call.kwargs.values())
+            )
+        return self._build_plan
+
+    def _apply_build_calls(
+        self,
+        seq: Sequence,
+        reg: Optional[BaseRegister],
+        built_args: Iterable[Any],
+    ) -> None:
+        """Executes the stored calls on a copy of the base sequence.
+
+        Args:
+            seq: The copy of the base sequence.
+            reg: The register to set, if the sequence's register is mappable.
+            built_args: The arguments of the stored calls, as evaluated by
+                the plan returned by ``Sequence._get_build_plan()``.
+        """
+        if reg is not None:
+            self._set_register(seq, reg)
+
+        built = iter(built_args)
+        for call in self._to_build_calls:
+            args_ = [next(built) for _ in call.args]
+            kwargs_ = {key: next(built) for key in call.kwargs}
+            getattr(seq, call.name)(*args_, **kwargs_)
+
     def _reset_parametrized(self) -> None:
         """Resets all attributes related to parametrization."""
         # Signals the sequence as actively "building" ie not parametrized
@@ -2291,6 +2488,7 @@ class Sequence(Generic[DeviceType]):
         self._param_measurement = ""
         self._variables = {}
         self._to_build_calls = []
+        self._build_plan = None
 
     def _set_register(self, seq: Sequence, reg: BaseRegister) -> None:
         """Sets the register on a sequence who had a mappable register."""
@@ -2304,6 +2502,7 @@ class Sequence(Generic[DeviceType]):
                     stored_values = slot._asdict()
                     stored_values["targets"] = qids
                     seq._schedule[ch].slots[i] = _TimeSlot(**stored_values)
+                seq._schedule[ch]._reset_index()
             else:
                 # Make sure all explicit targets are in the register
                 for slot in self._schedule[ch]:
@@ -2336,3 +2535,85 @@ class Sequence(Generic[DeviceType]):
                     "Did not receive values for variables: "
                     + ", ".join(missing_vars)
                 )
+
+
+class _SequenceBuilder:
+    """Builds many sequences from the same parametrized sequence.
+
+    Args:
+        seq: The parametrized (or register mappable) sequence.
+        qubits: The mapping between qubit IDs and trap IDs, if the register
+            is mappable.
+    """
+
+    def __init__(
+        self, seq: Sequence, qubits: Optional[Mapping[QubitId, int]] = None
+    ):
+        self.seq = seq
+        self.reg = (
+            cast(MappableRegister, seq._register).build_register(qubits)
+            if qubits
+            else None
+        )
+        self.base = seq._get_build_base()
+        self.plan = seq._get_build_plan()
+
+    def build_from_args(
+        self, built_args: list[Any], return_samples: bool = False
+    ) -> Sequence | SequenceSamples:
+        """Builds a sequence from the arguments evaluated by the plan."""
+        # The copies share everything that the building calls don't modify
+        seq = copy.deepcopy(self.base)
+        self.seq._apply_build_calls(seq, self.reg, built_args)
+        return sampler.sample(seq) if return_samples else seq
+
+    def build(
+        self,
+        vars: Mapping[str, Union[ArrayLike, float, int]],
+        return_samples: bool = False,
+    ) -> Sequence | SequenceSamples:
+        """Builds a sequence with the given variable values."""
+        return self.build_from_args(self.plan.evaluate(vars), return_samples)
+
+    def iter_build(
+        self,
+        all_vars: list[dict[str, Any]],
+        return_samples: bool = False,
+    ) -> Iterator[Sequence | SequenceSamples]:
+        """Builds a sequence for each set of variable values, lazily."""
+        for built_args in self.evaluate_batch(all_vars):
+            yield self.build_from_args(built_args, return_samples)
+
+    def evaluate_batch(
+        self, all_vars: list[dict[str, Any]]
+    ) -> list[list[Any]]:
+        """Evaluates the arguments of the calls for each set of variables."""
+        if not self.plan.variables:
+            return [self.plan.evaluate({}) for _ in all_vars]
+        # Evaluates the arguments of all the sequences at once
+        return self.plan.evaluate_batch(
+            {
+                name: [vars[name] for vars in all_vars]
+                for name in self.plan.variables
+            }
+        )
+
+
+# The builder used by the processes of a pool running Sequence.build_many()
+_worker_builder: Optional[_SequenceBuilder] = None
+
+
+def _init_build_worker(
+    seq: Sequence, qubits: Optional[Mapping[QubitId, int]]
+) -> None:
+    """Stores a builder in the global state of a pool's process."""
+    global _worker_builder
+    _worker_builder = _SequenceBuilder(seq, qubits)
+
+
+def _build_worker(
+    vars: Mapping[str, Union[ArrayLike, float, int]], return_samples: bool
+) -> Sequence | SequenceSamples:
+    """Builds one sequence with the builder of the process."""
+    assert _worker_builder is not None
+    return _worker_builder.build(vars, return_samples)
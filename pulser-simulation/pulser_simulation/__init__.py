@@ -16,6 +16,7 @@
 from pulser.backend import EmulatorConfig, NoiseModel
 
 from pulser_simulation._version import __version__ as __version__
+from pulser_simulation.cache import ResultsCache
 from pulser_simulation.qutip_backend import QutipBackend
 from pulser_simulation.simconfig import SimConfig
 from pulser_simulation.simulation import QutipEmulator, Simulation
@@ -25,5 +26,6 @@ __all__ = [
     "NoiseModel",
     "QutipBackend",
     "QutipEmulator",
+    "ResultsCache",
     "SimConfig",
 ]
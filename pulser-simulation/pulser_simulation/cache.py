@@ -0,0 +1,165 @@
+# Copyright 2024 Pulser Development Team
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Defines the ResultsCache class."""
+from __future__ import annotations
+
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Optional, Union, cast
+
+import numpy as np
+
+from pulser_simulation.simresults import SimulationResults
+
+
+class ResultsCache:
+    """An on-disk cache of emulation results.
+
+    Each result is stored in its own file, named after the idempotent hash
+    of everything that determines it (see `QutipEmulator.run()`), so the
+    cache can be shared between sessions. Whenever the stored results
+    exceed the size limit, the least recently used ones are evicted.
+
+    Args:
+        directory: The directory where the results are stored. It is
+            created if it does not exist.
+        max_size: The maximum total size of the stored results, in bytes.
+            Defaults to 1 GiB.
+    """
+
+    _SUFFIX = ".pkl"
+
+    def __init__(
+        self, directory: Union[str, os.PathLike], max_size: int = 2**30
+    ):
+        """Initializes a results cache in the given directory."""
+        if not isinstance(max_size, int) or max_size <= 0:
+            raise ValueError(
+                f"`max_size` must be a positive integer, not {max_size!r}."
+            )
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_size = max_size
+
+    @property
+    def directory(self) -> Path:
+        """The directory where the results are stored."""
+        return self._directory
+
+    @property
+    def max_size(self) -> int:
+        """The maximum total size of the stored results, in bytes."""
+        return self._max_size
+
+    @property
+    def size(self) -> int:
+        """The total size of the stored results, in bytes."""
+        return sum(size for _, size, _ in self._entries())
+
+    def _path(self, key: str) -> Path:
+        return self._directory / (key + self._SUFFIX)
+
+    def _entries(self) -> list[tuple[int, int, Path]]:
+        """The last use time, size and path of each stored result."""
+        entries = []
+        for path in self._directory.glob("*" + self._SUFFIX):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # pragma: no cover
+                # Evicted in the meantime (e.g. by another process)
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        return entries
+
+    def __contains__(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    def get(self, key: str) -> Optional[SimulationResults]:
+        """Gets the results stored under a key.
+
+        If the results were stored with a random state, NumPy's global
+        random state is set to it, so that the following random draws are
+        the same as when the results were obtained.
+
+        Args:
+            key: The key of the results.
+
+        Returns:
+            The stored results, or None if there are none.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                results, random_state = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, EOFError, ValueError):
+            # The file is unreadable, so it is discarded
+            path.unlink(missing_ok=True)
+            return None
+        # Marks the results as the most recently used
+        os.utime(path)
+        if random_state is not None:
+            np.random.set_state(random_state)
+        return cast(SimulationResults, results)
+
+    def put(
+        self,
+        key: str,
+        results: SimulationResults,
+        random_state: Any = None,
+    ) -> None:
+        """Stores results under a key, evicting older ones if needed.
+
+        Results larger than the size limit are not stored.
+
+        Args:
+            key: The key of the results.
+            results: The results to store.
+            random_state: NumPy's global random state (as returned by
+                ``numpy.random.get_state()``) after obtaining results that
+                depend on random draws.
+        """
+        data = pickle.dumps(
+            (results, random_state), protocol=pickle.HIGHEST_PROTOCOL
+        )
+        if len(data) > self._max_size:
+            return
+        # Writes to a temporary file first, so that an interrupted write
+        # never leaves a partial entry behind
+        with tempfile.NamedTemporaryFile(
+            dir=self._directory, suffix=".tmp", delete=False
+        ) as f:
+            f.write(data)
+        os.replace(f.name, self._path(key))
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries(), key=lambda entry: entry[0])
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total_size <= self._max_size:
+                break
+            path.unlink(missing_ok=True)
+            total_size -= size
+
+    def clear(self) -> None:
+        """Removes all the stored results."""
+        for _, _, path in self._entries():
+            path.unlink(missing_ok=True)
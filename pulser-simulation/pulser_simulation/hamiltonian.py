@@ -15,13 +15,16 @@
 
 from __future__ import annotations
 
-import itertools
+import warnings
 from collections import defaultdict
 from collections.abc import Mapping
-from typing import Union, cast
+from typing import Optional, Union, cast
 
 import numpy as np
 import qutip
+import scipy.sparse as sp
+from scipy.special import ndtri
+from scipy.stats import qmc
 
 from pulser.backend.noise_model import NoiseModel
 from pulser.devices._device_datacls import BaseDevice
@@ -30,6 +33,44 @@ from pulser.sampler.samples import SequenceSamples, _PulseTargetSlot
 from pulser_simulation.simconfig import SUPPORTED_NOISES, doppler_sigma
 
 
+def _sample_unit_hypercube(method: str, n_points: int, dim: int) -> np.ndarray:
+    """Samples points of the unit hypercube with a given method.
+
+    The randomization of the points is seeded from NumPy's global random
+    state.
+
+    Args:
+        method: The noise sampler (see `NoiseModel`), except "random".
+        n_points: The number of points to sample.
+        dim: The dimension of the hypercube.
+
+    Returns:
+        An array of shape (n_points, dim).
+    """
+    seed = np.random.randint(2**32, dtype=np.uint64)
+    if method == "antithetic":
+        # Each point is followed by its mirror image
+        points = np.random.default_rng(seed).uniform(
+            size=((n_points + 1) // 2, dim)
+        )
+        return cast(
+            np.ndarray,
+            np.stack([points, 1 - points], axis=1).reshape(-1, dim)[:n_points],
+        )
+    engine: qmc.QMCEngine
+    if method == "stratified":
+        engine = qmc.LatinHypercube(dim, seed=seed)
+    elif method == "sobol":
+        engine = qmc.Sobol(dim, seed=seed)
+    else:
+        engine = qmc.Halton(dim, seed=seed)
+    with warnings.catch_warnings():
+        # The balance of Sobol' points is only ensured for powers of 2, but
+        # they still beat random points otherwise
+        warnings.filterwarnings("ignore", message="The balance properties")
+        return cast(np.ndarray, engine.random(n_points))
+
+
 class Hamiltonian:
     r"""Generates Hamiltonian from a sampled sequence and noise.
 
@@ -41,6 +82,10 @@ class Hamiltonian:
         sampling_rate: The fraction of samples that we wish to extract from
             the samples to simulate. Has to be a value between 0.05 and 1.0.
         config: Configuration to be used for this simulation.
+        blockade_radius: If defined, the Hamiltonian is only built on the
+            subspace of states where no two atoms closer than this radius
+            (in µm) are both in the Rydberg state. Only possible in the
+            'ground-rydberg' basis.
     """
 
     def __init__(
@@ -50,12 +95,22 @@ class Hamiltonian:
         device: BaseDevice,
         sampling_rate: float,
         config: NoiseModel,
+        blockade_radius: Optional[float] = None,
     ) -> None:
         """Instantiates a Hamiltonian object."""
         self.samples_obj = samples_obj
         self._qdict = qdict
         self._device = device
         self._sampling_rate = sampling_rate
+        if blockade_radius is not None and blockade_radius <= 0:
+            raise ValueError(
+                "The blockade radius must be greater than zero, not "
+                f"{blockade_radius}."
+            )
+        self._blockade_radius = blockade_radius
+        # The indices, in the full space, of the basis states spanning
+        # the emulated space (None if it is the full space)
+        self._subspace: Optional[np.ndarray] = None
 
         # Type hints for attributes defined outside of __init__
         self.basis_name: str
@@ -86,6 +141,10 @@ class Hamiltonian:
             addr: defaultdict(dict) for addr in ["Global", "Local"]
         }
         self._collapse_ops: list[qutip.Qobj] = []
+        # Stores the hermitian operators that form the Hamiltonian's skeleton,
+        # reused at every run so that only their coefficients get updated
+        self._hermitian_ops: dict[tuple, tuple[qutip.Qobj, qutip.Qobj]] = {}
+        self._interaction_terms: dict[tuple[bool, ...], qutip.Qobj] = {}
 
         self.set_config(config)
 
@@ -194,7 +253,12 @@ class Hamiltonian:
             and depend on the qubit's id qid.
             """
             noise_amp_base = max(
-                0, np.random.normal(1.0, self.config.amp_sigma)
+                0,
+                (
+                    np.random.normal(1.0, self.config.amp_sigma)
+                    if amp_fluctuations is None
+                    else next(amp_fluctuations)
+                ),
             )
             for qid in slot.targets:
                 if "doppler" in self.config.noise_types:
@@ -209,6 +273,12 @@ class Hamiltonian:
                     noise_amp = noise_amp_base * np.exp(-((r / w0) ** 2))
                     samples_dict[qid]["amp"][slot.ti : slot.tf] *= noise_amp
 
+        # The amplitude fluctuations of each pulse, if drawn beforehand
+        amp_fluctuations = (
+            None
+            if self._amp_fluctuations is None
+            else iter(self._amp_fluctuations)
+        )
         if local_noises:
             for ch, ch_samples in self.samples_obj.channel_samples.items():
                 addr = self.samples_obj._ch_objs[ch].addressing
@@ -274,28 +344,160 @@ class Hamiltonian:
                 for qubit in qubits:
                     k = self._qid_index[qubit]
                     op_list[k] = operator
+        if self._subspace is not None:
+            return self._build_subspace_operator(op_list)
         return qutip.tensor(list(map(qutip.Qobj, op_list)))
 
-    def _update_noise(self) -> None:
+    def _build_subspace_operator(self, op_list: list) -> qutip.Qobj:
+        """Projects a tensor product of single-atom operators on the subspace.
+
+        Args:
+            op_list: The operator acting on each atom.
+
+        Returns:
+            The projected operator, as a sparse matrix on the subspace.
+        """
+        subspace = cast(np.ndarray, self._subspace)
+        place_values = self.dim ** np.arange(self._size - 1, -1, -1)
+        cols = np.arange(subspace.size)
+        rows_ind = subspace
+        values = np.ones(subspace.size, dtype=complex)
+        for k, operator in enumerate(op_list):
+            if operator is self.op_matrix["I"]:
+                continue
+            matrix = qutip.Qobj(operator).full()
+            # Maps each state to all the values of the k-th atom's digit
+            out_digits = np.repeat(np.arange(self.dim), rows_ind.size)
+            in_digits = np.tile(
+                (rows_ind // place_values[k]) % self.dim, self.dim
+            )
+            rows_ind = (
+                np.tile(rows_ind, self.dim)
+                + (out_digits - in_digits) * place_values[k]
+            )
+            cols = np.tile(cols, self.dim)
+            values = np.tile(values, self.dim) * matrix[out_digits, in_digits]
+            nonzero = values != 0
+            cols, rows_ind, values = (
+                cols[nonzero],
+                rows_ind[nonzero],
+                values[nonzero],
+            )
+        # Discards the states outside of the subspace
+        rows = np.minimum(
+            np.searchsorted(subspace, rows_ind), subspace.size - 1
+        )
+        inside = subspace[rows] == rows_ind
+        data = sp.csr_matrix(
+            (values[inside], (rows[inside], cols[inside])),
+            shape=(subspace.size, subspace.size),
+        )
+        return qutip.Qobj(data, dims=[[subspace.size]] * 2)
+
+    def _blockade_subspace(self) -> np.ndarray:
+        """Finds the basis states respecting the Rydberg blockade.
+
+        These correspond to the independent sets of the graph connecting the
+        atoms closer than the blockade radius, which are built by adding one
+        atom at a time.
+
+        Returns:
+            The sorted indices of these states in the full space.
+        """
+        coords = np.array(list(self._qdict.values()), dtype=float)
+        dists = np.linalg.norm(
+            coords[:, np.newaxis] - coords[np.newaxis], axis=-1
+        )
+        # Each state is encoded by a mask of the atoms in the Rydberg state,
+        # with the first atom as the most significant bit
+        place_values = 2 ** np.arange(self._size - 1, -1, -1, dtype=np.int64)
+        masks = np.zeros(1, dtype=np.int64)
+        for i in range(self._size):
+            blockaded = np.sum(
+                place_values[:i][dists[i, :i] < self._blockade_radius]
+            )
+            masks = np.concatenate(
+                (masks, masks[(masks & blockaded) == 0] | place_values[i])
+            )
+        # |r> is the 0 state, so a Rydberg atom clears its bit in the index
+        return np.sort((2**self._size - 1) ^ masks)
+
+    def _noise_dims(self) -> tuple[int, int, int]:
+        """The number of random noise parameters drawn at each run.
+
+        Returns:
+            The number of state preparation errors, Doppler detunings and
+            amplitude fluctuations, respectively.
+        """
+        n_atoms = len(self._qid_index)
+        noise_types = self.config.noise_types
+        return (
+            (
+                n_atoms
+                if "SPAM" in noise_types and self.config.state_prep_error > 0
+                else 0
+            ),
+            n_atoms if "doppler" in noise_types else 0,
+            (
+                sum(
+                    len(ch_samples.slots)
+                    for ch_samples in self.samples_obj.channel_samples.values()
+                )
+                if "amplitude" in noise_types
+                else 0
+            ),
+        )
+
+    def _draw_noise_points(self, n_runs: int) -> Optional[np.ndarray]:
+        """Draws the points setting the noise parameters of multiple runs.
+
+        Args:
+            n_runs: The number of runs.
+
+        Returns:
+            An array of shape (n_runs, sum(self._noise_dims())) with points
+            of the unit hypercube, drawn with the configured noise sampler,
+            or None if the noise parameters must be drawn at random.
+        """
+        dim = sum(self._noise_dims())
+        if self.config.noise_sampler == "random" or dim == 0:
+            return None
+        return _sample_unit_hypercube(self.config.noise_sampler, n_runs, dim)
+
+    def _update_noise(self, noise_point: Optional[np.ndarray] = None) -> None:
         """Updates noise random parameters.
 
         Used at the start of each run. If SPAM isn't in chosen noises, all
         atoms are set to be correctly prepared.
+
+        Args:
+            noise_point: A point of the unit hypercube setting the noise
+                parameters through the inverse of their cumulative
+                distribution function (see `_draw_noise_points()`). If None,
+                the parameters are drawn at random.
         """
-        if (
-            "SPAM" in self.config.noise_types
-            and self.config.state_prep_error > 0
-        ):
+        n_prep, n_doppler, _ = self._noise_dims()
+        self._amp_fluctuations: Optional[np.ndarray] = None
+        if noise_point is not None:
+            prep_point = noise_point[:n_prep]
+            doppler_point = noise_point[n_prep : n_prep + n_doppler]
+            if n_prep + n_doppler < len(noise_point):
+                self._amp_fluctuations = 1.0 + self.config.amp_sigma * ndtri(
+                    noise_point[n_prep + n_doppler :]
+                )
+        if n_prep:
             dist = (
                 np.random.uniform(size=len(self._qid_index))
-                < self.config.state_prep_error
-            )
+                if noise_point is None
+                else prep_point
+            ) < self.config.state_prep_error
             self._bad_atoms = dict(zip(self._qid_index, dist))
-        if "doppler" in self.config.noise_types:
-            detune = np.random.normal(
-                0,
-                doppler_sigma(self.config.temperature / 1e6),
-                size=len(self._qid_index),
+        if n_doppler:
+            sigma = doppler_sigma(self.config.temperature / 1e6)
+            detune = (
+                np.random.normal(0, sigma, size=len(self._qid_index))
+                if noise_point is None
+                else sigma * ndtri(doppler_point)
             )
             self._doppler_detune = dict(zip(self._qid_index, detune))
 
@@ -331,61 +533,126 @@ class Hamiltonian:
                 self.basis[proj[0]] * self.basis[proj[1]].dag()
             )
 
-    def _construct_hamiltonian(self, update: bool = True) -> None:
-        """Constructs the hamiltonian from the sampled Sequence and noise.
+        if self._blockade_radius is not None:
+            if self.basis_name != "ground-rydberg":
+                raise NotImplementedError(
+                    "Emulation in the subspace respecting the Rydberg "
+                    "blockade is only possible in the 'ground-rydberg' "
+                    f"basis, not in the '{self.basis_name}' basis."
+                )
+            self._subspace = self._blockade_subspace()
 
-        Also builds qutip.Qobjs related to the Sequence if not built already,
-        and refreshes potential noise parameters by drawing new at random.
+    def _interaction_coeffs(self, excluded: np.ndarray) -> np.ndarray:
+        """Computes the interaction coefficient of every pair of atoms.
 
-        Args:
-            update: Whether to update the noise parameters.
-        """
-        if update:
-            self._update_noise()
-        self._extract_samples()
-
-        def make_vdw_term(q1: QubitId, q2: QubitId) -> qutip.Qobj:
-            """Construct the Van der Waals interaction Term.
+        The units are given so that the coefficients include a 1/hbar
+        factor, as well as the 1/2 factor compensating for the hermitian
+        conjugate added to the final Hamiltonian.
 
-            For each pair of qubits, calculate the distance between them,
-            then assign the local operator "sigma_rr" at each pair.
-            The units are given so that the coefficient includes a
-            1/hbar factor.
-            """
-            dist = np.linalg.norm(self._qdict[q1] - self._qdict[q2])
-            U = 0.5 * self._device.interaction_coeff / dist**6
-            return U * self.build_operator([("sigma_rr", [q1, q2])])
-
-        def make_xy_term(q1: QubitId, q2: QubitId) -> qutip.Qobj:
-            """Construct the XY interaction Term.
+        Args:
+            excluded: A boolean array flagging, in register order, the atoms
+                that don't take part in the interaction.
 
-            For each pair of qubits, calculate the distance between them,
-            then assign the local operator "sigma_ud * sigma_du" at each pair.
-            The units are given so that the coefficient
-            includes a 1/hbar factor.
-            """
-            dist = np.linalg.norm(self._qdict[q1] - self._qdict[q2])
-            coords_dim = len(self._qdict[q1])
+        Returns:
+            A strictly upper-triangular array whose (i, j) entry holds the
+            interaction coefficient between atoms i and j.
+        """
+        coords = np.array(list(self._qdict.values()), dtype=float)
+        rows, cols = np.triu_indices(self._size, k=1)
+        keep = ~(excluded[rows] | excluded[cols])
+        rows, cols = rows[keep], cols[keep]
+        diffs = coords[rows] - coords[cols]
+        dists = np.sqrt(np.sum(diffs**2, axis=1))
+        if self._interaction == "XY":
             mag_field = cast(np.ndarray, self.samples_obj._magnetic_field)[
-                :coords_dim
+                : coords.shape[1]
             ]
             mag_norm = np.linalg.norm(mag_field)
             if mag_norm < 1e-8:
-                cosine = 0.0
+                cosines = np.zeros_like(dists)
             else:
-                cosine = np.dot(
-                    (self._qdict[q1] - self._qdict[q2]),
-                    mag_field,
-                ) / (dist * mag_norm)
-            U = (
+                cosines = (diffs @ mag_field) / (dists * mag_norm)
+            pair_coeffs = (
                 0.5
                 * cast(float, self._device.interaction_coeff_xy)
-                * (1 - 3 * cosine**2)
-                / dist**3
+                * (1 - 3 * cosines**2)
+                / dists**3
+            )
+        else:
+            pair_coeffs = 0.5 * self._device.interaction_coeff / dists**6
+        coeffs = np.zeros((self._size, self._size))
+        coeffs[rows, cols] = pair_coeffs
+        return coeffs
+
+    def _build_interaction_term(self, coeffs: np.ndarray) -> qutip.Qobj:
+        """Builds the sparse interaction operator from pair coefficients.
+
+        Instead of summing tensor products over all pairs of atoms, the
+        matrix elements are computed directly from the digits of the basis
+        state indices. The Ising term is diagonal, with one "sigma_rr"
+        projector per atom of each pair, while the XY term only couples
+        states differing by a "sigma_ud * sigma_du" flip of a pair.
+
+        Args:
+            coeffs: The strictly upper-triangular interaction coefficients,
+                as returned by ``Hamiltonian._interaction_coeffs()``.
+
+        Returns:
+            The interaction term, without its hermitian conjugate.
+        """
+        indices = (
+            np.arange(self.dim**self._size)
+            if self._subspace is None
+            else self._subspace
+        )
+        # The first atom corresponds to the most significant digit
+        place_values = self.dim ** np.arange(self._size - 1, -1, -1)
+        digits = (indices[:, np.newaxis] // place_values) % self.dim
+        if self._interaction == "XY":
+            # |u> and |d> are respectively the 0 and 1 states
+            rows, cols = np.nonzero(coeffs)
+            # States where 'sigma_ud' (on rows) and 'sigma_du' (on cols)
+            # act non-trivially, for each pair
+            states, pairs = np.nonzero(
+                (digits[:, rows] == 1) & (digits[:, cols] == 0)
             )
-            return U * self.build_operator(
-                [("sigma_ud", [q1]), ("sigma_du", [q2])]
+            data = sp.csr_matrix(
+                (
+                    coeffs[rows, cols][pairs],
+                    (
+                        states
+                        - place_values[rows[pairs]]
+                        + place_values[cols[pairs]],
+                        states,
+                    ),
+                ),
+                shape=(self.dim**self._size,) * 2,
             )
+        else:
+            # |r> is the 0 state in both the 'ground-rydberg' and 'all' bases
+            occupations = (digits == 0).astype(float)
+            diag = np.sum((occupations @ coeffs) * occupations, axis=1)
+            data = sp.diags(diag, format="csr")
+            if self._subspace is not None:
+                return qutip.Qobj(data, dims=[[self._subspace.size]] * 2)
+        return qutip.Qobj(data, dims=[[self.dim] * self._size] * 2)
+
+    def _construct_hamiltonian(
+        self, update: bool = True, noise_point: Optional[np.ndarray] = None
+    ) -> None:
+        """Constructs the hamiltonian from the sampled Sequence and noise.
+
+        Also builds qutip.Qobjs related to the Sequence if not built already,
+        and refreshes potential noise parameters by drawing new at random.
+
+        Args:
+            update: Whether to update the noise parameters.
+            noise_point: The point setting the new noise parameters, if they
+                are updated (see `_update_noise()`).
+        """
+        if update:
+            self._update_noise(noise_point)
+        self._extract_samples()
 
         def make_interaction_term(masked: bool = False) -> qutip.Qobj:
             if masked:
@@ -397,28 +664,47 @@ class Hamiltonian:
                 if effective_size < 2:
                     return 0 * self.build_operator([("I", "global")])
 
-            # make interaction term
-            dipole_interaction = cast(qutip.Qobj, 0)
-            for q1, q2 in itertools.combinations(self._qdict.keys(), r=2):
-                if (
-                    self._bad_atoms[q1]
-                    or self._bad_atoms[q2]
+            # Atoms excluded from the interaction
+            excluded = tuple(
+                bool(
+                    self._bad_atoms[q]
                     or (
                         masked
                         and self._interaction == "XY"
-                        and (
-                            q1 in self.samples_obj._slm_mask.targets
-                            or q2 in self.samples_obj._slm_mask.targets
-                        )
+                        and q in self.samples_obj._slm_mask.targets
                     )
-                ):
-                    continue
+                )
+                for q in self._qdict
+            )
+            # The term only depends on the excluded atoms, so it is built
+            # once for each configuration (already including its conjugate)
+            if excluded not in self._interaction_terms:
+                term = self._build_interaction_term(
+                    self._interaction_coeffs(np.array(excluded))
+                )
+                self._interaction_terms[excluded] = term + term.dag()
+            return self._interaction_terms[excluded]
+
+        def make_hermitian_terms(
+            key: tuple, operator: qutip.Qobj, coeff: np.ndarray
+        ) -> list[list]:
+            """Adds the hermitian conjugate to a term of the Hamiltonian.
 
-                if self._interaction == "XY":
-                    dipole_interaction += make_xy_term(q1, q2)
-                else:
-                    dipole_interaction += make_vdw_term(q1, q2)
-            return dipole_interaction
+            A term c(t) * O + h.c. is written as Re[c(t)] * (O + O^dag)
+            + Im[c(t)] * i(O - O^dag), with hermitian operators built only
+            once for each key and real coefficients.
+            """
+            if key not in self._hermitian_ops:
+                self._hermitian_ops[key] = (
+                    operator + operator.dag(),
+                    1j * (operator - operator.dag()),
+                )
+            re_op, im_op = self._hermitian_ops[key]
+            coeff = self._adapt_to_sampling_rate(coeff)
+            terms = [[re_op, np.real(coeff)]]
+            if np.any(np.imag(coeff) != 0):
+                terms.append([im_op, np.imag(coeff)])
+            return terms
 
         def build_coeffs_ops(basis: str, addr: str) -> list[list]:
             """Build coefficients and operators for the hamiltonian QobjEvo."""
@@ -445,11 +731,8 @@ class Hamiltonian:
                             operators[op_id] = self.build_operator(
                                 [(op_id, "global")]
                             )
-                        terms.append(
-                            [
-                                operators[op_id],
-                                self._adapt_to_sampling_rate(coeff),
-                            ]
+                        terms += make_hermitian_terms(
+                            (addr, basis, op_id), operators[op_id], coeff
                         )
             elif addr == "Local":
                 for q_id, samples_q in samples.items():
@@ -467,11 +750,10 @@ class Hamiltonian:
                                 operators[q_id][op_id] = self.build_operator(
                                     [(op_id, [q_id])]
                                 )
-                            terms.append(
-                                [
-                                    operators[q_id][op_id],
-                                    self._adapt_to_sampling_rate(coeff),
-                                ]
+                            terms += make_hermitian_terms(
+                                (addr, basis, q_id, op_id),
+                                operators[q_id][op_id],
+                                coeff,
                             )
             self.operators[addr][basis] = operators
             return terms
@@ -518,7 +800,7 @@ class Hamiltonian:
         if not qobj_list:  # If qobj_list ends up empty
             qobj_list = [0 * self.build_operator([("I", "global")])]
 
-        ham = qutip.QobjEvo(qobj_list, tlist=self.sampling_times)
-        ham = ham + ham.dag()
-        ham.compress()
-        self._hamiltonian = ham
+        # All the terms are already hermitian, so the QobjEvo is directly
+        # built from the cached operators and the new coefficients
+        self._ham_terms = qobj_list
+        self._hamiltonian = qutip.QobjEvo(qobj_list, tlist=self.sampling_times)
@@ -15,7 +15,7 @@
 from __future__ import annotations
 
 import warnings
-from typing import Any
+from typing import Any, Optional
 
 from pulser import Sequence
 from pulser.backend.abc import Backend
@@ -30,7 +30,15 @@ class QutipBackend(Backend):
 
     Args:
         sequence: The sequence to emulate.
-        config: The configuration for the Qutip emulator.
+        config: The configuration for the Qutip emulator. Its
+            `backend_options` are used as default keyword arguments of
+            `QutipEmulator.run()` (e.g. ``{"noise_solver": "mcsolve",
+            "ntraj": 200}`` to unravel the noise channels into quantum
+            trajectories, ``{"engine": "propagator"}`` to evolve the
+            state through exact matrix exponentials or
+            ``{"cache": ResultsCache(directory)}`` to reuse the results of
+            identical emulations), apart from "blockade_radius", which is
+            given to the `QutipEmulator` instead.
     """
 
     def __init__(
@@ -53,22 +61,33 @@ class QutipBackend(Backend):
             config=simconfig,
             evaluation_times=self._config.evaluation_times,
             with_modulation=self._config.with_modulation,
+            blockade_radius=self._config.backend_options.get(
+                "blockade_radius"
+            ),
         )
         self._sim_obj.set_initial_state(self._config.initial_state)
 
     def run(
-        self, progress_bar: bool = False, **qutip_options: Any
+        self,
+        progress_bar: bool = False,
+        n_workers: Optional[int] = None,
+        **qutip_options: Any,
     ) -> SimulationResults:
         """Emulates the sequence using QuTiP's solvers.
 
         Args:
             progress_bar: If True, the progress bar of QuTiP's
                 solver will be shown. If None or False, no text appears.
-            options: Used as arguments for qutip.Options(). If specified, will
-                override SimConfig solver_options. If no `max_step` value is
-                provided, an automatic one is calculated from the `Sequence`'s
-                schedule (half of the shortest duration among pulses and
-                delays).
+            n_workers: If given, the runs of a noisy emulation are spread
+                across a pool of `n_workers` processes, each run drawing its
+                noise from an independent random stream.
+            options: Used as arguments for qutip.Options() (or as the other
+                keyword arguments of `QutipEmulator.run()`, like
+                `noise_solver`, `engine`, `cache` or `state_callback`). If
+                specified, will override the `backend_options` of the config.
+                If no `max_step` value is provided, an automatic one is
+                calculated from the `Sequence`'s schedule (half of the
+                shortest duration among pulses and delays).
                 Refer to the QuTiP docs_ for an overview of the parameters.
 
                 .. _docs: https://bit.ly/3il9A2u
@@ -79,4 +98,14 @@ class QutipBackend(Backend):
             noise model in EmulatorConfig requires it.
             Otherwise, returns CoherentResults.
         """
-        return self._sim_obj.run(progress_bar=progress_bar, **qutip_options)
+        run_options = {
+            **{
+                k: v
+                for k, v in self._config.backend_options.items()
+                if k != "blockade_radius"
+            },
+            **qutip_options,
+        }
+        if n_workers is not None:
+            run_options["n_workers"] = n_workers
+        return self._sim_obj.run(progress_bar=progress_bar, **run_options)
@@ -14,8 +14,9 @@
 """Defines a special Result subclass for simulation runs returning states."""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Union, cast
+import typing
+from dataclasses import dataclass, field
+from typing import Optional, cast, overload
 
 import numpy as np
 import qutip
@@ -24,6 +25,82 @@ from pulser.register import QubitId
 from pulser.result import Result
 
 
+def _probs_to_weights(
+    probs: np.ndarray,
+    size: int,
+    dim: int,
+    meas_basis: str,
+    matching_meas_basis: bool,
+    subspace_indices: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Turns the probabilities of the basis states into bitstring weights.
+
+    Args:
+        probs: The probability of each basis state, along the last axis
+            (the leading axes index different states).
+        size: The number of atoms.
+        dim: The dimension of the single-atom states.
+        meas_basis: The measurement basis.
+        matching_meas_basis: Whether the measurement basis is the
+            same as the states' basis.
+        subspace_indices: The indices of the basis states spanning the
+            subspace the states are restricted to, if any.
+
+    Returns:
+        The normalized weight of each bitstring, along the last axis.
+    """
+    batch_shape = probs.shape[:-1]
+    if subspace_indices is not None:
+        # Maps the probabilities back to the full space
+        full_probs = np.zeros(batch_shape + (dim**size,))
+        full_probs[..., subspace_indices] = probs
+        probs = full_probs
+
+    if dim == 2:
+        if matching_meas_basis:
+            # State vector ordered with r first for 'ground_rydberg'
+            # e.g. n=2: [rr, rg, gr, gg] -> [11, 10, 01, 00]
+            # Invert the order ->  [00, 01, 10, 11] correspondence
+            # In the XY and digital bases, the order is canonical
+            weights = (
+                probs[..., ::-1] if meas_basis == "ground-rydberg" else probs
+            )
+        else:
+            # Only 000...000 is measured
+            weights = np.zeros(probs.shape)
+            weights[..., 0] = 1.0
+
+    elif dim == 3:
+        # The single-atom states are ordered as (r, g, h)
+        if meas_basis == "ground-rydberg":
+            to_bit = [1, 0, 0]  # 1 = |r>
+        elif meas_basis == "digital":
+            to_bit = [0, 0, 1]  # 1 = |h>
+        else:
+            raise RuntimeError(
+                f"Unknown measurement basis '{meas_basis}' "
+                "for a three-level system.'"
+            )
+        # Eg: 'digital' basis : |1> = index2, |0> = index0 or index1
+        # p_11010 = sum(probs[2, 2, 0:2, 2, 0:2])
+        # Each qutrit axis is collapsed to a bit, by summing the
+        # probabilities of the states measured as 0 and as 1
+        collapse = np.eye(2)[:, to_bit]
+        weights = probs.reshape(batch_shape + (3,) * size)
+        for axis in range(len(batch_shape), weights.ndim):
+            weights = np.moveaxis(
+                np.tensordot(collapse, weights, axes=(1, axis)), 0, axis
+            )
+        weights = weights.reshape(batch_shape + (2**size,))
+    else:
+        raise NotImplementedError(
+            "Cannot sample system with single-atom state vectors of "
+            "dimension > 3."
+        )
+    # Takes care of numerical artefacts in case sum(weights) != 1
+    return cast(np.ndarray, weights / np.sum(weights, axis=-1, keepdims=True))
+
+
 @dataclass
 class QutipResult(Result):
     """Represents the result of a run as a Qutip QObj.
@@ -36,12 +113,17 @@ class QutipResult(Result):
             or a density matrix.
         matching_meas_basis: Whether the measurement basis is the
             same as the state's basis.
+        subspace_indices: If the state is restricted to a subspace of the
+            full Hilbert space (e.g. to the states respecting the Rydberg
+            blockade), the sorted indices of the basis states spanning it,
+            in the full space.
     """
 
     atom_order: tuple[QubitId, ...]
     meas_basis: str
     state: qutip.Qobj
     matching_meas_basis: bool
+    subspace_indices: Optional[np.ndarray] = field(default=None, compare=False)
 
     @property
     def sampling_errors(self) -> dict[str, float]:
@@ -53,6 +135,9 @@ class QutipResult(Result):
 
     @property
     def _dim(self) -> int:
+        if self.subspace_indices is not None:
+            # Only the 'ground-rydberg' basis can be truncated
+            return 2
         full_state_size = np.prod(self.state.shape)
         if not self.state.isket:
             full_state_size = np.sqrt(full_state_size)
@@ -74,62 +159,48 @@ class QutipResult(Result):
             )
         return self.meas_basis
 
-    def _weights(self) -> np.ndarray:
-        n = self._size
+    def _state_probs(self) -> np.ndarray:
+        """The probability of each basis state of the state's space."""
         if not self.state.isket:
-            probs = np.abs(self.state.diag())
-        else:
-            probs = (np.abs(self.state.full()) ** 2).flatten()
-
-        if self._dim == 2:
-            if self.matching_meas_basis:
-                # State vector ordered with r first for 'ground_rydberg'
-                # e.g. n=2: [rr, rg, gr, gg] -> [11, 10, 01, 00]
-                # Invert the order ->  [00, 01, 10, 11] correspondence
-                # In the XY and digital bases, the order is canonical
-                weights = (
-                    probs[::-1]
-                    if self.meas_basis == "ground-rydberg"
-                    else probs
-                )
-            else:
-                # Only 000...000 is measured
-                weights = np.zeros(probs.size)
-                weights[0] = 1.0
-
-        elif self._dim == 3:
-            if self.meas_basis == "ground-rydberg":
-                one_state = 0  # 1 = |r>
-                ex_one = slice(1, 3)
-            elif self.meas_basis == "digital":
-                one_state = 2  # 1 = |h>
-                ex_one = slice(0, 2)
-            else:
-                raise RuntimeError(
-                    f"Unknown measurement basis '{self.meas_basis}' "
-                    "for a three-level system.'"
-                )
-            probs = probs.reshape([3] * n)
-            weights = np.zeros(2**n)
-            for dec_val in range(2**n):
-                ind: list[Union[int, slice]] = []
-                for v in np.binary_repr(dec_val, width=n):
-                    if v == "0":
-                        ind.append(ex_one)
-                    else:
-                        ind.append(one_state)
-                # Eg: 'digital' basis : |1> = index2, |0> = index0, 1 = 0:2
-                # p_11010 = sum(probs[2, 2, 0:2, 2, 0:2])
-                # We sum all probabilites that correspond to measuring
-                # 11010, namely hhghg, hhrhg, hhghr, hhrhr
-                weights[dec_val] = np.sum(probs[tuple(ind)])
-        else:
-            raise NotImplementedError(
-                "Cannot sample system with single-atom state vectors of "
-                "dimension > 3."
-            )
+            return cast(np.ndarray, np.abs(self.state.diag()))
+        return cast(np.ndarray, (np.abs(self.state.full()) ** 2).flatten())
+
+    def _nonzero_weights(self) -> tuple[np.ndarray, np.ndarray]:
+        """The non-zero weights, along with their bitstrings' integer values.
+
+        When the state is restricted to a subspace, the weights are taken
+        from the subspace only, without going through all the bitstrings.
+
+        Returns:
+            The integer values of the bitstrings, in increasing order, and
+            the weight of each of them.
+        """
+        if (
+            self.subspace_indices is None
+            or not self.matching_meas_basis
+            or self.meas_basis != "ground-rydberg"
+        ):
+            weights = self._weights()
+            inds = np.flatnonzero(weights)
+            return inds, weights[inds]
+        # The basis states are ordered with r first, so the bitstring of
+        # the full space index i is 2**size - 1 - i
+        probs = self._state_probs()[::-1]
+        inds = 2**self._size - 1 - self.subspace_indices[::-1]
+        nonzero = probs != 0
         # Takes care of numerical artefacts in case sum(weights) != 1
-        return cast(np.ndarray, weights / sum(weights))
+        return inds[nonzero], probs[nonzero] / np.sum(probs)
+
+    def _weights(self) -> np.ndarray:
+        probs = self._state_probs()
+        return _probs_to_weights(
+            probs,
+            self._size,
+            self._dim,
+            self.meas_basis,
+            self.matching_meas_basis,
+            self.subspace_indices,
+        )
 
     def get_state(
         self,
@@ -199,3 +270,215 @@ class QutipResult(Result):
                 )
             state = state.eliminate_states(ex_inds, normalize=normalize)
         return state.tidyup()
+
+
+@dataclass
+class _WeightsResult(Result):
+    """The result of a run, from the precomputed weights of its state.
+
+    Args:
+        atom_order: The order of the atoms in the bitstrings that
+            represent the measured states.
+        meas_basis: The measurement basis.
+        weights: The weight of each bitstring, indexed by its integer value.
+    """
+
+    weights: np.ndarray
+
+    @property
+    def sampling_errors(self) -> dict[str, float]:
+        """The sampling error associated to each bitstring's sampling rate.
+
+        Uses the standard error of the mean as a quantifier for sampling error.
+        """
+        return {bitstr: 0.0 for bitstr in self.sampling_dist}
+
+    def _weights(self) -> np.ndarray:
+        return self.weights
+
+
+class StackedQutipResults(typing.Sequence[QutipResult]):
+    """A sequence of QutipResults whose states are stacked in a single array.
+
+    The states are stored in one contiguous complex array, of shape (T, D)
+    for state vectors or (T, D, D) for density matrices, which can be a
+    ``numpy.memmap`` to keep it on disk. Each QutipResult is only built
+    when it is accessed, from its row of the array.
+
+    Args:
+        states: The array of stacked states, with one state per row.
+        dims: The QuTiP dimensions of the states.
+        atom_order: The order of the atoms in the bitstrings that
+            represent the measured states.
+        meas_basis: The measurement basis.
+        matching_meas_basis: Whether the measurement basis is the
+            same as the states' basis.
+        subspace_indices: If the states are restricted to a subspace of the
+            full Hilbert space, the sorted indices of the basis states
+            spanning it, in the full space.
+    """
+
+    # The maximum number of array elements processed at once
+    _CHUNK_SIZE = 2**22
+
+    def __init__(
+        self,
+        states: np.ndarray,
+        dims: list,
+        atom_order: tuple[QubitId, ...],
+        meas_basis: str,
+        matching_meas_basis: bool,
+        subspace_indices: Optional[np.ndarray] = None,
+    ):
+        """Initializes the stacked results."""
+        if states.ndim not in (2, 3) or (
+            states.ndim == 3 and states.shape[1] != states.shape[2]
+        ):
+            raise ValueError(
+                "`states` must be of shape (T, D) or (T, D, D), not "
+                f"{states.shape}."
+            )
+        self.states = states
+        self.dims = dims
+        self.atom_order = atom_order
+        self.meas_basis = meas_basis
+        self.matching_meas_basis = matching_meas_basis
+        self.subspace_indices = subspace_indices
+
+    @property
+    def is_ket(self) -> bool:
+        """Whether the states are state vectors."""
+        return self.states.ndim == 2
+
+    def _make_result(self, t_index: int) -> QutipResult:
+        data = self.states[t_index]
+        return QutipResult(
+            self.atom_order,
+            self.meas_basis,
+            qutip.Qobj(
+                data.reshape(-1, 1) if self.is_ket else data, dims=self.dims
+            ),
+            self.matching_meas_basis,
+            self.subspace_indices,
+        )
+
+    @overload
+    def __getitem__(self, key: int) -> QutipResult:
+        pass
+
+    @overload
+    def __getitem__(self, key: slice) -> tuple[QutipResult, ...]:
+        pass
+
+    def __getitem__(
+        self, key: int | slice
+    ) -> QutipResult | tuple[QutipResult, ...]:
+        if isinstance(key, slice):
+            return tuple(self._make_result(i) for i in range(len(self))[key])
+        return self._make_result(range(len(self))[key])
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    @property
+    def _dim(self) -> int:
+        if self.subspace_indices is not None:
+            # Only the 'ground-rydberg' basis can be truncated
+            return 2
+        return cast(
+            int,
+            np.rint(self.states.shape[1] ** (1 / len(self.atom_order))).astype(
+                int
+            ),
+        )
+
+    def _chunks(self) -> typing.Iterator[tuple[slice, np.ndarray]]:
+        """Goes through the states by chunks, in case they don't fit in memory.
+
+        Yields:
+            The slice of the times of each chunk, along with its states.
+        """
+        step = max(1, self._CHUNK_SIZE // max(1, self.states[0].size))
+        for start in range(0, len(self), step):
+            times = slice(start, start + step)
+            yield times, np.asarray(self.states[times])
+
+    def _state_probs(self, states: np.ndarray) -> np.ndarray:
+        """The probability of each basis state in each of the given states."""
+        if self.is_ket:
+            return cast(np.ndarray, np.abs(states) ** 2)
+        return cast(np.ndarray, np.abs(np.diagonal(states, axis1=1, axis2=2)))
+
+    def weights(self, t_index: Optional[int] = None) -> np.ndarray:
+        """Computes the weights of the bitstrings, without building Qobjs.
+
+        Args:
+            t_index: The index of the state whose weights are computed. If
+                None, those of every state are computed.
+
+        Returns:
+            The weight of each bitstring (indexed by its integer value), as
+            an array of shape (2**size,) for a single state or
+            (len(self), 2**size) otherwise.
+        """
+
+        def to_weights(states: np.ndarray) -> np.ndarray:
+            return _probs_to_weights(
+                self._state_probs(states),
+                len(self.atom_order),
+                self._dim,
+                self.meas_basis,
+                self.matching_meas_basis,
+                self.subspace_indices,
+            )
+
+        if t_index is not None:
+            index = range(len(self))[t_index]
+            return cast(
+                np.ndarray, to_weights(self.states[index : index + 1])[0]
+            )
+        weights = np.empty((len(self), 2 ** len(self.atom_order)))
+        for times, chunk in self._chunks():
+            weights[times] = to_weights(chunk)
+        return weights
+
+    def weights_result(self, t_index: int) -> Result:
+        """Gets the result of a state, without building its Qobj.
+
+        The result is only meant for sampling, as it doesn't hold the state.
+
+        Args:
+            t_index: The index of the state.
+
+        Returns:
+            A result with the same weights as the QutipResult of the state.
+        """
+        return _WeightsResult(
+            self.atom_order, self.meas_basis, self.weights(t_index)
+        )
+
+    def expect(self, op: qutip.Qobj) -> np.ndarray:
+        """Computes the expectation value of an operator in every state.
+
+        Args:
+            op: The operator, with the same dimensions as the states.
+
+        Returns:
+            The expectation value in each state, as an array of real values
+            if the operator is Hermitian.
+        """
+        # The operator is kept sparse, so that it is never bigger than the
+        # states it is applied to
+        mat = op.data.tocsr()
+        if not self.is_ket:
+            coo = mat.tocoo()
+        values = np.empty(len(self), dtype=complex)
+        for times, chunk in self._chunks():
+            if self.is_ket:
+                values[times] = np.sum(
+                    chunk.conj() * (mat @ chunk.T).T, axis=1
+                )
+            else:
+                # Tr(rho @ op) is the sum of rho[i, j] * op[j, i]
+                values[times] = chunk[:, coo.col, coo.row] @ coo.data
+        return values.real if op.isherm else values
@@ -21,7 +21,7 @@ from typing import Any, Literal, Optional, Tuple, Type, TypeVar, Union, cast
 
 import qutip
 
-from pulser.backend.noise_model import NoiseModel
+from pulser.backend.noise_model import NOISE_SAMPLERS, NoiseModel
 
 NOISE_TYPES = Literal[
     "doppler", "amplitude", "SPAM", "dephasing", "depolarizing", "eff_noise"
@@ -98,6 +98,9 @@ class SimConfig:
         amp_sigma: Dictates the fluctuations in amplitude as a standard
             deviation of a normal distribution centered in 1.
         solver_options: Options for the qutip solver.
+        noise_sampler: How the random noise parameters of the runs are
+            drawn: "random", "stratified", "sobol", "halton" or
+            "antithetic" (see `NoiseModel` for details).
     """
 
     noise: Union[NOISE_TYPES, tuple[NOISE_TYPES, ...]] = ()
@@ -117,6 +120,7 @@ class SimConfig:
     dephasing_prob: float | None = None
     depolarizing_prob: float | None = None
     eff_noise_probs: list[float] = field(default_factory=list, repr=False)
+    noise_sampler: NOISE_SAMPLERS = "random"
 
     @classmethod
     def from_noise_model(cls: Type[T], noise_model: NoiseModel) -> T:
@@ -138,6 +142,7 @@ class SimConfig:
             dephasing_prob=noise_model.dephasing_prob,
             depolarizing_prob=noise_model.depolarizing_prob,
             eff_noise_probs=noise_model.eff_noise_probs,
+            noise_sampler=noise_model.noise_sampler,
         )
 
     def to_noise_model(self) -> NoiseModel:
@@ -159,6 +164,7 @@ class SimConfig:
             dephasing_prob=self.dephasing_prob,
             depolarizing_prob=self.depolarizing_prob,
             eff_noise_probs=self.eff_noise_probs,
+            noise_sampler=self.noise_sampler,
         )
 
     def __post_init__(self) -> None:
@@ -209,6 +215,8 @@ class SimConfig:
         ]
         if self.noise:
             lines.append("Noise types:           " + ", ".join(self.noise))
+        if self.noise_sampler != "random":
+            lines.append(f"Noise sampler:         {self.noise_sampler}")
         if "SPAM" in self.noise:
             lines.append(f"SPAM dictionary:       {self.spam_dict}")
         if "eff_noise" in self.noise:
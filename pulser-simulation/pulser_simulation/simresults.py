@@ -19,17 +19,24 @@ import collections.abc
 import typing
 from abc import ABC, abstractmethod
 from collections import Counter
-from functools import lru_cache
+from dataclasses import dataclass
 from typing import Mapping, Optional, Tuple, Union, cast
 
 import matplotlib.pyplot as plt
 import numpy as np
 import qutip
+import scipy.sparse as sp
 from numpy.typing import ArrayLike
 from qutip.piqs import isdiagonal
 
-from pulser.result import Results, ResultType, SampledResult
-from pulser_simulation.qutip_result import QutipResult
+from pulser.result import (
+    BitstringCounts,
+    Result,
+    Results,
+    ResultType,
+    SampledResult,
+)
+from pulser_simulation.qutip_result import QutipResult, StackedQutipResults
 
 
 class SimulationResults(ABC, Results[ResultType]):
@@ -64,6 +71,8 @@ class SimulationResults(ABC, Results[ResultType]):
             )
         self._basis_name = basis_name
         self._sim_times = sim_times
+        # Calculated on the first use, see _calc_pseudo_density_diags()
+        self._pseudo_dens_diags: Optional[np.ndarray] = None
 
     @property
     @abstractmethod
@@ -93,13 +102,36 @@ class SimulationResults(ABC, Results[ResultType]):
         Returns:
             Expectation values of obs_list.
         """
+        qobj_list = self._get_observables(obs_list)
+        if not self._use_pseudo_dens:
+            return cast(list, qutip.expect(qobj_list, self.states))
+        if not qobj_list:
+            return []
+        # Both the pseudo-density matrices and the observables are diagonal,
+        # so all the expectation values are obtained in a single product
+        values = (
+            self._calc_pseudo_density_diags()
+            @ np.array([obs.diag() for obs in qobj_list], dtype=complex).T
+        )
+        return [
+            vals.real if obs.isherm else vals
+            for obs, vals in zip(qobj_list, values.T)
+        ]
+
+    def _get_observables(
+        self, obs_list: collections.abc.Sequence[Union[qutip.Qobj, ArrayLike]]
+    ) -> list[qutip.Qobj]:
+        """Checks the observables and converts them to qutip.Qobj."""
         if not isinstance(obs_list, (list, np.ndarray)):
             raise TypeError("`obs_list` must be a list of operators.")
 
         qobj_list = []
-        dim = self._dim if not self._use_pseudo_dens else 2
-        legal_dims = [[dim] * self._size] * 2
-        legal_shape = (dim**self._size, dim**self._size)
+        if self._use_pseudo_dens:
+            legal_dims = [[2] * self._size] * 2
+        else:
+            # The states may be restricted to a subspace
+            legal_dims = [cast(QutipResult, self[0]).state.dims[0]] * 2
+        legal_shape = (int(np.prod(legal_dims[0])),) * 2
         for obs in obs_list:
             if not (
                 isinstance(obs, np.ndarray) or isinstance(obs, qutip.Qobj)
@@ -115,16 +147,9 @@ class SimulationResults(ABC, Results[ResultType]):
                     + f"Expected {legal_shape}, got {obs.shape}."
                 )
             qobj_list.append(qutip.Qobj(obs, dims=legal_dims))
-            if self._use_pseudo_dens:
-                if not isdiagonal(obs):
-                    raise ValueError(f"Observable {obs!r} is non-diagonal.")
-                states = [
-                    self._calc_pseudo_density(ind) for ind in range(len(self))
-                ]
-            else:
-                states = self.states
-
-        return cast(list, qutip.expect(qobj_list, states))
+            if self._use_pseudo_dens and not isdiagonal(obs):
+                raise ValueError(f"Observable {obs!r} is non-diagonal.")
+        return qobj_list
 
     def sample_state(
         self, t: float, n_samples: int = 1000, t_tol: float = 1.0e-3
@@ -141,8 +166,28 @@ class SimulationResults(ABC, Results[ResultType]):
             Sample distribution of bitstrings corresponding to
             measured quantum states at time t.
         """
+        return self.sample_packed_state(t, n_samples, t_tol).to_counter()
+
+    def sample_packed_state(
+        self, t: float, n_samples: int = 1000, t_tol: float = 1.0e-3
+    ) -> BitstringCounts:
+        """Returns the result of multiple measurements at time t, packed.
+
+        Unlike `sample_state()`, the bitstrings are never converted to
+        strings.
+
+        Args:
+            t: Time at which the state is sampled.
+            n_samples: Number of samples to return.
+            t_tol: Tolerance for the difference between t and
+                closest time.
+
+        Returns:
+            The counts of the bitstrings corresponding to measured quantum
+            states at time t.
+        """
         t_index = self._get_index_from_time(t, t_tol)
-        return self[t_index].get_samples(n_samples)
+        return self._get_sampled_result(t_index).get_packed_samples(n_samples)
 
     def sample_final_state(self, N_samples: int = 1000) -> Counter:
         """Returns the result of multiple measurements of the final state.
@@ -184,7 +229,6 @@ class SimulationResults(ABC, Results[ResultType]):
                 + f" tolerance {tol}."
             )
 
-    @lru_cache(maxsize=None)
     def _calc_pseudo_density(self, t_index: int) -> qutip.Qobj:
         """Calculates the pseudo-density matrix at a given time.
 
@@ -198,18 +242,63 @@ class SimulationResults(ABC, Results[ResultType]):
         Returns:
             The pseudo-density matrix as a Qobj.
         """
+        return qutip.Qobj(
+            sp.diags(self._calc_pseudo_density_diags()[t_index], format="csr"),
+            dims=[[2] * self._size] * 2,
+        )
 
-        def _proj_from_bitstring(bitstring: str) -> qutip.Qobj:
-            proj = qutip.tensor(
-                [self._meas_projector(int(i)) for i in bitstring]
+    def _calc_pseudo_density_diags(self) -> np.ndarray:
+        """Calculates the diagonals of the pseudo-density matrices.
+
+        The pseudo-density matrix of each bitstring is the tensor product of
+        the single-atom measurement projectors, so the diagonal of the
+        pseudo-density matrix is obtained by applying the matrix of the
+        projectors' diagonals to each axis of the bitstrings' weights.
+
+        Returns:
+            An array with the diagonal of the pseudo-density matrix at each
+            time, of shape (len(self), 2**size).
+        """
+        if self._pseudo_dens_diags is None:
+            self._pseudo_dens_diags = self._apply_meas_projectors(
+                self._get_weights()
             )
-            return proj
+        return self._pseudo_dens_diags
+
+    def _apply_meas_projectors(self, values: np.ndarray) -> np.ndarray:
+        """Maps values of the bitstrings to the diagonals of their projectors.
 
-        w = self[t_index]._weights()
-        return sum(
-            w[i] * _proj_from_bitstring(np.binary_repr(i, width=self._size))
-            for i in np.nonzero(w)[0]
+        Args:
+            values: The values of the bitstrings at each time, of shape
+                (len(self), 2**size), indexed by their integer values.
+
+        Returns:
+            The sum of the diagonals of the bitstrings' measurement
+            projectors, weighted by their values, at each time.
+        """
+        # proj_diags[j, b] is the j-th diagonal term of the projector of b
+        proj_diags = np.stack(
+            [self._meas_projector(b).diag() for b in (0, 1)], axis=1
         )
+        diags = values.reshape((len(self),) + (2,) * self._size)
+        for axis in range(1, self._size + 1):
+            diags = np.moveaxis(
+                np.tensordot(proj_diags, diags, axes=(1, axis)), 0, axis
+            )
+        return diags.reshape(len(self), -1)
+
+    def _get_sampled_result(self, t_index: int) -> Result:
+        """Gets the result to sample from at a given time index."""
+        return self[t_index]
+
+    def _get_weights(self) -> np.ndarray:
+        """Gets the weights of the bitstrings at each time.
+
+        Returns:
+            An array of shape (len(self), 2**size), indexed by the
+            bitstrings' integer values.
+        """
+        return np.array([res._weights() for res in self])
 
     def _meas_projector(self, state_n: int) -> qutip.Qobj:
         """Gets the post measurement projector.
@@ -224,12 +313,79 @@ class SimulationResults(ABC, Results[ResultType]):
         return qutip.basis(2, state_n).proj()
 
 
+@dataclass(eq=False)
+class NoiseAveragedResult(Result):
+    """The exact probabilities of the bitstrings, averaged over noise.
+
+    Args:
+        atom_order: The order of the atoms in the bitstrings that
+            represent the measured states.
+        meas_basis: The measurement basis.
+        probabilities: The probability of measuring each bitstring,
+            averaged over the realisations of the noise, in an array
+            indexed by the bitstrings' integer values (or following
+            `indices`, if given).
+        errors: The standard error of the mean of each probability over
+            the realisations of the noise, indexed like `probabilities`.
+        indices: If given, the integer values of the bitstrings whose
+            probabilities are stored, in increasing order. The other
+            bitstrings have a probability of zero.
+    """
+
+    probabilities: np.ndarray
+    errors: np.ndarray
+    indices: Optional[np.ndarray] = None
+
+    @property
+    def sampling_errors(self) -> dict[str, float]:
+        """The standard error of each bitstring's sampling rate.
+
+        It is the standard error of the mean of the exact probabilities
+        over the realisations of the noise.
+        """
+        inds = [int(bitstr, base=2) for bitstr in self.sampling_dist]
+        if self.indices is not None:
+            inds = list(np.searchsorted(self.indices, inds))
+        return dict(zip(self.sampling_dist, self.errors[inds]))
+
+    def _to_dense(self, values: np.ndarray) -> np.ndarray:
+        """Gets the values of all the bitstrings, from the stored ones.
+
+        Args:
+            values: The values of the stored bitstrings, indexed like
+                `probabilities`.
+
+        Returns:
+            The values indexed by the integer values of all the bitstrings.
+        """
+        if self.indices is None:
+            return values
+        dense = np.zeros(2**self._size, dtype=values.dtype)
+        dense[self.indices] = values
+        return dense
+
+    def _weights(self) -> np.ndarray:
+        return self._to_dense(self.probabilities / np.sum(self.probabilities))
+
+    def _sparse_weights(self) -> tuple[np.ndarray, np.ndarray]:
+        if self.indices is None:
+            return super()._sparse_weights()
+        # Only goes through the stored bitstrings
+        nonzero = self.probabilities != 0
+        inds = self.indices[nonzero]
+        bits = (inds[:, np.newaxis] >> np.arange(self._size)[::-1]) & 1
+        return bits.astype(np.uint8), self.probabilities[nonzero] / np.sum(
+            self.probabilities
+        )
+
+
 class NoisyResults(SimulationResults):
     """Results of a noisy simulation run of a pulse sequence.
 
     Contrary to a CoherentResults object, this object contains a list of
     Counters describing the state distribution at the time it was created by
-    using Simulation.run() with a noisy simulation.
+    using Simulation.run() with a noisy simulation (or, if requested, the
+    exact probabilities averaged over the noise, as NoiseAveragedResults).
     Contains methods for studying the populations and extracting useful
     information from them.
     """
@@ -238,11 +394,13 @@ class NoisyResults(SimulationResults):
 
     def __init__(
         self,
-        run_output: typing.Sequence[SampledResult],
+        run_output: typing.Sequence[Union[SampledResult, NoiseAveragedResult]],
         size: int,
         basis_name: str,
         sim_times: np.ndarray,
         n_measures: int,
+        n_runs: Optional[int] = None,
+        standard_error: Optional[float] = None,
     ) -> None:
         """Initializes a new NoisyResults instance.
 
@@ -254,9 +412,9 @@ class NoisyResults(SimulationResults):
             distribution of bitstrings, not atomic states
 
         Args:
-            run_output: Each Counter contains the
+            run_output: Each result contains the
                 probability distribution of a multi-qubits state,
-                represented as a bitstring. There is one Counter for each time
+                represented as a bitstring. There is one result for each time
                 the simulation was asked to return a result.
             size: The number of atoms in the register.
             basis_name: Basis indicating the addressed atoms after
@@ -267,10 +425,17 @@ class NoisyResults(SimulationResults):
                 the results.
             n_measures: Number of measurements needed to compute this
                 result when doing the simulation.
+            n_runs: Number of realisations of the noise averaged in this
+                result, if known.
+            standard_error: The standard error (over the runs) reached at
+                the final time, when the number of runs was adapted to a
+                target error (see `QutipEmulator.run()`).
         """
         basis_name_ = "digital" if basis_name == "all" else basis_name
         super().__init__(size, basis_name_, sim_times)
         self.n_measures = n_measures
+        self.n_runs = n_runs
+        self.standard_error = standard_error
         self._results = tuple(run_output)
 
     @property
@@ -329,11 +494,26 @@ class NoisyResults(SimulationResults):
             op: Operator whose expectation value is wanted.
             fmt: Curve plot format.
             label: y-Axis label.
-            error_bars: Choose to display error bars.
+            error_bars: Choose to display error bars. For results holding
+                the probabilities averaged over the noise (as
+                NoiseAveragedResults), they are obtained from the standard
+                errors of the probabilities, taken as independent.
+                Otherwise, they are the sampling errors of the
+                `n_measures` measurements.
         """
 
         def get_error_bars() -> Tuple[ArrayLike, ArrayLike]:
             moy = self.expect([op])[0]
+            averaged = [
+                res for res in self if isinstance(res, NoiseAveragedResult)
+            ]
+            if len(averaged) == len(self):
+                errors = self._apply_meas_projectors(
+                    np.array([res._to_dense(res.errors) for res in averaged])
+                )
+                return moy, np.sqrt(
+                    np.sum(np.abs(errors * op.diag()) ** 2, axis=1)
+                )
             standard_dev = cast(
                 np.ndarray,
                 np.sqrt(qutip.variance(op, self.states) / self.n_measures),
@@ -355,7 +535,9 @@ class CoherentResults(SimulationResults):
     """Results of a coherent simulation run of a pulse sequence.
 
     Contains methods for studying the states and extracting useful information
-    from them.
+    from them. The states can be stored as separate QutipResults or stacked
+    in a single array (see `StackedQutipResults`), in which case the
+    expectation values are computed for all of them at once.
     """
 
     def __init__(
@@ -370,9 +552,9 @@ class CoherentResults(SimulationResults):
         """Initializes a new CoherentResults instance.
 
         Args:
-            run_output: List of `qutip.Qobj` corresponding
-                to the states at each time step after the evolution has been
-                simulated.
+            run_output: The QutipResults holding the states at each time
+                step after the evolution has been simulated, either as a
+                list or as StackedQutipResults.
             size: The number of atoms in the register.
             basis_name: The basis indicating the addressed atoms after
                 the pulse sequence ('ground-rydberg', 'digital' or 'all').
@@ -396,7 +578,11 @@ class CoherentResults(SimulationResults):
                     "`meas_basis` and `basis_name` must have the same value."
                 )
         self._meas_basis = meas_basis
-        self._results = tuple(run_output)
+        self._results = (
+            run_output
+            if isinstance(run_output, StackedQutipResults)
+            else tuple(run_output)
+        )
         if meas_errors is not None:
             if set(meas_errors) != {"epsilon", "epsilon_prime"}:
                 raise ValueError(
@@ -411,6 +597,27 @@ class CoherentResults(SimulationResults):
         """List of ``qutip.Qobj`` for each state in the simulation."""
         return [res.state for res in self]
 
+    def expect(
+        self, obs_list: collections.abc.Sequence[Union[qutip.Qobj, ArrayLike]]
+    ) -> list[Union[float, complex, ArrayLike]]:
+        """Returns the expectation values of operators in obs_list.
+
+        Args:
+            obs_list: Input observable list. ArrayLike objects will
+                be converted to qutip.Qobj.
+
+        Returns:
+            Expectation values of obs_list.
+        """
+        if self._use_pseudo_dens or not isinstance(
+            self._results, StackedQutipResults
+        ):
+            return super().expect(obs_list)
+        return [
+            self._results.expect(obs)
+            for obs in self._get_observables(obs_list)
+        ]
+
     def get_state(
         self,
         t: float,
@@ -487,6 +694,71 @@ class CoherentResults(SimulationResults):
             normalize,
         )
 
+    def _get_sampled_result(self, t_index: int) -> Result:
+        if isinstance(self._results, StackedQutipResults):
+            # Samples from the weights, without building the state's Qobj
+            return self._results.weights_result(t_index)
+        return super()._get_sampled_result(t_index)
+
+    def _get_weights(self) -> np.ndarray:
+        if isinstance(self._results, StackedQutipResults):
+            # Computed from the stacked states, without building any Qobj
+            return self._results.weights()
+        return super()._get_weights()
+
+    def _get_meas_probabilities(self) -> np.ndarray:
+        """Calculates the probability of measuring each bitstring.
+
+        Unlike the weights of each QutipResult, these probabilities include
+        the measurement errors.
+
+        Returns:
+            An array with the probabilities at each time, of shape
+            (len(self), 2**size), indexed by the bitstrings' integer values.
+        """
+        probs = self._get_weights()
+        if not self._meas_errors:
+            return probs
+        eps = self._meas_errors["epsilon"]
+        eps_p = self._meas_errors["epsilon_prime"]
+        # flips[i, j] is the probability of measuring i when the bit is j
+        flips = np.array([[1 - eps, eps_p], [eps, 1 - eps_p]])
+        probs = probs.reshape((len(self),) + (2,) * self._size)
+        for axis in range(1, self._size + 1):
+            probs = np.moveaxis(
+                np.tensordot(flips, probs, axes=(1, axis)), 0, axis
+            )
+        return probs.reshape(len(self), -1)
+
+    def _get_sparse_meas_probabilities(self) -> sp.csr_matrix:
+        """Calculates the non-zero probabilities of measuring each bitstring.
+
+        Unlike `_get_meas_probabilities()`, no dense array over all the
+        bitstrings is built when the states are restricted to a subspace,
+        unless the measurement errors spread the probabilities over all of
+        them.
+
+        Returns:
+            A sparse matrix with the probabilities at each time, of shape
+            (len(self), 2**size), indexed by the bitstrings' integer values.
+        """
+        shape = (len(self), 2**self._size)
+        if self._meas_errors:
+            return sp.csr_matrix(self._get_meas_probabilities())
+        rows, cols, probs = [], [], []
+        for t_index, res in enumerate(self):
+            inds, weights = res._nonzero_weights()
+            rows.append(np.full(len(inds), t_index))
+            cols.append(inds)
+            probs.append(weights)
+        return sp.csr_matrix(
+            (
+                np.concatenate(probs),
+                (np.concatenate(rows), np.concatenate(cols).astype(np.int64)),
+            ),
+            shape=shape,
+        )
+
     def _meas_projector(self, state_n: int) -> qutip.Qobj:
         if self._meas_errors:
             err_param = (
@@ -509,10 +781,13 @@ class CoherentResults(SimulationResults):
         # Returns normal projectors in the absence of measurement errors
         return super()._meas_projector(state_n)
 
-    def sample_state(
+    def sample_packed_state(
         self, t: float, n_samples: int = 1000, t_tol: float = 1.0e-3
-    ) -> Counter:
-        """Returns the result of multiple measurements at time t.
+    ) -> BitstringCounts:
+        """Returns the result of multiple measurements at time t, packed.
+
+        Unlike `sample_state()`, the bitstrings are never converted to
+        strings.
 
         Args:
             t: Time at which the state is sampled.
@@ -521,38 +796,31 @@ class CoherentResults(SimulationResults):
                 closest time.
 
         Returns:
-            Sample distribution of bitstrings corresponding to measured
-            quantum states at time t.
+            The counts of the bitstrings corresponding to measured quantum
+            states at time t.
         """
-        sampled_state = super().sample_state(t, n_samples, t_tol)
+        samples = super().sample_packed_state(t, n_samples, t_tol)
         if self._meas_errors is None or (
             self._meas_errors["epsilon"] == 0.0
             and self._meas_errors["epsilon_prime"] == 0
         ):
-            return sampled_state
+            return samples
 
         eps = self._meas_errors["epsilon"]
         eps_p = self._meas_errors["epsilon_prime"]
-        shots = list(sampled_state.keys())
-        n_detects_list = list(sampled_state.values())
-
-        # Convert shots to a 2D array
-        shot_arr = np.array([list(shot) for shot in shots], dtype=int)
+        bits = samples.bits
         # Compute flip probabilities
-        flip_probs = np.where(shot_arr == 1, eps_p, eps)
-        # Repeat flip_probs based on n_detects_list
-        flip_probs_repeated = np.repeat(flip_probs, n_detects_list, axis=0)
-        # Generate random matrix of shape (sum(n_detects_list), len(shot))
+        flip_probs = np.where(bits == 1, eps_p, eps)
+        # Repeat flip_probs based on the counts of each bitstring
+        flip_probs_repeated = np.repeat(flip_probs, samples.counts, axis=0)
+        # Generate random matrix of shape (n_samples, size)
         random_matrix = np.random.uniform(
-            size=(np.sum(n_detects_list), len(shot_arr[0]))
+            size=(samples.n_samples, samples.size)
         )
         # Compare random matrix with flip probabilities
         flips = random_matrix < flip_probs_repeated
-        # Perform XOR between original array and flips
-        new_shots = shot_arr.repeat(n_detects_list, axis=0) ^ flips
-        # Count all the new_shots
-        # We are not converting to str before because tuple indexing is faster
-        detected_sample_dict: Counter = Counter(map(tuple, new_shots))
-        return Counter(
-            {"".join(map(str, k)): v for k, v in detected_sample_dict.items()}
+        # Perform XOR between the measured bitstrings and the flips
+        return BitstringCounts(
+            np.repeat(bits, samples.counts, axis=0) ^ flips,
+            size=samples.size,
         )
@@ -15,30 +15,42 @@
 
 from __future__ import annotations
 
+import os
+import typing
 import warnings
 from collections import Counter
-from collections.abc import Mapping
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from copy import copy
 from dataclasses import asdict, replace
 from typing import Any, Optional, Union, cast
 
 import matplotlib.pyplot as plt
 import numpy as np
 import qutip
+import scipy.sparse as sp
 from numpy.typing import ArrayLike
+from qutip.cy.spconvert import dense1D_to_fastcsr_ket
+from qutip.parallel import parallel_map, serial_map
+from scipy.sparse.linalg import expm_multiply
 
 import pulser.sampler as sampler
 from pulser import Sequence
+from pulser._hashing import static_hash
 from pulser.backend.noise_model import NoiseModel
 from pulser.devices._device_datacls import BaseDevice
 from pulser.register.base_register import BaseRegister
-from pulser.result import SampledResult
+from pulser.result import BitstringCounts, SampledResult
 from pulser.sampler.samples import SequenceSamples
 from pulser.sequence._seq_drawer import draw_samples, draw_sequence
+from pulser_simulation.cache import ResultsCache
 from pulser_simulation.hamiltonian import Hamiltonian
-from pulser_simulation.qutip_result import QutipResult
+from pulser_simulation.qutip_result import QutipResult, StackedQutipResults
 from pulser_simulation.simconfig import SimConfig
 from pulser_simulation.simresults import (
     CoherentResults,
+    NoiseAveragedResult,
     NoisyResults,
     SimulationResults,
 )
@@ -68,6 +80,15 @@ class QutipEmulator:
               those specific times.
 
             - A float to act as a sampling rate for the resulting state.
+        blockade_radius: If defined, the emulation is restricted to the
+            states where no two atoms closer than this radius (in µm) are
+            both in the Rydberg state, which can be much fewer than the
+            states of the full Hilbert space. If "auto", the radius is given
+            by ``device.rydberg_blockade_radius()`` for the highest
+            amplitude of the samples. Only possible in the 'ground-rydberg'
+            basis. The states and operators are then expressed in this
+            subspace, while the sampled bitstrings are still defined for
+            the full register.
     """
 
     def __init__(
@@ -78,6 +99,7 @@ class QutipEmulator:
         sampling_rate: float = 1.0,
         config: Optional[SimConfig] = None,
         evaluation_times: Union[float, str, ArrayLike] = "Full",
+        blockade_radius: Union[float, str, None] = None,
     ) -> None:
         """Instantiates a QutipEmulator object."""
         # Initializing the samples obj
@@ -145,6 +167,26 @@ class QutipEmulator:
             raise ValueError(
                 "`sampling_rate` is too small, less than 4 data points."
             )
+        if blockade_radius == "auto":
+            max_amp = max(
+                (
+                    np.max(ch_samples.amp, initial=0.0)
+                    for ch, ch_samples in sampled_seq.channel_samples.items()
+                    if sampled_seq._ch_objs[ch].basis == "ground-rydberg"
+                ),
+                default=0.0,
+            )
+            if max_amp == 0:
+                raise ValueError(
+                    "The blockade radius can't be determined from samples "
+                    "without amplitude in the 'ground-rydberg' basis."
+                )
+            blockade_radius = device.rydberg_blockade_radius(max_amp)
+        elif isinstance(blockade_radius, str):
+            raise ValueError(
+                "`blockade_radius` must be a float, 'auto' or None, not "
+                f"{blockade_radius!r}."
+            )
         # Sets the config as well as builds the hamiltonian
         with warnings.catch_warnings():
             warnings.simplefilter("ignore", category=DeprecationWarning)
@@ -159,6 +201,7 @@ class QutipEmulator:
             device,
             sampling_rate,
             noise_model,
+            blockade_radius,
         )
         # Initializing evaluation times
         self._eval_times_array: np.ndarray
@@ -283,6 +326,7 @@ class QutipEmulator:
         # update runs:
         param_dict["runs"] = noise_model.runs
         param_dict["samples_per_run"] = noise_model.samples_per_run
+        param_dict["noise_sampler"] = noise_model.noise_sampler
         # set config with the new parameters:
         with warnings.catch_warnings():
             warnings.simplefilter("ignore", category=DeprecationWarning)
@@ -318,22 +362,20 @@ class QutipEmulator:
         """
         self._initial_state: qutip.Qobj
         if isinstance(state, str) and state == "all-ground":
-            self._initial_state = qutip.tensor(
-                [
-                    self._hamiltonian.basis[
-                        "u" if self._hamiltonian._interaction == "XY" else "g"
-                    ]
-                    for _ in range(self._hamiltonian._size)
-                ]
-            )
+            self._initial_state = self._all_ground_state()
         else:
             state = cast(Union[np.ndarray, qutip.Qobj], state)
             shape = state.shape[0]
-            legal_shape = self._hamiltonian.dim**self._hamiltonian._size
-            legal_dims = [
-                [self._hamiltonian.dim] * self._hamiltonian._size,
-                [1] * self._hamiltonian._size,
-            ]
+            subspace = self._hamiltonian._subspace
+            if subspace is not None:
+                legal_shape = subspace.size
+                legal_dims = [[legal_shape], [1]]
+            else:
+                legal_shape = self._hamiltonian.dim**self._hamiltonian._size
+                legal_dims = [
+                    [self._hamiltonian.dim] * self._hamiltonian._size,
+                    [1] * self._hamiltonian._size,
+                ]
             if shape != legal_shape:
                 raise ValueError(
                     "Incompatible shape of initial state."
@@ -341,6 +383,24 @@ class QutipEmulator:
                 )
             self._initial_state = qutip.Qobj(state, dims=legal_dims)
 
+    def _all_ground_state(self) -> qutip.Qobj:
+        """The state with all atoms in the ground state."""
+        ground = qutip.tensor(
+            [
+                self._hamiltonian.basis[
+                    "u" if self._hamiltonian._interaction == "XY" else "g"
+                ]
+                for _ in range(self._hamiltonian._size)
+            ]
+        )
+        subspace = self._hamiltonian._subspace
+        if subspace is None:
+            return ground
+        return qutip.basis(
+            subspace.size,
+            int(np.searchsorted(subspace, np.argmax(np.abs(ground.full())))),
+        )
+
     @property
     def evaluation_times(self) -> np.ndarray:
         """The times at which the results of this simulation are returned."""
@@ -468,10 +528,334 @@ class QutipEmulator:
             time / 1000
         )  # Creates new Qutip.Qobj
 
+    def _run_solver(
+        self,
+        solv_ops: qutip.Options,
+        progress_bar: Optional[bool] = None,
+        meas_errors: Optional[Mapping[str, float]] = None,
+        state_callback: Optional[Callable[[float, QutipResult], Any]] = None,
+    ) -> CoherentResults:
+        """Returns CoherentResults: Object containing evolution results."""
+        e_ops: Optional[Callable[[float, qutip.Qobj], None]] = None
+        if state_callback is not None:
+            # The solver hands each state to the callback instead of
+            # storing it, keeping only the final one
+            callback = state_callback
+            solv_ops = copy(solv_ops)
+            solv_ops.store_states = False
+            solv_ops.store_final_state = True
+
+            def stream_state(t: float, state: qutip.Qobj) -> None:
+                callback(t, self._make_qutip_result(state))
+
+            e_ops = stream_state
+
+        if (
+            "dephasing" in self.config.noise
+            or "depolarizing" in self.config.noise
+            or "eff_noise" in self.config.noise
+        ):
+            result = qutip.mesolve(
+                self._hamiltonian._hamiltonian,
+                self.initial_state,
+                self._eval_times_array,
+                self._hamiltonian._collapse_ops,
+                e_ops=e_ops,
+                progress_bar=progress_bar,
+                options=solv_ops,
+            )
+        else:
+            result = qutip.sesolve(
+                self._hamiltonian._hamiltonian,
+                self.initial_state,
+                self._eval_times_array,
+                e_ops=e_ops,
+                progress_bar=progress_bar,
+                options=solv_ops,
+            )
+        if state_callback is not None:
+            return self._make_coherent_results(
+                [result.final_state], meas_errors, final_only=True
+            )
+        return self._make_coherent_results(result.states, meas_errors)
+
+    def _run_trajectories(
+        self,
+        solv_ops: qutip.Options,
+        progress_bar: Optional[bool] = None,
+        meas_errors: Optional[Mapping[str, float]] = None,
+        n_workers: Optional[int] = None,
+    ) -> list[CoherentResults]:
+        """Unravels the noise channels into quantum trajectories.
+
+        Uses QuTiP's Monte Carlo solver, which only evolves state vectors,
+        with the number of trajectories given by ``solv_ops.ntraj``.
+
+        Returns:
+            The CoherentResults of each trajectory.
+        """
+        result = qutip.mcsolve(
+            self._hamiltonian._hamiltonian,
+            self.initial_state,
+            self._eval_times_array,
+            # The collapse operators must share the Hamiltonian's time list
+            [
+                qutip.QobjEvo(op, tlist=self._hamiltonian.sampling_times)
+                for op in self._hamiltonian._collapse_ops
+            ],
+            progress_bar=progress_bar,
+            options=solv_ops,
+            map_func=serial_map if n_workers is None else parallel_map,
+            map_kwargs={} if n_workers is None else {"num_cpus": n_workers},
+        )
+        return [
+            self._make_coherent_results(traj_states, meas_errors)
+            for traj_states in result.states
+        ]
+
+    def _run_propagator(
+        self,
+        meas_errors: Optional[Mapping[str, float]] = None,
+        state_callback: Optional[Callable[[float, QutipResult], Any]] = None,
+    ) -> CoherentResults:
+        """Propagates the initial state without an ODE solver.
+
+        The Hamiltonian's coefficients are taken as constant between
+        consecutive sampling times, so the state is evolved through the
+        exact action of the matrix exponential of each step. Consecutive
+        steps with identical coefficients are merged into a single one.
+        If a `state_callback` is given, the states at the evaluation times
+        are handed to it as they are reached, and only the final one is
+        kept.
+
+        Returns:
+            CoherentResults: Object containing evolution results.
+        """
+        times = self._hamiltonian.sampling_times
+        dim = self.initial_state.shape[0]
+        # Small Hamiltonians are diagonalized at each step, after which the
+        # state is cheaply known at all the evaluation times within it
+        dense = dim <= _MAX_DENSE_PROPAGATION_DIM
+        static: Any = sp.csr_matrix((dim, dim), dtype=complex)
+        ops: list[Any] = []
+        coeffs = []
+        for term in self._hamiltonian._ham_terms:
+            if isinstance(term, qutip.Qobj):
+                static = static + term.data
+            else:
+                ops.append(term[0].data)
+                coeffs.append(term[1])
+        if dense:
+            static = static.toarray()
+            ops = [op.toarray() for op in ops]
+        coeffs_arr = np.reshape(coeffs, (len(ops), len(times)))
+        # A new step starts whenever the coefficients change (the last
+        # sampling time only marks the end of the final step)
+        changes = np.any(coeffs_arr[:, 1:-1] != coeffs_arr[:, :-2], axis=0)
+        step_starts = np.append(0, np.flatnonzero(changes) + 1)
+        step_times = np.append(times[step_starts], times[-1])
+
+        eval_times = self._eval_times_array
+        states: list[qutip.Qobj] = []
+
+        def add_states(times: np.ndarray, psis: Iterable[np.ndarray]) -> None:
+            for t, psi in zip(times, psis):
+                state = qutip.Qobj(
+                    dense1D_to_fastcsr_ket(
+                        np.ascontiguousarray(psi, dtype=complex)
+                    ),
+                    dims=self.initial_state.dims,
+                    fast="mc",
+                )
+                if state_callback is None:
+                    states.append(state)
+                else:
+                    state_callback(t, self._make_qutip_result(state))
+                    states[:] = [state]
+
+        psi = self.initial_state.full().ravel()
+        if eval_times[0] == 0:
+            add_states(eval_times[:1], [psi])
+        for t_start, t_stop, step_coeffs in zip(
+            step_times[:-1], step_times[1:], coeffs_arr[:, step_starts].T
+        ):
+            ham = static + sum(c * op for c, op in zip(step_coeffs, ops) if c)
+            in_step = (eval_times > t_start) & (eval_times <= t_stop)
+            targets = np.union1d(eval_times[in_step], [t_stop]) - t_start
+            if dense:
+                eigvals, eigvecs = np.linalg.eigh(ham)
+                step_psis = (
+                    np.exp(-1j * np.outer(targets, eigvals))
+                    * (eigvecs.conj().T @ psi)
+                ) @ eigvecs.T
+            elif np.allclose(
+                targets, np.linspace(0, t_stop - t_start, len(targets) + 1)[1:]
+            ):
+                # Evenly spaced targets are all reached in a single call
+                step_psis = expm_multiply(
+                    -1j * ham,
+                    psi,
+                    start=0,
+                    stop=t_stop - t_start,
+                    num=len(targets) + 1,
+                    endpoint=True,
+                )[1:]
+            else:
+                step_psis = []
+                for dt in np.diff(targets, prepend=0):
+                    psi = expm_multiply(-1j * dt * ham, psi)
+                    step_psis.append(psi)
+            psi = step_psis[-1]
+            add_states(eval_times[in_step], step_psis)
+        return self._make_coherent_results(
+            states, meas_errors, final_only=state_callback is not None
+        )
+
+    def _make_qutip_result(self, state: qutip.Qobj) -> QutipResult:
+        """Wraps a state of the evolution into a QutipResult."""
+        return QutipResult(
+            tuple(self._hamiltonian._qdict),
+            self._meas_basis,
+            state,
+            self._meas_basis == self._hamiltonian.basis_name,
+            self._hamiltonian._subspace,
+        )
+
+    def _make_coherent_results(
+        self,
+        states: typing.Sequence[qutip.Qobj],
+        meas_errors: Optional[Mapping[str, float]] = None,
+        final_only: bool = False,
+    ) -> CoherentResults:
+        """Wraps the states at each evaluation time into CoherentResults.
+
+        If `final_only` is True, `states` only holds the final state.
+        """
+        return CoherentResults(
+            [self._make_qutip_result(state) for state in states],
+            self._hamiltonian._size,
+            self._hamiltonian.basis_name,
+            self._eval_times_array[-1:]
+            if final_only
+            else self._eval_times_array,
+            self._meas_basis,
+            meas_errors,
+        )
+
+    def _run_noisy_realisation(
+        self,
+        initial_config: Optional[str],
+        n_samples: int,
+        solv_ops: qutip.Options,
+        progress_bar: Optional[bool] = None,
+        meas_errors: Optional[Mapping[str, float]] = None,
+        solver: str = "qutip",
+        n_workers: Optional[int] = None,
+        average_probabilities: bool = False,
+        noise_point: Optional[np.ndarray] = None,
+    ) -> sp.csr_matrix:
+        """Runs the emulation for one realisation of the noise.
+
+        Args:
+            initial_config: The bitstring flagging the badly prepared atoms.
+                If None, new random noise parameters are drawn instead.
+            n_samples: The number of samples to take at each evaluation time
+                (for each trajectory, if `solver` is "mcsolve").
+            solv_ops: The options for the QuTiP solver.
+            progress_bar: Whether to show the progress bar of the solver.
+            meas_errors: The measurement errors, if any.
+            solver: How the evolution is computed, either "qutip" (QuTiP's
+                sesolve or mesolve), "mcsolve" (to unravel the noise channels
+                into quantum trajectories) or "propagator" (see
+                `_run_propagator`).
+            n_workers: The number of processes among which the trajectories
+                are spread, if any.
+            average_probabilities: Whether to return the exact probabilities
+                instead of samples.
+            noise_point: The point of the unit hypercube setting the new
+                noise parameters, if they are not drawn at random (see
+                `Hamiltonian._update_noise()`).
+
+        Returns:
+            The counts of the samples taken at each evaluation time, as a
+            sparse matrix of shape (T, 2**size) whose columns are indexed
+            by the integer values of the bitstrings. If
+            `average_probabilities` is True, a sparse matrix of shape
+            (2 * T, 2**size) holding instead the sums of the exact
+            probabilities of the bitstrings (in the first T rows) and the
+            sums of their squares (in the last T rows), over the
+            trajectories if `solver` is "mcsolve", each weighted by
+            `n_samples`. Only the bitstrings with a non-zero probability
+            are stored.
+        """
+        if initial_config is not None:
+            # We load the initial state manually
+            self._hamiltonian._bad_atoms = dict(
+                zip(
+                    self._hamiltonian._qid_index,
+                    np.array(list(initial_config)).astype(bool),
+                )
+            )
+        # At each run, new random noise: new Hamiltonian
+        self._hamiltonian._construct_hamiltonian(
+            update=initial_config is None, noise_point=noise_point
+        )
+        # Get CoherentResults instances from sequence with added noise:
+        if solver == "mcsolve":
+            cleanres_noisyseqs = self._run_trajectories(
+                solv_ops, progress_bar, meas_errors, n_workers
+            )
+        elif solver == "propagator":
+            cleanres_noisyseqs = [self._run_propagator(meas_errors)]
+        else:
+            cleanres_noisyseqs = [
+                self._run_solver(solv_ops, progress_bar, meas_errors)
+            ]
+        if average_probabilities:
+            probs_sums = sp.csr_matrix(
+                (2 * len(self._eval_times_array), 2**self._hamiltonian._size)
+            )
+            for cleanres_noisyseq in cleanres_noisyseqs:
+                probs = cleanres_noisyseq._get_sparse_meas_probabilities()
+                probs_sums += n_samples * sp.vstack(
+                    [probs, probs.multiply(probs)], format="csr"
+                )
+            return probs_sums
+        # Extract statistics at eval time:
+        rows, cols, counts = [], [], []
+        for cleanres_noisyseq in cleanres_noisyseqs:
+            for t_index, t in enumerate(self._eval_times_array):
+                samples = cleanres_noisyseq.sample_packed_state(
+                    t, n_samples=n_samples
+                )
+                rows.append(np.full(len(samples), t_index))
+                cols.append(samples.ints)
+                counts.append(samples.counts)
+        # The counts of the same bitstring at the same time are summed
+        return sp.csr_matrix(
+            (
+                np.concatenate(counts),
+                (np.concatenate(rows), np.concatenate(cols).astype(np.int64)),
+            ),
+            shape=(len(self._eval_times_array), 2**self._hamiltonian._size),
+        )
+
     # Run Simulation Evolution using Qutip
     def run(
         self,
         progress_bar: bool = False,
+        n_workers: Optional[int] = None,
+        noise_solver: str = "mesolve",
+        engine: str = "qutip",
+        cache: Optional[ResultsCache] = None,
+        state_callback: Optional[Callable[[float, QutipResult], Any]] = None,
+        stack_states: Union[bool, str, os.PathLike] = False,
+        average_probabilities: bool = False,
+        target_error: Optional[float] = None,
+        max_runs: Optional[int] = None,
+        error_observables: Optional[
+            typing.Sequence[Union[qutip.Qobj, ArrayLike]]
+        ] = None,
         **options: Any,
     ) -> SimulationResults:
         """Simulates the sequence using QuTiP's solvers.
@@ -482,6 +866,94 @@ class QutipEmulator:
         Args:
             progress_bar: If True, the progress bar of QuTiP's
                 solver will be shown. If None or False, no text appears.
+            n_workers: If given, the runs of a noisy emulation are spread
+                across a pool of `n_workers` processes. Each run then draws
+                its noise from an independent random stream, seeded from
+                NumPy's global random state, so that the results are
+                reproducible regardless of the number of workers. The
+                progress bar is not shown in this case. If None (default),
+                the runs are executed sequentially. With the "mcsolve"
+                `noise_solver` and a single noise realisation, the
+                trajectories are spread across the processes instead.
+            noise_solver: The solver used with the "dephasing",
+                "depolarizing" and "eff_noise" noise types. Choose between:
+
+                - "mesolve": Solves the master equation for the density
+                  matrix, returning CoherentResults if no other noise
+                  requires multiple runs.
+
+                - "mcsolve": Unravels the master equation into quantum
+                  trajectories of state vectors (their number is set by the
+                  `ntraj` option). The results are always NoisyResults, each
+                  trajectory being sampled `samples_per_run` times.
+
+            engine: How the evolution is computed. Choose between:
+
+                - "qutip": Uses QuTiP's solvers, which interpolate the
+                  Hamiltonian's coefficients between sampling times.
+
+                - "propagator": Takes the coefficients as constant between
+                  sampling times and evolves the state through the exact
+                  action of the matrix exponential of each constant step,
+                  merging consecutive steps with identical coefficients.
+                  It does not rely on the solver `options` and can't be
+                  used with the "dephasing", "depolarizing" and
+                  "eff_noise" noise types.
+
+            cache: If given, the results are looked up in this cache before
+                solving and stored in it afterwards. They are identified by
+                the samples, register, device, configuration, evaluation
+                times, initial state and run options (as well as by NumPy's
+                global random state and whether the runs are parallel, when
+                the results depend on random draws).
+            state_callback: If given, it is called with each evaluation
+                time (in µs) and the QutipResult holding the state at that
+                time, as soon as the state is computed. The states are then
+                not stored, apart from the final one, so the returned
+                CoherentResults only hold the final evaluation time. This
+                keeps the memory usage low when the states are reduced on
+                the fly (e.g. to expectation values or to bitstring
+                probabilities). Only available for runs returning
+                CoherentResults and can't be combined with a `cache`.
+            stack_states: If True, the states of the returned
+                CoherentResults are stored in a single contiguous array of
+                shape (T, D) for state vectors or (T, D, D) for density
+                matrices (see `StackedQutipResults`), on which the
+                expectation values are computed all at once. If a path is
+                given, the array is memory-mapped to a ``.npy`` file at this
+                path instead of being kept in memory, so that results larger
+                than the memory can be obtained. Only available for runs
+                returning CoherentResults and can't be combined with a
+                `cache`.
+            average_probabilities: If True, the NoisyResults hold the exact
+                probabilities of the bitstrings (including the measurement
+                errors), averaged over the realisations of the noise, as
+                NoiseAveragedResults, instead of the counts of
+                `samples_per_run` samples drawn from each realisation. This
+                removes the shot noise from the results, so that fewer
+                `runs` are needed for converged observables. Samples can
+                still be drawn from the averaged probabilities afterwards.
+                Only used in runs returning NoisyResults.
+            target_error: If given, the number of runs is adapted to reach
+                this standard error at the final evaluation time. Batches of
+                `runs` runs are added until the standard error of the mean
+                over the runs is at most `target_error` or `max_runs` runs
+                were done. The standard error is the largest one among the
+                `error_observables` or, by default, among the probabilities
+                of the bitstrings. The number of runs and the standard error
+                reached are stored in the `n_runs` and `standard_error`
+                attributes of the returned NoisyResults. Only available when
+                the noise requires multiple runs. With a `noise_sampler`
+                other than "random", the runs of a batch are correlated, so
+                the batches are taken as independent randomized replicates
+                and the standard error comes from the spread of their means
+                (at least two batches are then run).
+            max_runs: The maximum number of runs when adapting them to a
+                `target_error`. Defaults to ten times `runs`. Can only be
+                given along with a `target_error`.
+            error_observables: The observables whose standard error is
+                compared to the `target_error`. Like in
+                `NoisyResults.expect()`, they must be diagonal.
             options: Used as arguments for qutip.Options(). If specified, will
                 override SimConfig solver_options. If no `max_step` value is
                 provided, an automatic one is calculated from the `Sequence`'s
@@ -491,6 +963,121 @@ class QutipEmulator:
 
                 .. _docs: https://bit.ly/3il9A2u
         """
+        if stack_states is not False and self._is_random(noise_solver, engine):
+            raise NotImplementedError(
+                "The states can only be stacked in runs returning "
+                "CoherentResults."
+            )
+        if max_runs is not None:
+            if not isinstance(max_runs, int) or max_runs < 1:
+                raise ValueError(
+                    f"`max_runs` must be a positive integer, not {max_runs!r}."
+                )
+            if target_error is None:
+                raise ValueError(
+                    "`max_runs` can only be given along with a "
+                    "`target_error`."
+                )
+        if target_error is not None:
+            if not target_error > 0:
+                raise ValueError(
+                    "`target_error` must be a positive number, not "
+                    f"{target_error!r}."
+                )
+            if not self._has_multiple_runs():
+                raise NotImplementedError(
+                    "The number of runs can only be adapted to a "
+                    "`target_error` when the noise requires multiple runs."
+                )
+        if stack_states is not False and cache is not None:
+            raise ValueError(
+                "`stack_states` can't be combined with a `cache`, since the "
+                "cached results don't hold stacked states."
+            )
+        if state_callback is not None:
+            if cache is not None:
+                raise ValueError(
+                    "A `state_callback` can't be combined with a `cache`, "
+                    "since the states of cached results are not replayed."
+                )
+            if self._is_random(noise_solver, engine):
+                raise NotImplementedError(
+                    "A `state_callback` can only be used in runs returning "
+                    "CoherentResults."
+                )
+        if cache is not None:
+            is_random = self._is_random(noise_solver, engine)
+            key = self._get_cache_key(
+                noise_solver,
+                engine,
+                {
+                    **options,
+                    # Parallel runs draw their noise from other streams
+                    "parallel": n_workers is not None,
+                    "average_probabilities": average_probabilities,
+                    "target_error": target_error,
+                    "max_runs": max_runs,
+                    "error_observables": (
+                        None
+                        if error_observables is None
+                        else [
+                            (
+                                obs.full()
+                                if isinstance(obs, qutip.Qobj)
+                                else np.asarray(obs)
+                            )
+                            for obs in error_observables
+                        ]
+                    ),
+                },
+                is_random,
+            )
+            cached_results = cache.get(key)
+            if cached_results is None:
+                cached_results = self.run(
+                    progress_bar,
+                    n_workers,
+                    noise_solver,
+                    engine,
+                    average_probabilities=average_probabilities,
+                    target_error=target_error,
+                    max_runs=max_runs,
+                    error_observables=error_observables,
+                    **options,
+                )
+                cache.put(
+                    key,
+                    cached_results,
+                    np.random.get_state() if is_random else None,
+                )
+            return cached_results
+
+        if n_workers is not None and (
+            not isinstance(n_workers, int) or n_workers < 1
+        ):
+            raise ValueError(
+                f"`n_workers` must be a positive integer, not {n_workers!r}."
+            )
+        if noise_solver not in ("mesolve", "mcsolve"):
+            raise ValueError(
+                "`noise_solver` must be 'mesolve' or 'mcsolve', not "
+                f"{noise_solver!r}."
+            )
+        if engine not in ("qutip", "propagator"):
+            raise ValueError(
+                f"`engine` must be 'qutip' or 'propagator', not {engine!r}."
+            )
+        solver = "qutip"
+        if engine == "propagator":
+            if self._hamiltonian._collapse_ops:
+                raise NotImplementedError(
+                    "The 'propagator' engine only evolves state vectors, so it"
+                    " can't emulate the 'dephasing', 'depolarizing' and "
+                    "'eff_noise' noise types."
+                )
+            solver = "propagator"
+        elif noise_solver == "mcsolve" and self._hamiltonian._collapse_ops:
+            solver = "mcsolve"
         if "max_step" not in options:
             pulse_durations = [
                 slot.tf - slot.ti
@@ -512,142 +1099,432 @@ class QutipEmulator:
                 k: self.config.spam_dict[k]
                 for k in ("epsilon", "epsilon_prime")
             }
-            if self.config.eta > 0 and self.initial_state != qutip.tensor(
-                [
-                    self._hamiltonian.basis[
-                        "u" if self._hamiltonian._interaction == "XY" else "g"
-                    ]
-                    for _ in range(self._hamiltonian._size)
-                ]
+            if (
+                self.config.eta > 0
+                and self.initial_state != self._all_ground_state()
             ):
                 raise NotImplementedError(
                     "Can't combine state preparation errors with an initial "
                     "state different from the ground."
                 )
 
-        def _run_solver() -> CoherentResults:
-            """Returns CoherentResults: Object containing evolution results."""
-            # Decide if progress bar will be fed to QuTiP solver
-            p_bar: Optional[bool]
-            if progress_bar is True:
-                p_bar = True
-            elif (progress_bar is False) or (progress_bar is None):
-                p_bar = None
-            else:
-                raise ValueError("`progress_bar` must be a bool.")
-
-            if (
-                "dephasing" in self.config.noise
-                or "depolarizing" in self.config.noise
-                or "eff_noise" in self.config.noise
-            ):
-                result = qutip.mesolve(
-                    self._hamiltonian._hamiltonian,
-                    self.initial_state,
-                    self._eval_times_array,
-                    self._hamiltonian._collapse_ops,
-                    progress_bar=p_bar,
-                    options=solv_ops,
+        # Decide if progress bar will be fed to QuTiP solver
+        p_bar: Optional[bool]
+        if progress_bar is True:
+            p_bar = True
+        elif (progress_bar is False) or (progress_bar is None):
+            p_bar = None
+        else:
+            raise ValueError("`progress_bar` must be a bool.")
+
+        # The arguments of each noise realisation (see `_draw_runs()`)
+        runs_args: list[tuple[Optional[str], int, Optional[np.ndarray]]]
+        # Without noises asking for averaging over multiple runs
+        if not self._has_multiple_runs():
+            if solver != "mcsolve" and stack_states is not False:
+                # The states are written to the array as they come
+                stacker = _StateStacker(
+                    len(self._eval_times_array),
+                    None if stack_states is True else stack_states,
+                    state_callback,
                 )
-            else:
-                result = qutip.sesolve(
-                    self._hamiltonian._hamiltonian,
-                    self.initial_state,
+                if solver == "propagator":
+                    self._run_propagator(meas_errors, stacker)
+                else:
+                    self._run_solver(solv_ops, p_bar, meas_errors, stacker)
+                return CoherentResults(
+                    stacker.get_results(),
+                    self._hamiltonian._size,
+                    self._hamiltonian.basis_name,
                     self._eval_times_array,
-                    progress_bar=p_bar,
-                    options=solv_ops,
+                    self._meas_basis,
+                    meas_errors,
+                )
+            if solver == "propagator":
+                return self._run_propagator(meas_errors, state_callback)
+            if solver == "qutip":
+                return self._run_solver(
+                    solv_ops, p_bar, meas_errors, state_callback
+                )
+            # A single realisation, sampled from each trajectory
+            runs_args = [(None, self.config.samples_per_run, None)]
+        else:
+            if target_error is not None and max_runs is None:
+                max_runs = 10 * self.config.runs
+            runs_args = self._draw_runs(
+                self.config.runs
+                if max_runs is None
+                else min(self.config.runs, max_runs)
+            )
+
+        # Will return NoisyResults
+        time_indices = range(len(self._eval_times_array))
+        # With average_probabilities, the sums of the probabilities and of
+        # their squares are stacked (see `_run_noisy_realisation()`)
+        total_count = (
+            sp.csr_matrix(
+                (2 * len(time_indices), 2**self._hamiltonian._size)
+            )
+            if average_probabilities
+            else sp.csr_matrix(
+                (len(time_indices), 2**self._hamiltonian._size),
+                dtype=np.int64,
+            )
+        )
+        # With "mcsolve", each trajectory is sampled n_samples times
+        n_traj = solv_ops.ntraj if solver == "mcsolve" else 1
+        n_runs, n_measures = 0, 0
+        # The sums of the values (and of their squares) taken at the final
+        # time by the quantities whose standard error is targeted, along
+        # with the number of runs, in each batch
+        batch_sums: list[np.ndarray] = []
+        batch_squares: list[np.ndarray] = []
+        batch_runs: list[int] = []
+        standard_error: Optional[float] = None
+        with ExitStack() as stack:
+            executor: Optional[ProcessPoolExecutor] = None
+            while True:
+                run_counts: Iterable[sp.csr_matrix]
+                if n_workers is None or len(runs_args) == 1:
+                    # We run the system multiple times
+                    run_counts = (
+                        self._run_noisy_realisation(
+                            initial_config,
+                            n_samples,
+                            solv_ops,
+                            p_bar,
+                            meas_errors,
+                            solver,
+                            n_workers,
+                            average_probabilities,
+                            noise_point,
+                        )
+                        for initial_config, n_samples, noise_point in runs_args
+                    )
+                else:
+                    # Each run gets its own random stream, spawned from a
+                    # seed drawn from the global random state
+                    run_seeds = np.random.SeedSequence(
+                        np.random.randint(2**32, dtype=np.uint64)
+                    ).spawn(len(runs_args))
+                    if executor is None:
+                        executor = stack.enter_context(
+                            ProcessPoolExecutor(
+                                max_workers=n_workers,
+                                initializer=_init_noisy_run_worker,
+                                initargs=(self,),
+                            )
+                        )
+                    run_counts = executor.map(
+                        _noisy_run_worker,
+                        [
+                            (
+                                initial_config,
+                                n_samples,
+                                solv_ops,
+                                meas_errors,
+                                solver,
+                                average_probabilities,
+                                noise_point,
+                                seed,
+                            )
+                            for (
+                                initial_config,
+                                n_samples,
+                                noise_point,
+                            ), seed in zip(runs_args, run_seeds)
+                        ],
+                    )
+                # The distribution of the bitstrings at the final time
+                final_dists = []
+                for (_, n_samples, _), run_count in zip(runs_args, run_counts):
+                    total_count += run_count
+                    n_measures += n_samples * n_traj
+                    if target_error is not None:
+                        final_dists.append(
+                            run_count.getrow(len(time_indices) - 1).toarray()[
+                                0
+                            ]
+                            / (n_samples * n_traj)
+                        )
+                # Runs with the same initial configuration are grouped
+                n_reps = np.array(
+                    [
+                        n_samples // self.config.samples_per_run
+                        for _, n_samples, _ in runs_args
+                    ]
+                )
+                n_runs += int(np.sum(n_reps))
+                if target_error is None:
+                    break
+                assert max_runs is not None
+                values = self._get_error_values(
+                    np.array(final_dists), error_observables
+                )
+                batch_sums.append(n_reps @ values)
+                batch_squares.append(n_reps @ np.abs(values) ** 2)
+                batch_runs.append(int(np.sum(n_reps)))
+                standard_error = self._get_standard_error(
+                    np.array(batch_sums),
+                    np.array(batch_squares),
+                    np.array(batch_runs),
                 )
+                if standard_error is not None and (
+                    standard_error <= target_error
+                ):
+                    break
+                if n_runs >= max_runs:
+                    break
+                runs_args = self._draw_runs(
+                    min(self.config.runs, max_runs - n_runs)
+                )
+
+        results: list[Union[SampledResult, NoiseAveragedResult]]
+        if average_probabilities:
+            total_count.sort_indices()
+            n_realisations = n_measures / self.config.samples_per_run
+            results = []
+            for t in time_indices:
+                sums = total_count.getrow(t)
+                squares = total_count.getrow(len(time_indices) + t)
+                # The realisations are weighted by their number of samples
+                probs = sums.data / n_measures
+                # Only the bitstrings with a probability have a square
+                squares_mean = np.zeros_like(probs)
+                squares_mean[
+                    np.searchsorted(sums.indices, squares.indices)
+                ] = (squares.data / n_measures)
+                variances = np.maximum(squares_mean - probs**2, 0)
+                results.append(
+                    NoiseAveragedResult(
+                        tuple(self._hamiltonian._qdict),
+                        self._meas_basis,
+                        probs,
+                        np.sqrt(variances / n_realisations),
+                        sums.indices.astype(np.int64),
+                    )
+                )
+        else:
             results = [
-                QutipResult(
+                SampledResult(
                     tuple(self._hamiltonian._qdict),
                     self._meas_basis,
-                    state,
-                    self._meas_basis == self._hamiltonian.basis_name,
+                    BitstringCounts.from_ints(
+                        total_count.indices[start:stop],
+                        total_count.data[start:stop],
+                        size=self._hamiltonian._size,
+                    ).to_counter(),
+                )
+                for start, stop in zip(
+                    total_count.indptr[:-1], total_count.indptr[1:]
                 )
-                for state in result.states
             ]
-            return CoherentResults(
-                results,
-                self._hamiltonian._size,
-                self._hamiltonian.basis_name,
-                self._eval_times_array,
-                self._meas_basis,
-                meas_errors,
+        return NoisyResults(
+            results,
+            self._hamiltonian._size,
+            self._hamiltonian.basis_name,
+            self._eval_times_array,
+            n_measures,
+            n_runs=n_runs,
+            standard_error=standard_error,
+        )
+
+    def _has_multiple_runs(self) -> bool:
+        """Whether the noise requires averaging over multiple runs."""
+        noise = set(self.config.noise)
+        return not (
+            noise <= {"dephasing", "SPAM", "depolarizing", "eff_noise"}
+            and ("SPAM" not in noise or self.config.eta == 0)
+        )
+
+    def _get_standard_error(
+        self,
+        batch_sums: np.ndarray,
+        batch_squares: np.ndarray,
+        batch_runs: np.ndarray,
+    ) -> Optional[float]:
+        """Estimates the standard error of the mean over the runs.
+
+        With the "random" noise sampler, the runs are independent, so the
+        standard error is obtained from the variance over all the runs.
+        With the other samplers, the runs of a batch are correlated, since
+        they come from the same design. The batches being independent
+        randomized designs, the standard error is then obtained from the
+        spread of the means of the batches.
+
+        Args:
+            batch_sums: The sums of the values taken in the runs of each
+                batch, of shape (n_batches, n_values).
+            batch_squares: The sums of the absolute squares of the values
+                taken in the runs of each batch.
+            batch_runs: The number of runs in each batch.
+
+        Returns:
+            The largest standard error among the values, or None if it
+            can't be estimated yet.
+        """
+        n_runs = np.sum(batch_runs)
+        total_mean = np.sum(batch_sums, axis=0) / n_runs
+        if self.config.noise_sampler == "random":
+            if n_runs < 2:
+                return None
+            variances = np.maximum(
+                np.sum(batch_squares, axis=0)
+                - n_runs * np.abs(total_mean) ** 2,
+                0,
+            ) / (n_runs - 1)
+            return float(np.max(np.sqrt(variances / n_runs)))
+        n_batches = len(batch_runs)
+        if n_batches < 2:
+            return None
+        # The mean over all the runs is the mean of the batches' means,
+        # weighted by their number of runs
+        weights = batch_runs / n_runs
+        deviations = batch_sums / batch_runs[:, np.newaxis] - total_mean
+        variances = (
+            n_batches
+            / (n_batches - 1)
+            * np.sum(
+                weights[:, np.newaxis] ** 2 * np.abs(deviations) ** 2, axis=0
             )
+        )
+        return float(np.max(np.sqrt(variances)))
 
-        # Check if noises ask for averaging over multiple runs:
-        if set(self.config.noise).issubset(
-            {"dephasing", "SPAM", "depolarizing", "eff_noise"}
-        ):
-            # If there is "SPAM", the preparation errors must be zero
-            if "SPAM" not in self.config.noise or self.config.eta == 0:
-                return _run_solver()
+    def _draw_runs(
+        self, n_runs: int
+    ) -> list[tuple[Optional[str], int, Optional[np.ndarray]]]:
+        """Draws the noise of multiple runs.
 
-            else:
-                # Stores the different initial configurations and frequency
-                initial_configs = Counter(
-                    "".join(
-                        (
-                            np.random.uniform(
-                                size=len(self._hamiltonian._qid_index)
-                            )
-                            < self.config.eta
-                        )
-                        .astype(int)
-                        .astype(str)  # Turns bool->int->str
-                    )
-                    for _ in range(self.config.runs)
-                ).most_common()
-                loop_runs = len(initial_configs)
-                update_ham = False
-        else:
-            loop_runs = self.config.runs
-            update_ham = True
+        Args:
+            n_runs: The number of runs.
 
-        # Will return NoisyResults
-        time_indices = range(len(self._eval_times_array))
-        total_count = np.array([Counter() for _ in time_indices])
-        # We run the system multiple times
-        for i in range(loop_runs):
-            if not update_ham:
-                initial_state, reps = initial_configs[i]
-                # We load the initial state manually
-                self._hamiltonian._bad_atoms = dict(
-                    zip(
-                        self._hamiltonian._qid_index,
-                        np.array(list(initial_state)).astype(bool),
-                    )
+        Returns:
+            The arguments of each realisation of the noise: the bitstring
+            flagging the badly prepared atoms (if they are the only source
+            of randomness, in which case the runs sharing the same
+            configuration are grouped in a single realisation), the number
+            of samples and the point setting the noise parameters (see
+            `_run_noisy_realisation()`).
+        """
+        noise_points = self._hamiltonian._draw_noise_points(n_runs)
+        if not set(self.config.noise) <= {
+            "dephasing",
+            "SPAM",
+            "depolarizing",
+            "eff_noise",
+        }:
+            return [
+                (
+                    None,
+                    self.config.samples_per_run,
+                    None if noise_points is None else noise_points[i],
                 )
-            else:
-                reps = 1
-            # At each run, new random noise: new Hamiltonian
-            self._hamiltonian._construct_hamiltonian(update=update_ham)
-            # Get CoherentResults instance from sequence with added noise:
-            cleanres_noisyseq = _run_solver()
-            # Extract statistics at eval time:
-            total_count += np.array(
-                [
-                    cleanres_noisyseq.sample_state(
-                        t, n_samples=self.config.samples_per_run * reps
+                for i in range(n_runs)
+            ]
+        # Stores the different initial configurations and frequency
+        initial_configs = Counter(
+            "".join(
+                (
+                    (
+                        np.random.uniform(
+                            size=len(self._hamiltonian._qid_index)
+                        )
+                        if noise_points is None
+                        else noise_points[i]
                     )
-                    for t in self._eval_times_array
-                ]
-            )
-        n_measures = self.config.runs * self.config.samples_per_run
-        results = [
-            SampledResult(
-                tuple(self._hamiltonian._qdict),
-                self._meas_basis,
-                total_count[t],
+                    < self.config.eta
+                )
+                .astype(int)
+                .astype(str)  # Turns bool->int->str
             )
-            for t in time_indices
+            for i in range(n_runs)
+        ).most_common()
+        return [
+            (initial_config, self.config.samples_per_run * reps, None)
+            for initial_config, reps in initial_configs
         ]
-        return NoisyResults(
-            results,
+
+    def _get_error_values(
+        self,
+        final_dists: np.ndarray,
+        error_observables: Optional[
+            typing.Sequence[Union[qutip.Qobj, ArrayLike]]
+        ],
+    ) -> np.ndarray:
+        """Gets the values whose standard error is targeted in each run.
+
+        Args:
+            final_dists: The distribution of the bitstrings at the final
+                time in each run, of shape (n_runs, 2**size).
+            error_observables: The observables whose standard error is
+                targeted. If None, it is that of the bitstrings' probabilities.
+
+        Returns:
+            The values of each run, of shape (n_runs, K).
+        """
+        if error_observables is None:
+            return final_dists
+        # Each run's distribution is taken as a time of NoisyResults
+        run_results = NoisyResults(
+            [
+                NoiseAveragedResult(
+                    tuple(self._hamiltonian._qdict),
+                    self._meas_basis,
+                    dist,
+                    np.zeros_like(dist),
+                )
+                for dist in final_dists
+            ],
             self._hamiltonian._size,
             self._hamiltonian.basis_name,
+            np.arange(len(final_dists), dtype=float),
+            len(final_dists),
+        )
+        return np.array(run_results.expect(error_observables)).T
+
+    def _is_random(self, noise_solver: str, engine: str) -> bool:
+        """Whether the results of a run depend on random draws."""
+        # Only the noises requiring multiple runs or the unravelling into
+        # quantum trajectories involve random draws
+        return self._has_multiple_runs() or (
+            engine != "propagator"
+            and noise_solver == "mcsolve"
+            and bool(self._hamiltonian._collapse_ops)
+        )
+
+    def _get_cache_key(
+        self,
+        noise_solver: str,
+        engine: str,
+        options: dict[str, Any],
+        is_random: bool,
+    ) -> str:
+        """The idempotent hash of everything determining the results."""
+        config = self.config
+        return static_hash(
+            self.samples_obj,
+            self._register,
+            self._hamiltonian._device,
+            self._hamiltonian._sampling_rate,
+            self._hamiltonian._blockade_radius,
+            {
+                **vars(config),
+                "eff_noise_opers": [
+                    op.full() for op in config.eff_noise_opers
+                ],
+                "solver_options": (
+                    vars(config.solver_options)
+                    if config.solver_options
+                    else None
+                ),
+            },
             self._eval_times_array,
-            n_measures,
+            self.initial_state.full(),
+            self._meas_basis,
+            noise_solver,
+            engine,
+            options,
+            np.random.get_state() if is_random else None,
         )
 
     def draw(
@@ -696,6 +1573,7 @@ class QutipEmulator:
         config: Optional[SimConfig] = None,
         evaluation_times: Union[float, str, ArrayLike] = "Full",
         with_modulation: bool = False,
+        blockade_radius: Union[float, str, None] = None,
     ) -> QutipEmulator:
         r"""Simulation of a pulse sequence using QuTiP.
 
@@ -720,6 +1598,10 @@ class QutipEmulator:
                 - A float to act as a sampling rate for the resulting state.
             with_modulation: Whether to simulate the sequence with the
                 programmed input or the expected output.
+            blockade_radius: If defined, restricts the emulation to the
+                states respecting the Rydberg blockade for this radius (in
+                µm). If "auto", the radius is taken from the device for the
+                highest amplitude of the sequence.
         """
         if not isinstance(sequence, Sequence):
             raise TypeError(
@@ -758,9 +1640,120 @@ class QutipEmulator:
             sampling_rate,
             config,
             evaluation_times,
+            blockade_radius,
         )
 
 
+# Above this dimension, the Hamiltonian is no longer diagonalized by the
+# "propagator" engine, which relies on sparse matrix exponentials instead
+_MAX_DENSE_PROPAGATION_DIM = 256
+
+# The emulator used by the processes of a pool running noisy realisations
+_worker_emulator: Optional[QutipEmulator] = None
+
+
+def _init_noisy_run_worker(emulator: QutipEmulator) -> None:
+    """Stores the emulator in the global state of a pool's process."""
+    global _worker_emulator
+    _worker_emulator = emulator
+
+
+class _StateStacker:
+    """Stacks the states of a run in a single array, as they are computed.
+
+    Args:
+        num_states: The number of states to stack.
+        filename: If given, the array is memory-mapped to this ``.npy`` file.
+        state_callback: A callback to call with each state, after stacking
+            it.
+    """
+
+    def __init__(
+        self,
+        num_states: int,
+        filename: Optional[Union[str, os.PathLike]] = None,
+        state_callback: Optional[Callable[[float, QutipResult], Any]] = None,
+    ):
+        self._num_states = num_states
+        self._filename = filename
+        self._state_callback = state_callback
+        self._states: Optional[np.ndarray] = None
+        self._first_result: Optional[QutipResult] = None
+        self._count = 0
+
+    def __call__(self, t: float, result: QutipResult) -> None:
+        data = result.state.full()
+        if result.state.isket:
+            data = data.ravel()
+        if self._states is None:
+            # The shape of the states is known from the first one
+            shape = (self._num_states, *data.shape)
+            self._states = (
+                np.zeros(shape, dtype=complex)
+                if self._filename is None
+                else np.lib.format.open_memmap(
+                    self._filename, mode="w+", dtype=complex, shape=shape
+                )
+            )
+            self._first_result = result
+        self._states[self._count] = data
+        self._count += 1
+        if self._state_callback is not None:
+            self._state_callback(t, result)
+
+    def get_results(self) -> StackedQutipResults:
+        """Gets the results holding the stacked states."""
+        assert self._states is not None and self._first_result is not None
+        if isinstance(self._states, np.memmap):
+            self._states.flush()
+        res = self._first_result
+        return StackedQutipResults(
+            self._states,
+            res.state.dims,
+            res.atom_order,
+            res.meas_basis,
+            res.matching_meas_basis,
+            res.subspace_indices,
+        )
+
+
+def _noisy_run_worker(
+    args: tuple[
+        Optional[str],
+        int,
+        qutip.Options,
+        Optional[Mapping[str, float]],
+        str,
+        bool,
+        Optional[np.ndarray],
+        np.random.SeedSequence,
+    ]
+) -> sp.csr_matrix:
+    """Runs one noisy realisation with the emulator of the process."""
+    (
+        initial_config,
+        n_samples,
+        solv_ops,
+        meas_errors,
+        solver,
+        average_probabilities,
+        noise_point,
+        seed,
+    ) = args
+    assert _worker_emulator is not None
+    np.random.seed(seed.generate_state(4))
+    return _worker_emulator._run_noisy_realisation(
+        initial_config,
+        n_samples,
+        solv_ops,
+        None,
+        meas_errors,
+        solver,
+        average_probabilities=average_probabilities,
+        noise_point=noise_point,
+    )
+
+
 class Simulation:
     r"""Simulation of a pulse sequence using QuTiP.
 
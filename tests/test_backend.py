@@ -88,6 +88,25 @@ def test_emulator_config_type_errors(param, msg):
         EmulatorConfig(**{param: None})
 
 
+def test_emulator_config_static_hash():
+    config = EmulatorConfig(
+        evaluation_times=[0.0, 0.5, 1.0],
+        noise_model=NoiseModel(noise_types=("dephasing",)),
+    )
+    same_config = EmulatorConfig(
+        evaluation_times=[0.0, 0.5, 1.0],
+        noise_model=NoiseModel(noise_types=("dephasing",)),
+    )
+    assert config.static_hash() == same_config.static_hash()
+    assert len(config.static_hash()) == 64
+    for other in (
+        replace(config, evaluation_times="Minimal"),
+        replace(config, noise_model=NoiseModel()),
+        replace(config, backend_options={"engine": "propagator"}),
+    ):
+        assert other.static_hash() != config.static_hash()
+
+
 class TestNoiseModel:
     def test_bad_noise_type(self):
         with pytest.raises(
@@ -95,6 +114,12 @@ class TestNoiseModel:
         ):
             NoiseModel(noise_types=("bad_noise",))
 
+    def test_bad_noise_sampler(self):
+        with pytest.raises(
+            ValueError, match="'qmc' is not a valid noise sampler."
+        ):
+            NoiseModel(noise_sampler="qmc")
+
     @pytest.mark.parametrize(
         "param",
         ["runs", "samples_per_run", "temperature", "laser_waist"],
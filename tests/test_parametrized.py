@@ -22,7 +22,7 @@ from numpy.polynomial import Polynomial
 
 from pulser import Pulse
 from pulser.json.coders import PulserDecoder, PulserEncoder
-from pulser.parametrized import ParamObj, Variable
+from pulser.parametrized import EvaluationPlan, ParamObj, Variable
 from pulser.waveforms import BlackmanWaveform, CompositeWaveform
 
 
@@ -239,3 +239,43 @@ def test_opsupport(a, b):
     assert list(y2.variables) == ["b"]
     y2.variables["b"]._assign(b.value)
     np.testing.assert_array_equal(y2.build(), y.build())
+
+
+def test_evaluation_plan(bwf, t, a, b):
+    amp = np.sin(a[0] * np.pi / 4) ** 2 + b[0]
+    pulse = Pulse.ConstantDetuning(bwf, amp, b[1])
+    b_items = b[[1, 0]]
+    plan = EvaluationPlan([pulse, amp, 3, b_items, pulse])
+    assert set(plan.variables) == {"t", "a", "b"}
+    # The nodes shared by several objects are only evaluated once
+    assert plan.num_steps == EvaluationPlan([pulse, b_items]).num_steps
+
+    vars = dict(t=[500], a=[1.0], b=[2, 3])
+    out = plan.evaluate(vars)
+    assert out[2] == 3
+    assert out[0] is out[4]
+    assert out[0] == Pulse.ConstantDetuning(
+        BlackmanWaveform(500, 1.0), np.sin(np.pi / 4) ** 2 + 2, 3
+    )
+    np.testing.assert_allclose(out[1], 2.5)
+    assert out[3] == [3, 2]
+    # Evaluating the plan doesn't assign values to the variables
+    assert a.value is None
+
+    batch = dict(t=[500, 1000, 200], a=[1.0, 2.0, [0.5]], b=[[2, 3]] * 3)
+    outs = plan.evaluate_batch(batch)
+    assert len(outs) == 3
+    for i, batch_out in enumerate(outs):
+        expected = plan.evaluate({k: v[i] for k, v in batch.items()})
+        assert batch_out[0] == expected[0]
+        assert batch_out[0] is batch_out[4]
+        np.testing.assert_allclose(batch_out[1], expected[1])
+        assert batch_out[2:4] == expected[2:4]
+
+    assert plan.evaluate_batch(dict(t=[], a=[], b=[])) == []
+    with pytest.raises(TypeError, match="Did not receive values for"):
+        plan.evaluate(dict(a=1.0))
+    with pytest.raises(ValueError, match="same number of values"):
+        plan.evaluate_batch(dict(t=[100], a=[1.0, 2.0], b=[[1, 1]]))
+    with pytest.raises(ValueError, match="Can't assign array of size 1"):
+        plan.evaluate(dict(t=[500], a=[1.0], b=[2]))
@@ -22,6 +22,7 @@ from pulser import Pulse, Register, Sequence
 from pulser.devices import DigitalAnalogDevice, MockDevice
 from pulser.parametrized import Variable
 from pulser.parametrized.variable import VariableItem
+from pulser.sampler import sample
 from pulser.waveforms import BlackmanWaveform
 
 reg = Register.rectangle(4, 3)
@@ -209,6 +210,72 @@ def test_build():
     assert str(sb) == str(sb_2)
 
 
+def test_build_many():
+    reg_ = Register.rectangle(2, 1, prefix="q")
+    sb = Sequence(reg_, device)
+    var = sb.declare_variable("var")
+    targ_var = sb.declare_variable("targ_var", dtype=int)
+    sb.declare_channel("ch1", "rydberg_local", initial_target="q0")
+    sb.declare_channel("ch2", "raman_local")
+    sb.add(Pulse.ConstantPulse(100, 1, 0, 0), "ch1")
+    sb.target_index(targ_var, "ch2")
+    sb.add(Pulse.ConstantDetuning(BlackmanWaveform(500, var), 1, 0), "ch2")
+    sb.phase_shift_index(var, targ_var)
+    sb.delay(var * 20, "ch1")
+
+    vars_list = [dict(var=v, targ_var=t) for v, t in [(1, 0), (2, 1), (3, 0)]]
+    seqs = sb.build_many(vars_list)
+    assert len(seqs) == len(vars_list)
+    for vars, seq in zip(vars_list, seqs):
+        expected = sb.build(**vars)
+        assert str(seq) == str(expected)
+        assert seq.current_phase_ref(
+            f"q{vars['targ_var']}"
+        ) == expected.current_phase_ref(f"q{vars['targ_var']}")
+        for ch in ("ch1", "ch2"):
+            np.testing.assert_equal(
+                sample(seq).channel_samples[ch].amp,
+                sample(expected).channel_samples[ch].amp,
+            )
+            np.testing.assert_equal(
+                sample(seq).channel_samples[ch].phase,
+                sample(expected).channel_samples[ch].phase,
+            )
+    # The built sequences don't share their mutable state
+    duration = seqs[1].get_duration("ch1")
+    seqs[0].delay(100, "ch1")
+    assert seqs[1].get_duration("ch1") == duration
+
+    samples = sb.build_many(vars_list, return_samples=True, n_workers=2)
+    assert len(samples) == len(vars_list)
+    for smpls, vars in zip(samples, vars_list):
+        expected = sample(sb.build(**vars)).to_nested_dict()
+        for basis, qty_dict in expected["Local"].items():
+            for qid, qty in qty_dict.items():
+                for key, values in qty.items():
+                    np.testing.assert_equal(
+                        smpls.to_nested_dict()["Local"][basis][qid][key],
+                        values,
+                    )
+
+    with pytest.raises(ValueError, match="must be a positive integer"):
+        sb.build_many(vars_list, n_workers=0)
+    with pytest.raises(TypeError, match="Did not receive values for"):
+        sb.build_many([dict(var=1)])
+    assert sb.build_many([]) == []
+
+    # The build plan is compiled once and shared by all the builds
+    plan = sb._get_build_plan()
+    assert sb._get_build_plan() is plan
+    assert sb._get_builder().plan is plan
+    assert copy.deepcopy(sb)._build_plan is None
+    # Storing a new call recompiles it
+    duration = sb.build(var=2, targ_var=0).get_duration("ch2")
+    sb.delay(var * 10, "ch2")
+    assert sb._get_build_plan() is not plan
+    assert sb.build(var=2, targ_var=0).get_duration("ch2") == duration + 20
+
+
 def test_str():
     reg_ = Register.rectangle(2, 1, prefix="q")
     sb = Sequence(reg_, device)
@@ -304,8 +371,10 @@ def test_parametrized_before_eom_mode(mod_device):
     ):
         seq.enable_eom_mode("ch0", 10000, 0.0)
 
+    plan = seq._get_build_plan()
     seq.enable_eom_mode("ch0", amp_on=amp, detuning_on=0.0)
     assert seq.is_in_eom_mode("ch0")
+    assert seq._get_build_plan() is not plan
 
     # Validation still works
     with pytest.raises(ValueError, match="Invalid protocol 'smallest'"):
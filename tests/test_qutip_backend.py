@@ -20,10 +20,10 @@ import qutip
 import pulser
 from pulser.devices import MockDevice
 from pulser.waveforms import BlackmanWaveform
-from pulser_simulation import SimConfig
+from pulser_simulation import ResultsCache, SimConfig
 from pulser_simulation.qutip_backend import QutipBackend
 from pulser_simulation.qutip_result import QutipResult
-from pulser_simulation.simresults import CoherentResults
+from pulser_simulation.simresults import CoherentResults, NoisyResults
 
 
 @pytest.fixture
@@ -53,3 +53,75 @@ def test_qutip_backend(sequence):
     final_state = final_result.get_state()
     assert final_state == results.get_final_state()
     np.testing.assert_allclose(final_state.full(), [[0], [1]], atol=1e-5)
+
+
+def test_qutip_backend_parallel_runs(sequence):
+    noise_model = pulser.NoiseModel(
+        noise_types=("doppler",), runs=4, samples_per_run=5
+    )
+    config = pulser.EmulatorConfig(
+        noise_model=noise_model, evaluation_times="Minimal"
+    )
+    qutip_backend = QutipBackend(sequence, config)
+    np.random.seed(42)
+    results = qutip_backend.run(n_workers=2)
+    assert sum(results[-1].bitstring_counts.values()) == 20
+    np.random.seed(42)
+    assert qutip_backend.run(n_workers=2)[-1] == results[-1]
+
+
+def test_qutip_backend_trajectories(sequence):
+    noise_model = pulser.NoiseModel(
+        noise_types=("dephasing",), dephasing_rate=0.5, samples_per_run=3
+    )
+    config = pulser.EmulatorConfig(
+        noise_model=noise_model,
+        evaluation_times="Minimal",
+        backend_options={"noise_solver": "mcsolve", "ntraj": 20},
+    )
+    results = QutipBackend(sequence, config).run()
+    assert isinstance(results, NoisyResults)
+    assert results.n_measures == 60
+    assert sum(results[-1].bitstring_counts.values()) == 60
+    # Explicit options override the backend options
+    results = QutipBackend(sequence, config).run(ntraj=10)
+    assert results.n_measures == 30
+
+
+def test_qutip_backend_propagator(sequence):
+    config = pulser.EmulatorConfig(backend_options={"engine": "propagator"})
+    results = QutipBackend(sequence, config).run()
+    assert isinstance(results, CoherentResults)
+    ref = QutipBackend(sequence).run()
+    assert np.isclose(
+        abs(results.get_final_state().overlap(ref.get_final_state())),
+        1,
+        atol=1e-3,
+    )
+
+
+def test_qutip_backend_blockade_radius():
+    reg = pulser.Register.rectangle(1, 3, spacing=5, prefix="q")
+    seq = pulser.Sequence(reg, MockDevice)
+    seq.declare_channel("ryd", "rydberg_global")
+    seq.add(pulser.Pulse.ConstantPulse(500, 1, 0, 0), "ryd")
+    config = pulser.EmulatorConfig(backend_options={"blockade_radius": 6.0})
+    results = QutipBackend(seq, config).run()
+    # 'q0' and 'q2' can both be excited but not together with 'q1'
+    assert results.get_final_state().shape == (5, 1)
+    assert "110" not in results[-1].sampling_dist
+    assert "011" not in results[-1].sampling_dist
+
+
+def test_qutip_backend_cache(sequence, tmp_path):
+    cache = ResultsCache(tmp_path)
+    config = pulser.EmulatorConfig(backend_options={"cache": cache})
+    results = QutipBackend(sequence, config).run()
+    assert len(cache) == 1
+    assert (
+        QutipBackend(sequence, config).run().get_final_state()
+        == results.get_final_state()
+    )
+    assert len(cache) == 1
+    QutipBackend(sequence).run(cache=cache, atol=1e-9)
+    assert len(cache) == 2
@@ -20,8 +20,8 @@ import numpy as np
 import pytest
 import qutip
 
-from pulser.result import SampledResult
-from pulser_simulation.qutip_result import QutipResult
+from pulser.result import BitstringCounts, SampledResult
+from pulser_simulation.qutip_result import QutipResult, StackedQutipResults
 
 
 def test_sampled_result(patch_plt_show):
@@ -56,6 +56,119 @@ def test_sampled_result(patch_plt_show):
     result.plot_histogram()
 
 
+def test_sampled_result_many_atoms():
+    np.random.seed(0)
+    n_atoms = 80
+    outcomes = np.random.randint(2, size=(1000, n_atoms))
+    samples = Counter("".join(map(str, bits)) for bits in outcomes[:500])
+    # Some outcomes are repeated and some have no counts
+    samples.update("".join(map(str, bits)) for bits in outcomes[:10])
+    samples["0" * n_atoms] = 0
+    result = SampledResult(
+        atom_order=tuple(range(n_atoms)),
+        meas_basis="ground-rydberg",
+        bitstring_counts=samples,
+    )
+    dist = result.sampling_dist
+    assert list(dist) == sorted(b for b, c in samples.items() if c)
+    np.testing.assert_allclose(
+        list(dist.values()), [samples[b] / 510 for b in dist]
+    )
+    assert result.sampling_errors.keys() == dist.keys()
+    new_samples = result.get_samples(10_000)
+    assert sum(new_samples.values()) == 10_000
+    assert new_samples.keys() <= dist.keys()
+
+
+def test_bitstring_counts():
+    with pytest.raises(ValueError, match="must be a 2D array"):
+        BitstringCounts([0, 1])
+    with pytest.raises(ValueError, match="must be a 2D array"):
+        BitstringCounts([[0, 1]], size=3)
+    with pytest.raises(ValueError, match="only hold 0s and 1s"):
+        BitstringCounts([[0, 2]])
+    with pytest.raises(ValueError, match="one count per bitstring"):
+        BitstringCounts([[0, 1]], [1, 2])
+    with pytest.raises(ValueError, match="must be given"):
+        BitstringCounts.from_counter({})
+
+    counter = Counter({"110": 3, "001": 5, "011": 0, "111": 2})
+    counts = BitstringCounts.from_counter(counter)
+    assert counts.size == 3 and len(counts) == 3 and counts.n_samples == 10
+    assert counts.to_counter() == +counter
+    assert list(counts.to_counter()) == ["001", "110", "111"]
+    np.testing.assert_array_equal(counts.counts, [5, 3, 2])
+    np.testing.assert_array_equal(
+        counts.packed, np.array([[1 << 61], [6 << 61], [7 << 61]], np.uint64)
+    )
+    np.testing.assert_array_equal(counts.probabilities(), [0.5, 0.3, 0.2])
+    # Repeated bitstrings are merged
+    assert counts == BitstringCounts(
+        [[1, 1, 1], [0, 0, 1], [1, 1, 0], [1, 1, 1]], [1, 5, 3, 1]
+    )
+    assert counts != BitstringCounts([[0, 0, 1]], [10])
+    assert repr(counts) == (
+        "BitstringCounts(size=3, n_samples=10, n_bitstrings=3)"
+    )
+    assert counts.most_common(2) == [("001", 5), ("110", 3)]
+    assert counts.marginal([2, 0]).to_counter() == {"10": 5, "01": 3, "11": 2}
+    np.testing.assert_allclose(counts.mean(), [0.5, 0.5, 0.7])
+    np.testing.assert_allclose(
+        counts.correlation(),
+        [[0.5, 0.5, 0.2], [0.5, 0.5, 0.2], [0.2, 0.2, 0.7]],
+    )
+    np.testing.assert_array_equal(counts.ints, [1, 6, 7])
+    assert BitstringCounts.from_ints([7, 1, 6, 1], [2, 4, 3, 1], size=3) == (
+        counts
+    )
+    with pytest.raises(ValueError, match="1 to 64 bits"):
+        BitstringCounts.from_ints([1], size=65)
+    empty = BitstringCounts.from_counter({}, size=3)
+    assert len(empty) == 0 and empty.to_counter() == Counter()
+
+    # Conversions are lossless, also beyond 64 bits
+    np.random.seed(1)
+    bits = np.random.randint(2, size=(100, 130))
+    counts = BitstringCounts(bits)
+    assert counts.packed.shape == (len(counts), 3)
+    with pytest.raises(ValueError, match="at most 64 bits"):
+        counts.ints
+    assert BitstringCounts.from_counter(counts.to_counter()) == counts
+    assert counts.to_counter() == Counter(
+        "".join(map(str, row)) for row in bits
+    )
+    result = SampledResult(
+        tuple(range(130)), "digital", dict(counts.to_counter())
+    )
+    assert result.packed_counts == counts
+    np.random.seed(2)
+    packed_samples = result.get_packed_samples(500)
+    np.random.seed(2)
+    assert packed_samples.to_counter() == result.get_samples(500)
+
+
+def test_sparse_weights_sampling():
+    # Drawing from the non-zero weights gives the same samples as drawing
+    # from the weights of all the states
+    weights = np.zeros(16)
+    weights[[1, 4, 5, 11]] = [0.1, 0.2, 0.3, 0.4]
+    for last_weight in (0.0, 0.5):
+        weights[-1] = last_weight
+        result = QutipResult(
+            ("a", "b", "c", "d"),
+            "digital",
+            qutip.Qobj(np.sqrt(weights / weights.sum())),
+            True,
+        )
+        np.random.seed(123)
+        samples = result.get_samples(1000)
+        np.random.seed(123)
+        dist = np.random.multinomial(1000, result._weights())
+        assert samples == Counter(
+            {np.binary_repr(i, 4): dist[i] for i in np.flatnonzero(dist)}
+        )
+
+
 def test_qutip_result():
     qutrit_state = qutip.tensor(qutip.basis(3, 0), qutip.basis(3, 1))
     result = QutipResult(
@@ -127,3 +240,87 @@ def test_qutip_result():
         "10": 0.25,
         "11": 0.25,
     }
+
+
+def test_stacked_qutip_result():
+    with pytest.raises(ValueError, match=re.escape("of shape (T, D)")):
+        StackedQutipResults(
+            np.zeros((2, 4, 3)), [[2, 2], [1, 1]], ("a", "b"), "XY", True
+        )
+    kets = [qutip.rand_ket(4, dims=[[2, 2], [1, 1]]) for _ in range(3)]
+    stacked = StackedQutipResults(
+        np.stack([ket.full().ravel() for ket in kets]),
+        kets[0].dims,
+        ("a", "b"),
+        "ground-rydberg",
+        True,
+    )
+    assert stacked.is_ket and len(stacked) == 3
+    assert stacked[1] == QutipResult(
+        ("a", "b"), "ground-rydberg", kets[1], True
+    )
+    assert stacked[-1].state == kets[-1]
+    assert [res.state for res in stacked[:2]] == kets[:2]
+    with pytest.raises(IndexError):
+        stacked[3]
+
+    op = qutip.tensor(qutip.sigmax(), qutip.sigmaz())
+    expected = qutip.expect(op, kets)
+    np.testing.assert_allclose(stacked.expect(op), expected)
+    assert stacked.expect(op).dtype == float
+    non_herm = qutip.tensor(qutip.sigmap(), qutip.qeye(2))
+    np.testing.assert_allclose(
+        stacked.expect(non_herm), qutip.expect(non_herm, kets)
+    )
+
+    dms = [ket.proj() for ket in kets]
+    stacked_dms = StackedQutipResults(
+        np.stack([dm.full() for dm in dms]),
+        dms[0].dims,
+        ("a", "b"),
+        "ground-rydberg",
+        True,
+    )
+    assert not stacked_dms.is_ket
+    assert stacked_dms[0].state == dms[0]
+    np.testing.assert_allclose(
+        stacked_dms[0]._weights(), stacked[0]._weights()
+    )
+    # The states are processed by chunks
+    stacked_dms._CHUNK_SIZE = 16
+    np.testing.assert_allclose(stacked_dms.expect(op), expected)
+    np.testing.assert_allclose(
+        stacked_dms.expect(non_herm), qutip.expect(non_herm, dms)
+    )
+
+    # The weights are computed without building the QutipResults
+    for res in (stacked, stacked_dms):
+        np.testing.assert_allclose(res.weights(), [r._weights() for r in res])
+        np.testing.assert_allclose(res.weights(-1), res[-1]._weights())
+        np.random.seed(3)
+        samples = res.weights_result(1).get_packed_samples(100)
+        np.random.seed(3)
+        assert samples == res[1].get_packed_samples(100)
+
+
+@pytest.mark.parametrize(
+    "meas_basis, one_state", [("ground-rydberg", 0), ("digital", 2)]
+)
+def test_qutip_result_three_level_weights(meas_basis, one_state):
+    np.random.seed(7)
+    state = qutip.rand_ket(27, dims=[[3] * 3, [1] * 3])
+    probs = (np.abs(state.full()) ** 2).reshape(3, 3, 3)
+    result = QutipResult(("a", "b", "c"), meas_basis, state, True)
+    weights = result._weights()
+    for i in range(8):
+        bitstring = np.binary_repr(i, width=3)
+        # Each atom measured as 1 is in 'one_state', the others in any other
+        ind = np.ix_(
+            *(
+                [one_state]
+                if b == "1"
+                else [k for k in range(3) if k != one_state]
+                for b in bitstring
+            )
+        )
+        assert np.isclose(weights[i], probs[ind].sum())
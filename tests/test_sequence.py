@@ -13,9 +13,11 @@
 # limitations under the License.
 from __future__ import annotations
 
+import copy
 import dataclasses
 import itertools
 import json
+import pickle
 from typing import Any
 from unittest.mock import patch
 
@@ -1072,6 +1074,139 @@ def test_delay_min_duration(reg, device):
     )
 
 
+def test_add_delay_with_indexed_schedules(reg, mod_device):
+    seq = Sequence(reg, mod_device)
+    seq.declare_channel("ch0", "rydberg_local", initial_target="q0")
+    seq.declare_channel("ch1", "raman_local", initial_target="q1")
+    pulse = Pulse.ConstantPulse(100, 1, 0, 0)
+    for _ in range(50):
+        seq.add(pulse, "ch0")
+    ch0_schedule = seq._schedule["ch0"]
+    fall_time = pulse.fall_time(ch0_schedule.channel_obj)
+    assert ch0_schedule._last_pulse_ind({"q0"}) == len(ch0_schedule.slots) - 1
+    assert ch0_schedule._last_pulse_ind({"q1"}) is None
+    # The pulses on other targets don't delay the pulse
+    seq.add(pulse, "ch1")
+    assert seq._last("ch1").ti == 0
+    # With a common target, the pulse waits for the last pulse to ramp down
+    seq.target(["q0", "q1"], "ch1")
+    seq.add(pulse, "ch1")
+    assert seq._last("ch1").ti == seq.get_duration("ch0") + fall_time
+    seq.add(pulse, "ch0")
+    seq.target("q2", "ch1")
+    seq.add(pulse, "ch1", protocol="wait-for-all")
+    assert seq._last("ch1").ti == seq._last("ch0").tf + fall_time
+    assert ch0_schedule.last_target() == 0
+
+    tracker = seq._basis_ref["ground-rydberg"]["q0"].phase
+    tracker[100] = 1.0
+    tracker[50] = 0.5
+    tracker[100] = 2.0
+    assert tracker._times == [0, 50, 100]
+    assert tracker._phases == [0.0, 0.5, 2.0]
+    assert tracker[75] == tracker[50] == 0.5
+    assert list(tracker.changes(0, 100)) == [(50, 0.5), (100, 1.5)]
+
+
+def test_slot_store(reg, device):
+    seq = Sequence(reg, device)
+    seq.declare_channel("ch0", "rydberg_local", initial_target="q0")
+    pulse = Pulse.ConstantPulse(100, 1, 0, 0)
+    seq.add(pulse, "ch0")
+    seq.target("q1", "ch0")
+    seq.add(pulse, "ch0")
+    slots = seq._schedule["ch0"].slots
+    assert slots == [
+        _TimeSlot("target", -1, 0, {"q0"}),
+        _TimeSlot(pulse, 0, 100, {"q0"}),
+        _TimeSlot("target", 100, 220, {"q1"}),
+        _TimeSlot(pulse, 220, 320, {"q1"}),
+    ]
+    assert slots[-1] == slots[3] == list(slots)[3] == slots[::-1][0]
+    assert list(reversed(slots)) == slots[::-1]
+    assert slots.select(lambda t: t == "target") == slots[::2]
+    # The pulses and targets are stored only once
+    assert len(slots._types) == 2
+    assert len(slots._targets) == 2
+    assert slots[1].type is slots[3].type
+    with pytest.raises(IndexError, match="out of range"):
+        slots[4]
+
+    slots_copy = copy.deepcopy(slots)
+    assert slots_copy == slots
+    assert slots_copy._types is slots._types
+    # The copies don't modify the tables they share
+    slots_copy[2] = _TimeSlot("target", 100, 220, {"q2"})
+    assert slots_copy._targets is not slots._targets
+    assert len(slots._targets) == 2
+    slots_copy.insert(0, _TimeSlot("delay", -1, -1, {"q0"}))
+    del slots_copy[0]
+    assert slots_copy[2].targets == {"q2"}
+    assert slots_copy[:2] == slots[:2]
+    assert pickle.loads(pickle.dumps(slots_copy)) == slots_copy
+
+
+def test_deepcopy(reg, device, det_map):
+    seq = Sequence(reg, device)
+    seq.declare_channel("ch0", "rydberg_local", initial_target="q0")
+    seq.config_detuning_map(det_map, "dmm_0")
+    pulse = Pulse.ConstantPulse(100, 1, 0, 0)
+    seq.add(pulse, "ch0")
+    seq_str = str(seq)
+
+    seq_copy = copy.deepcopy(seq)
+    assert str(seq_copy) == seq_str
+    # The immutable parts are shared
+    assert seq_copy.register is seq.register
+    assert seq_copy.device is seq.device
+    assert seq_copy._calls is not seq._calls
+    assert seq_copy._calls[-1] is seq._calls[-1]
+    assert (
+        seq_copy._schedule["dmm_0"].detuning_map
+        is seq._schedule["dmm_0"].detuning_map
+    )
+    assert seq_copy._schedule["ch0"] is not seq._schedule["ch0"]
+    assert (
+        seq_copy._schedule["ch0"].slots._ti is seq._schedule["ch0"].slots._ti
+    )
+
+    # Modifying the copy leaves the original unchanged (and vice-versa)
+    seq_copy.target("q1", "ch0")
+    seq_copy.add(pulse, "ch0")
+    seq_copy.phase_shift(1.0, "q0", basis="ground-rydberg")
+    assert str(seq) == seq_str
+    assert seq._basis_ref["ground-rydberg"]["q0"].phase.last_phase == 0.0
+    assert len(seq._calls) == len(seq_copy._calls) - 3
+    seq.add(pulse, "ch0")
+    assert seq.get_duration() == 200
+    assert seq_copy._last("ch0").targets == {"q1"}
+    assert seq_copy._schedule["ch0"].last_target() > 0
+    assert seq._schedule["ch0"].last_target() == 0
+
+
+def test_static_hash(reg):
+    def make_seq(targets, duration=100):
+        seq = Sequence(reg, MockDevice)
+        seq.declare_channel("ch0", "rydberg_local", initial_target="q0")
+        var = seq.declare_variable("var")
+        seq.target(targets, "ch0")
+        seq.add(Pulse.ConstantPulse(duration, var, 0, 0), "ch0")
+        return seq
+
+    seq = make_seq({"q1", "q2", "q3"})
+    # Independent of the order of the items in sets
+    assert seq.static_hash() == make_seq({"q3", "q2", "q1"}).static_hash()
+    assert seq.static_hash() != make_seq({"q1", "q2"}).static_hash()
+    assert seq.static_hash() != make_seq({"q1", "q2", "q3"}, 200).static_hash()
+    # The last build doesn't change the hash
+    seq_hash = seq.static_hash()
+    built_seq = seq.build(var=1.0)
+    assert seq.static_hash() == seq_hash
+    assert built_seq.static_hash() != seq_hash
+    assert built_seq.static_hash() == seq.build(var=1.0).static_hash()
+    assert built_seq.static_hash() != seq.build(var=2.0).static_hash()
+
+
 def test_phase(reg, device):
     seq = Sequence(reg, device)
     seq.declare_channel("ch0", "raman_local", initial_target="q0")
@@ -1876,6 +2011,12 @@ def test_mappable_register(det_map, patch_plt_show, with_dmm):
     with pytest.raises(ValueError, match="already has a concrete register"):
         seq_.build(qubits={"q2": 20, "q0": 10, "q1": 0})
 
+    (seq_many,) = seq.build_many([{}], qubits={"q2": 20, "q0": 10, "q1": 0})
+    assert seq_many.register == seq_.register
+    assert str(seq_many) == str(seq_)
+    with pytest.raises(ValueError, match="'qubits' must be specified"):
+        seq.build_many([{}])
+
     # Also possible to build the default register
     with pytest.raises(ValueError, match="'qubits' must be specified"):
         seq.build()
@@ -2168,6 +2309,10 @@ def test_eom_mode(
     assert seq.current_phase_ref("q0", basis="ground-rydberg") == phase_ref % (
         2 * np.pi
     )
+    ch_schedule = seq._schedule["ch0"]
+    assert ch_schedule._in_eom_mode_flags(ch_schedule.slots) == [
+        ch_schedule.in_eom_mode(slot) for slot in ch_schedule.slots
+    ]
 
     # Test drawing in eom mode
     seq.draw()
@@ -13,9 +13,11 @@
 # limitations under the License.
 from __future__ import annotations
 
+import operator
 from copy import deepcopy
 from dataclasses import replace
 from typing import Literal
+from unittest.mock import patch
 
 import numpy as np
 import pytest
@@ -28,6 +30,7 @@ from pulser.pulse import Pulse
 from pulser.register.mappable_reg import MappableRegister
 from pulser.register.register_layout import RegisterLayout
 from pulser.sampler import sample
+from pulser.sampler._run_length import RunLengthArray
 from pulser.sequence._seq_drawer import draw_samples
 from pulser.waveforms import BlackmanWaveform, RampWaveform
 
@@ -51,6 +54,9 @@ def assert_same_samples_as_sim(seq: pulser.Sequence) -> None:
         return samples_dict
 
     assert_nested_dict_equality(got, truncate_samples(want))
+    # The compressed samples hold the same values
+    compressed = sample(seq, compressed=True).to_nested_dict()
+    assert_nested_dict_equality(compressed, got)
 
 
 def assert_nested_dict_equality(got: dict, want: dict) -> None:
@@ -126,6 +132,15 @@ def test_one_pulse_sampling():
         np.testing.assert_array_equal(got[key], want[i])
 
 
+def test_samples_static_hash(mod_seq):
+    samples = sample(mod_seq)
+    assert samples.static_hash() == sample(mod_seq).static_hash()
+    assert samples.compress().static_hash() == samples.static_hash()
+    assert sample(mod_seq, modulation=True).static_hash() != (
+        samples.static_hash()
+    )
+
+
 def test_table_sequence(seqs):
     """A table-driven test designed to be extended easily."""
     for seq in seqs:
@@ -409,6 +424,118 @@ def test_extend_duration(seq_rydberg):
     assert extended_short.slots == short.slots
 
 
+def test_run_length_array():
+    arr = np.array([0, 0, 1.5, 1.5, 1.5, -1, 0, 0])
+    rla = RunLengthArray.from_array(arr)
+    np.testing.assert_array_equal(rla.values, [0, 1.5, -1, 0])
+    np.testing.assert_array_equal(rla.run_ends, [2, 5, 6, 8])
+    np.testing.assert_array_equal(rla, arr)
+    assert len(rla) == rla.size == 8
+    assert rla[3] == rla[-4] == 1.5
+    with pytest.raises(IndexError, match="out of bounds"):
+        rla[8]
+    assert isinstance(rla[1:7], RunLengthArray)
+    np.testing.assert_array_equal(rla[1:7], arr[1:7])
+    np.testing.assert_array_equal(rla[::2], arr[::2])
+    assert rla.count_nonzero() == 4
+
+    other = RunLengthArray.from_array(np.arange(8) // 3)
+    for op in (operator.add, operator.sub, operator.mul):
+        res = op(rla, other)
+        assert isinstance(res, RunLengthArray)
+        np.testing.assert_array_equal(res, op(arr, np.arange(8) // 3))
+        np.testing.assert_array_equal(op(rla, 2.0), op(arr, 2.0))
+    np.testing.assert_array_equal(-rla, -arr)
+    assert (rla * 1j).dtype == complex
+    # Operations with dense arrays give dense arrays
+    assert isinstance(rla + arr, np.ndarray)
+    with pytest.raises(ValueError, match="different sizes"):
+        rla + rla[1:]
+
+    rla[1:4] += RunLengthArray.full(3, 2.0)
+    arr[1:4] += 2.0
+    rla[6:] = 5
+    arr[6:] = 5
+    np.testing.assert_array_equal(rla, arr)
+    np.testing.assert_array_equal(rla.values, [0, 2, 3.5, 1.5, -1, 5])
+    with pytest.raises(ValueError, match="Can't assign 2 elements"):
+        rla[:3] = RunLengthArray.zeros(2)
+    np.testing.assert_array_equal(
+        RunLengthArray.concatenate([rla, RunLengthArray.zeros(2)]),
+        np.pad(arr, (0, 2)),
+    )
+
+
+@pytest.mark.parametrize("with_eom", [True, False])
+def test_compressed_samples(mod_device, with_eom):
+    seq = pulser.Sequence(pulser.Register.square(2, prefix="q"), mod_device)
+    seq.declare_channel("ch0", "rydberg_global")
+    seq.declare_channel("ch1", "rydberg_local", initial_target="q0")
+    if with_eom:
+        seq.enable_eom_mode("ch0", amp_on=1, detuning_on=0.0)
+        seq.add_eom_pulse("ch0", 100, 0.0)
+        seq.disable_eom_mode("ch0")
+    seq.add(Pulse.ConstantPulse(20000, 1, -1, 0.5), "ch0")
+    seq.delay(5000, "ch0")
+    seq.add(Pulse.ConstantDetuning(BlackmanWaveform(500, np.pi), 2, 0), "ch0")
+    seq.add(Pulse.ConstantPulse(20000, 2, 1, 1.0), "ch0")
+    seq.add(Pulse.ConstantPulse(10000, 1, 0, 0.3), "ch1")
+    seq.target("q1", "ch1")
+    seq.add(Pulse.ConstantPulse(10000, 1, 2, 0.1), "ch1")
+
+    samples = sample(seq)
+    comp_samples = sample(seq, compressed=True)
+    assert comp_samples.compressed and not samples.compressed
+    for ch_samples, comp_ch_samples in zip(
+        samples.samples_list, comp_samples.samples_list
+    ):
+        assert comp_ch_samples.compressed
+        for qty in ("amp", "det", "phase"):
+            comp_qty_samples = getattr(comp_ch_samples, qty)
+            np.testing.assert_array_equal(
+                comp_qty_samples, getattr(ch_samples, qty)
+            )
+            # Only the Blackman waveform takes more than a few runs
+            assert comp_qty_samples.values.size <= 510
+        assert not comp_ch_samples.decompress().compressed
+    ch1_samples = comp_samples.channel_samples["ch1"]
+    assert ch1_samples.amp.values.size == 4
+    assert not ch1_samples.is_empty()
+
+    extended = comp_samples.extend_duration(samples.max_duration + 100)
+    assert extended.compressed
+    assert_nested_dict_equality(
+        extended.to_nested_dict(all_local=True),
+        samples.extend_duration(samples.max_duration + 100).to_nested_dict(
+            all_local=True
+        ),
+    )
+    nested = comp_samples.to_nested_dict()
+    assert isinstance(
+        nested["Global"]["ground-rydberg"]["amp"], RunLengthArray
+    )
+    assert_nested_dict_equality(nested, samples.to_nested_dict())
+
+    mod_duration = seq.get_duration(include_fall_time=True)
+    mod_samples = sample(seq, modulation=True, extended_duration=mod_duration)
+    comp_mod_samples = sample(
+        seq, modulation=True, extended_duration=mod_duration, compressed=True
+    )
+    assert comp_mod_samples.compressed
+    for ch_samples, comp_ch_samples in zip(
+        mod_samples.samples_list, comp_mod_samples.samples_list
+    ):
+        for qty in ("amp", "det", "phase"):
+            comp_qty_samples = getattr(comp_ch_samples, qty)
+            if not with_eom:
+                # Modulated samples with EOM blocks are expanded, but
+                # otherwise only the transitions get filtered
+                assert comp_qty_samples.values.size < mod_duration / 5
+            np.testing.assert_allclose(
+                comp_qty_samples, getattr(ch_samples, qty), atol=1e-12
+            )
+
+
 def test_phase_sampling(mod_device):
     reg = pulser.Register.from_coordinates(np.array([[0.0, 0.0]]), prefix="q")
     seq = pulser.Sequence(reg, mod_device)
@@ -447,6 +574,70 @@ def test_phase_sampling(mod_device):
 
     got_phase = sample(seq).channel_samples["ch0"].phase
     np.testing.assert_array_equal(expected_phase, got_phase)
+    # Each phase takes a single run in the compressed samples
+    got_phase = sample(seq, compressed=True).channel_samples["ch0"].phase
+    np.testing.assert_array_equal(got_phase.values, [1.0, 2.0, 3.0, 4.0])
+    np.testing.assert_array_equal(expected_phase, got_phase)
+
+
+@pytest.mark.parametrize("modulation", [False, True])
+def test_sample_batch(mod_device, modulation):
+    reg = pulser.Register.from_coordinates(
+        np.array([[0.0, 0.0], [5.0, 0.0]]), prefix="q"
+    )
+    seq = pulser.Sequence(reg, mod_device)
+    area = seq.declare_variable("area")
+    det = seq.declare_variable("det")
+    seq.declare_channel("ch0", "rydberg_global")
+    seq.declare_channel("ch1", "rydberg_local", initial_target="q1")
+    seq.add(Pulse.ConstantDetuning(BlackmanWaveform(500, area), det, 0), "ch0")
+    seq.add(Pulse.ConstantPulse(100, 1, -det, 1), "ch1")
+    seq.add(Pulse.ConstantPulse(100, area, 0, 1), "ch1")
+
+    vars_list = [dict(area=a, det=d) for a, d in [(1, 1), (2, -1), (3, 5)]]
+
+    def check_batch(**kwargs):
+        with patch(
+            "pulser.sampler.sampler.sample", wraps=sample
+        ) as sample_mock:
+            batch = pulser.sampler.sample_batch(
+                seq, vars_list, modulation, **kwargs
+            )
+        assert set(batch) == {"ch0", "ch1"}
+        for i, vars in enumerate(vars_list):
+            samples = sample(
+                seq.build(**vars), modulation=modulation, **kwargs
+            )
+            for ch, ch_samples in samples.channel_samples.items():
+                for key in ("amp", "det", "phase"):
+                    assert batch[ch][key].shape[0] == len(vars_list)
+                    np.testing.assert_allclose(
+                        batch[ch][key][i],
+                        getattr(ch_samples, key),
+                        rtol=0,
+                        atol=1e-12,
+                    )
+        return sample_mock.call_count
+
+    # Only the first element is built and sampled
+    assert check_batch() == 1
+    assert check_batch(extended_duration=1000) == 1
+    # The phase of a pulse can also be swept
+    seq.phase_shift(0.5, "q1", basis="ground-rydberg")
+    seq.add(Pulse.ConstantPulse(100, 1, 0, det), "ch1")
+    assert check_batch() == 1
+    # Otherwise, each element is built and sampled in turn
+    seq.phase_shift(det, "q1", basis="ground-rydberg")
+    seq.add(Pulse.ConstantPulse(100, 1, 0, 0), "ch1")
+    assert check_batch() == len(vars_list)
+
+    assert pulser.sampler.sample_batch(seq, []) == {}
+    # The schedule can't depend on the swept variables
+    seq.delay(det * 100 + 500, "ch0")
+    with pytest.raises(ValueError, match="differs from the one built with"):
+        pulser.sampler.sample_batch(seq, vars_list)
+    with pytest.raises(TypeError, match="Did not receive values for"):
+        pulser.sampler.sample_batch(seq, [dict(area=1)])
 
 
 @pytest.mark.parametrize("modulation", [True, False])
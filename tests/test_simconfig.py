@@ -126,3 +126,14 @@ def test_from_noise_model():
         assert SimConfig.from_noise_model(noise_model) == SimConfig(
             noise="SPAM", epsilon=0.1, epsilon_prime=0.4, eta=0.05
         )
+
+
+def test_noise_sampler():
+    noise_model = NoiseModel(noise_types=("doppler",), noise_sampler="sobol")
+    with pytest.warns(DeprecationWarning, match="is deprecated"):
+        config = SimConfig.from_noise_model(noise_model)
+    assert config == SimConfig(noise="doppler", noise_sampler="sobol")
+    assert "Noise sampler:         sobol" in str(config)
+    assert "Noise sampler" not in str(SimConfig(noise="doppler"))
+    with pytest.raises(ValueError, match="not a valid noise sampler"):
+        SimConfig(noise_sampler="qmc")
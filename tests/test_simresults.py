@@ -23,6 +23,7 @@ from pulser import Pulse, Register, Sequence
 from pulser.devices import DigitalAnalogDevice, MockDevice
 from pulser.waveforms import BlackmanWaveform
 from pulser_simulation import QutipEmulator, SimConfig
+from pulser_simulation.qutip_result import QutipResult
 from pulser_simulation.simresults import CoherentResults, NoisyResults
 
 
@@ -280,6 +281,53 @@ def test_expect_noisy(results_noisy):
     assert np.isclose(results_noisy.expect([op])[0][-1], 0.7466666666666666)
 
 
+@pytest.mark.parametrize("meas_basis", ["ground-rydberg", "digital"])
+def test_pseudo_density_diags(meas_basis):
+    np.random.seed(42)
+    atom_order = ("a", "b", "c")
+    states = [qutip.rand_ket(8, dims=[[2] * 3, [1] * 3]) for _ in range(4)]
+    meas_errors = {"epsilon": 0.1, "epsilon_prime": 0.03}
+    results = CoherentResults(
+        [QutipResult(atom_order, meas_basis, st, True) for st in states],
+        3,
+        meas_basis,
+        np.arange(4.0),
+        meas_basis,
+        meas_errors,
+    )
+    # Matches the sum of the measurement projectors of each bitstring
+    for t_index, res in enumerate(results):
+        weights = res._weights()
+        expected = sum(
+            weights[i]
+            * qutip.tensor(
+                [
+                    results._meas_projector(int(b))
+                    for b in np.binary_repr(i, width=3)
+                ]
+            )
+            for i in range(8)
+        )
+        np.testing.assert_allclose(
+            results._calc_pseudo_density(t_index).full(), expected.full()
+        )
+    ops = [
+        qutip.tensor(qutip.basis(2, 0).proj(), qutip.qeye(2), qutip.qeye(2)),
+        qutip.tensor(qutip.sigmaz(), qutip.sigmaz(), qutip.qeye(2)),
+        qutip.Qobj(np.diag(np.arange(8) * 1j), dims=[[2] * 3] * 2),
+    ]
+    expected = qutip.expect(
+        ops, [results._calc_pseudo_density(i) for i in range(4)]
+    )
+    values = results.expect(ops)
+    for vals, exp_vals in zip(values, expected):
+        assert vals.dtype == exp_vals.dtype
+        np.testing.assert_allclose(vals, exp_vals)
+    assert results.expect([]) == []
+    # The diagonals are calculated once, and stored on the instance
+    assert results._calc_pseudo_density_diags() is results._pseudo_dens_diags
+
+
 def test_plot(results_noisy, results):
     op = qutip.tensor([qutip.qeye(2), qutip.basis(2, 0).proj()])
     results_noisy.plot(op)
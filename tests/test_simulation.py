@@ -12,19 +12,33 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import itertools
+import os
 from collections import Counter
 from unittest.mock import patch
 
 import numpy as np
 import pytest
 import qutip
+import scipy.stats
 
 from pulser import Pulse, Register, Sequence
 from pulser.devices import AnalogDevice, DigitalAnalogDevice, MockDevice
 from pulser.register.register_layout import RegisterLayout
 from pulser.sampler import sampler
 from pulser.waveforms import BlackmanWaveform, ConstantWaveform, RampWaveform
-from pulser_simulation import QutipEmulator, SimConfig, Simulation
+from pulser_simulation import (
+    QutipEmulator,
+    ResultsCache,
+    SimConfig,
+    Simulation,
+)
+from pulser_simulation.qutip_result import StackedQutipResults
+from pulser_simulation.simresults import (
+    CoherentResults,
+    NoiseAveragedResult,
+    NoisyResults,
+)
 
 
 @pytest.fixture
@@ -1396,3 +1410,807 @@ def test_simulation_with_modulation(mod_device, reg, patch_plt_show):
         _sim.draw(draw_phase_area=True, fig_name="my_fig.pdf")
     # Drawing with modulation
     sim.draw()
+
+
+@pytest.mark.parametrize(
+    "channel_type, with_raman",
+    [
+        ("mw_global", False),
+        ("rydberg_global", False),
+        ("rydberg_global", True),
+    ],
+)
+def test_interaction_term_matches_pairwise(channel_type, with_raman):
+    reg = Register.from_coordinates(
+        [[0, 0], [5, 0], [0, 7], [6, 6], [-5, 3]], prefix="q"
+    )
+    seq = Sequence(reg, MockDevice)
+    if channel_type == "mw_global":
+        seq.set_magnetic_field(1.0, 1.0, 0.0)
+    seq.declare_channel("ch0", channel_type)
+    if with_raman:
+        seq.declare_channel("raman", "raman_global")
+        seq.add(Pulse.ConstantPulse(100, 1, 0, 0), "raman")
+    seq.add(Pulse.ConstantPulse(100, 1, 0, 0), "ch0")
+    sim = QutipEmulator.from_sequence(seq)
+    ham = sim._hamiltonian
+    ham._bad_atoms["q1"] = True
+
+    expected = 0
+    for q1, q2 in itertools.combinations(["q0", "q2", "q3", "q4"], r=2):
+        diff = reg.qubits[q1] - reg.qubits[q2]
+        dist = np.linalg.norm(diff)
+        if channel_type == "mw_global":
+            cosine = np.dot(diff, [1.0, 1.0]) / (dist * np.sqrt(2))
+            coeff = MockDevice.interaction_coeff_xy * (1 - 3 * cosine**2)
+            expected += (
+                0.5
+                * coeff
+                / dist**3
+                * ham.build_operator([("sigma_ud", [q1]), ("sigma_du", [q2])])
+            )
+        else:
+            expected += (
+                0.5
+                * MockDevice.interaction_coeff
+                / dist**6
+                * ham.build_operator([("sigma_rr", [q1, q2])])
+            )
+    excluded = np.array([q == "q1" for q in reg.qubit_ids])
+    term = ham._build_interaction_term(ham._interaction_coeffs(excluded))
+    assert term.dims == expected.dims
+    np.testing.assert_allclose(term.full(), expected.full())
+
+
+def test_static_operators_reused_across_runs(reg):
+    seq = Sequence(reg, MockDevice)
+    seq.declare_channel("ryd", "rydberg_global")
+    seq.add(Pulse.ConstantPulse(200, 1, 0.5, np.pi / 3), "ryd")
+    sim = QutipEmulator.from_sequence(
+        seq, config=SimConfig(noise=("doppler", "amplitude"))
+    )
+    ham = sim._hamiltonian
+    ops = [evo.qobj for evo in ham._hamiltonian.ops]
+    # Local amplitude (real and imaginary parts) and detuning terms
+    assert len(ops) == 3 * len(reg.qubits)
+    np.random.seed(123)
+    for _ in range(5):
+        ham._construct_hamiltonian()
+        new_ops = [evo.qobj for evo in ham._hamiltonian.ops]
+        assert all(new_op is op for new_op, op in zip(new_ops, ops))
+        h = sim.get_hamiltonian(100)
+        assert h.isherm
+    assert len(ham._interaction_terms) == 1
+
+
+@pytest.mark.parametrize(
+    "noise", [("doppler", "amplitude"), "SPAM", ("SPAM", "dephasing")]
+)
+def test_run_parallel(reg, noise):
+    seq = Sequence(reg, MockDevice)
+    seq.declare_channel("ryd", "rydberg_global")
+    seq.add(Pulse.ConstantPulse(200, 2, 0.5, 0), "ryd")
+    config = SimConfig(noise=noise, runs=6, samples_per_run=10, eta=0.3)
+    sim = QutipEmulator.from_sequence(
+        seq, config=config, evaluation_times="Minimal"
+    )
+    with pytest.raises(ValueError, match="must be a positive integer"):
+        sim.run(n_workers=0)
+
+    np.random.seed(1234)
+    res_one = sim.run(n_workers=1)
+    np.random.seed(1234)
+    res_two = sim.run(n_workers=2)
+    assert isinstance(res_two, NoisyResults)
+    assert res_one.n_measures == res_two.n_measures == 60
+    for r1, r2 in zip(res_one, res_two):
+        assert r1.bitstring_counts == r2.bitstring_counts
+        assert sum(r2.bitstring_counts.values()) == 60
+
+
+def test_run_trajectories(reg):
+    seq = Sequence(reg, MockDevice)
+    seq.declare_channel("ryd", "rydberg_global")
+    seq.add(Pulse.ConstantPulse(500, 3, 0, 0), "ryd")
+    config = SimConfig(noise="dephasing", dephasing_rate=2.0)
+    sim = QutipEmulator.from_sequence(
+        seq, config=config, evaluation_times="Minimal"
+    )
+    with pytest.raises(ValueError, match="must be 'mesolve' or 'mcsolve'"):
+        sim.run(noise_solver="sesolve")
+    obs = sim.build_operator([("sigma_rr", "global")])
+    exact = sim.run().expect([obs])[0][-1]
+
+    np.random.seed(123)
+    res = sim.run(noise_solver="mcsolve", ntraj=200)
+    assert isinstance(res, NoisyResults)
+    assert res.n_measures == 200 * config.samples_per_run
+    for r in res:
+        assert sum(r.bitstring_counts.values()) == res.n_measures
+    assert np.isclose(res.expect([obs])[0][-1], exact, atol=0.1)
+
+    # The trajectories are spread across processes
+    np.random.seed(123)
+    res_parallel = sim.run(noise_solver="mcsolve", ntraj=200, n_workers=2)
+    assert res_parallel.n_measures == res.n_measures
+
+    # Combined with noises requiring multiple runs
+    sim.set_config(
+        SimConfig(noise=("dephasing", "doppler"), runs=3, samples_per_run=2)
+    )
+    res = sim.run(noise_solver="mcsolve", ntraj=4, n_workers=2)
+    assert res.n_measures == 3 * 4 * 2
+    assert sum(res[-1].bitstring_counts.values()) == res.n_measures
+    # Without noise channels, the solver choice is irrelevant
+    sim.set_config(SimConfig(noise="doppler", runs=3, samples_per_run=2))
+    assert sim.run(noise_solver="mcsolve").n_measures == 6
+
+
+def test_run_propagator(reg):
+    seq = Sequence(reg, MockDevice)
+    seq.declare_channel("ryd", "rydberg_global")
+    seq.add(Pulse.ConstantPulse(500, 3, -1, 0), "ryd")
+    seq.add(Pulse.ConstantDetuning(BlackmanWaveform(200, np.pi), 1, 0), "ryd")
+    seq.declare_channel("ram", "raman_local", "control1")
+    seq.add(Pulse.ConstantPulse(300, 2, 0, 0.5), "ram")
+    seq.target("target", "ram")
+    seq.add(Pulse.ConstantPulse(100, 1, 2, -0.5), "ram")
+    sim = QutipEmulator.from_sequence(seq, evaluation_times=0.1)
+    with pytest.raises(ValueError, match="must be 'qutip' or 'propagator'"):
+        sim.run(engine="expm")
+
+    res = sim.run(engine="propagator")
+    assert isinstance(res, CoherentResults)
+    ref = sim.run(nsteps=10000, atol=1e-10, rtol=1e-8)
+    np.testing.assert_array_equal(res._sim_times, ref._sim_times)
+    for state, ref_state in zip(res.states, ref.states):
+        assert np.isclose(abs(state.overlap(ref_state)), 1, atol=1e-3)
+
+    # Arbitrary evaluation times fall within the constant steps
+    sim.set_evaluation_times([0.1234, 0.5, 0.777])
+    res = sim.run(engine="propagator")
+    ref = sim.run(nsteps=10000, atol=1e-10, rtol=1e-8)
+    assert len(res.states) == len(ref.states) == 5
+    for state, ref_state in zip(res.states, ref.states):
+        assert np.isclose(abs(state.overlap(ref_state)), 1, atol=1e-3)
+
+    # Beyond the dense diagonalization, sparse exponentials are used
+    with patch("pulser_simulation.simulation._MAX_DENSE_PROPAGATION_DIM", 1):
+        sparse_res = sim.run(engine="propagator")
+    for state, sparse_state in zip(res.states, sparse_res.states):
+        assert np.isclose(abs(state.overlap(sparse_state)), 1)
+
+    # Noises requiring multiple runs
+    sim.set_config(SimConfig(noise="doppler", runs=3, samples_per_run=5))
+    noisy_res = sim.run(engine="propagator")
+    assert isinstance(noisy_res, NoisyResults)
+    assert noisy_res.n_measures == 15
+
+    seq = Sequence(reg, MockDevice)
+    seq.declare_channel("ryd", "rydberg_global")
+    seq.add(Pulse.ConstantPulse(500, 3, -1, 0), "ryd")
+    sim = QutipEmulator.from_sequence(seq, config=SimConfig(noise="dephasing"))
+    with pytest.raises(NotImplementedError, match="only evolves state vec"):
+        sim.run(engine="propagator")
+
+
+def test_blockade_subspace():
+    reg = Register.rectangle(2, 3, spacing=5, prefix="q")
+    seq = Sequence(reg, MockDevice)
+    seq.declare_channel("ryd", "rydberg_global")
+    seq.add(Pulse.ConstantPulse(1000, 1, -1, 0), "ryd")
+    seq.declare_channel("loc", "rydberg_local", "q0")
+    seq.add(Pulse.ConstantPulse(300, 1, 1, 0.3), "loc")
+    full_sim = QutipEmulator.from_sequence(seq)
+    full_res = full_sim.run()
+
+    with pytest.raises(ValueError, match="must be a float, 'auto' or None"):
+        QutipEmulator.from_sequence(seq, blockade_radius="device")
+    with pytest.raises(ValueError, match="must be greater than zero"):
+        QutipEmulator.from_sequence(seq, blockade_radius=-1.0)
+
+    # A radius below the smallest distance keeps the full space
+    sim = QutipEmulator.from_sequence(seq, blockade_radius=4.0)
+    assert np.array_equal(sim._hamiltonian._subspace, np.arange(2**6))
+    res = sim.run()
+    np.testing.assert_allclose(res[-1]._weights(), full_res[-1]._weights())
+    full_obs = full_sim.build_operator([("sigma_rr", ["q0", "q2"])])
+    obs = sim.build_operator([("sigma_rr", ["q0", "q2"])])
+    assert obs.dims == [[2**6], [2**6]]
+    np.testing.assert_allclose(obs.full(), full_obs.full())
+    np.testing.assert_allclose(
+        res.expect([obs])[0], full_res.expect([full_obs])[0], atol=1e-8
+    )
+
+    # The blockade radius from the device forbids any pair of neighbours
+    sim = QutipEmulator.from_sequence(seq, blockade_radius="auto")
+    assert sim._hamiltonian._blockade_radius == pytest.approx(
+        MockDevice.rydberg_blockade_radius(1.0)
+    )
+    # Only one atom at most can be in the Rydberg state
+    subspace = sim._hamiltonian._subspace
+    assert list(subspace) == sorted([63] + [63 - 2**i for i in range(6)])
+    assert sim.initial_state == qutip.basis(subspace.size, subspace.size - 1)
+    # Operators are restricted to the subspace
+    full_op = full_sim.build_operator([(qutip.sigmax(), ["q1"])])
+    np.testing.assert_allclose(
+        sim.build_operator([(qutip.sigmax(), ["q1"])]).full(),
+        full_op.full()[np.ix_(subspace, subspace)],
+    )
+    res = sim.run()
+    assert res.get_final_state().shape == (subspace.size, 1)
+    assert all(
+        bitstr.count("1") <= 1 for bitstr in res.sample_final_state(1000)
+    )
+    # Close to the full emulation, where the blockade is almost perfect
+    np.testing.assert_allclose(
+        res[-1]._weights(), full_res[-1]._weights(), atol=0.02
+    )
+
+
+def test_blockade_subspace_not_supported(reg):
+    seq = Sequence(reg, MockDevice)
+    seq.declare_channel("mw", "mw_global")
+    seq.add(Pulse.ConstantPulse(100, 1, 0, 0), "mw")
+    with pytest.raises(NotImplementedError, match="'XY' basis"):
+        QutipEmulator.from_sequence(seq, blockade_radius=5.0)
+    seq = Sequence(reg, MockDevice)
+    seq.declare_channel("raman", "raman_global")
+    seq.add(Pulse.ConstantPulse(100, 1, 0, 0), "raman")
+    with pytest.raises(ValueError, match="can't be determined"):
+        QutipEmulator.from_sequence(seq, blockade_radius="auto")
+
+
+def test_results_cache(reg, tmp_path):
+    with pytest.raises(ValueError, match="must be a positive integer"):
+        ResultsCache(tmp_path, max_size=0)
+    cache = ResultsCache(tmp_path / "cache")
+    assert cache.directory.is_dir()
+    assert len(cache) == cache.size == 0
+
+    seq = Sequence(reg, MockDevice)
+    seq.declare_channel("ryd", "rydberg_global")
+    seq.add(Pulse.ConstantPulse(100, 1, 0, 0), "ryd")
+    sim = QutipEmulator.from_sequence(seq)
+    results = sim.run(cache=cache)
+    assert len(cache) == 1
+    # The stored results are returned without solving again
+    with patch.object(QutipEmulator, "_run_solver") as run_solver:
+        cached_results = QutipEmulator.from_sequence(seq).run(cache=cache)
+    run_solver.assert_not_called()
+    assert cached_results.get_final_state() == results.get_final_state()
+    np.testing.assert_array_equal(
+        cached_results._sim_times, results._sim_times
+    )
+    # Any change to the emulation is a miss
+    sim.set_evaluation_times("Minimal")
+    sim.run(cache=cache)
+    sim.run(cache=cache, atol=1e-9)
+    assert len(cache) == 3
+
+    # Noisy results also depend on the random state, which is left as it
+    # would be without the cache
+    sim.set_config(SimConfig(noise="doppler", runs=2))
+    np.random.seed(1)
+    noisy_results = sim.run(cache=cache)
+    random_state = np.random.get_state()
+    np.random.seed(1)
+    assert sim.run(cache=cache)[-1] == noisy_results[-1]
+    assert len(cache) == 4
+    np.testing.assert_array_equal(np.random.get_state()[1], random_state[1])
+    sim.run(cache=cache)
+    assert len(cache) == 5
+    # Parallel runs draw different noise than sequential ones
+    np.random.seed(1)
+    parallel_results = sim.run(cache=cache, n_workers=2)
+    assert len(cache) == 6
+    np.random.seed(1)
+    assert parallel_results[-1] == sim.run(n_workers=2)[-1]
+
+    # Unreadable entries are discarded
+    key = sim._get_cache_key("mesolve", "qutip", {}, False)
+    (cache.directory / f"{key}.pkl").write_bytes(b"")
+    assert key in cache
+    assert cache.get(key) is None
+    assert key not in cache
+
+    # The least recently used results are evicted first
+    small_cache = ResultsCache(tmp_path / "small")
+    for i in range(3):
+        small_cache.put(f"res{i}", results)
+        # Sets the time of last use explicitly, not to depend on the
+        # resolution of the file system's timestamps
+        os.utime(small_cache.directory / f"res{i}.pkl", ns=(i, i))
+    entry_size = small_cache.size // 3
+    small_cache.get("res0")
+    small_cache._max_size = 3 * entry_size
+    small_cache.put("res3", results)
+    assert len(small_cache) == 3
+    assert "res1" not in small_cache
+    assert "res0" in small_cache and "res3" in small_cache
+    # Results larger than the limit are not stored
+    small_cache._max_size = entry_size - 1
+    small_cache.put("res4", results)
+    assert "res4" not in small_cache
+    small_cache.clear()
+    assert len(small_cache) == 0
+
+
+@pytest.mark.parametrize(
+    "noise, engine",
+    [((), "qutip"), (("dephasing",), "qutip"), ((), "propagator")],
+)
+def test_state_callback(reg, noise, engine):
+    seq = Sequence(reg, MockDevice)
+    seq.declare_channel("ryd", "rydberg_global")
+    seq.add(Pulse.ConstantPulse(100, 1, 0, 0), "ryd")
+    seq.add(Pulse.ConstantPulse(60, 2, -1, 0), "ryd")
+    sim = QutipEmulator.from_sequence(
+        seq, config=SimConfig(noise=noise, dephasing_rate=0.1)
+    )
+    results = sim.run(engine=engine)
+    streamed = []
+    final_results = sim.run(
+        engine=engine,
+        state_callback=lambda t, res: streamed.append((t, res.sampling_dist)),
+    )
+    # The callback receives what the results would hold at each time
+    assert [t for t, _ in streamed] == list(results._sim_times)
+    for (_, dist), res in zip(streamed, results):
+        assert dist.keys() == res.sampling_dist.keys()
+        np.testing.assert_allclose(
+            list(dist.values()), list(res.sampling_dist.values()), atol=1e-9
+        )
+    # Only the final state is kept
+    assert len(final_results) == 1
+    np.testing.assert_array_equal(
+        final_results._sim_times, results._sim_times[-1:]
+    )
+    np.testing.assert_allclose(
+        final_results.get_final_state().full(),
+        results.get_final_state().full(),
+        atol=1e-9,
+    )
+
+
+def test_state_callback_not_supported(reg, tmp_path):
+    seq = Sequence(reg, MockDevice)
+    seq.declare_channel("ryd", "rydberg_global")
+    seq.add(Pulse.ConstantPulse(100, 1, 0, 0), "ryd")
+    sim = QutipEmulator.from_sequence(seq)
+    with pytest.raises(ValueError, match="can't be combined with a `cache`"):
+        sim.run(
+            state_callback=lambda t, res: None,
+            cache=ResultsCache(tmp_path),
+        )
+    sim.set_config(SimConfig(noise="doppler"))
+    with pytest.raises(NotImplementedError, match="returning CoherentResults"):
+        sim.run(state_callback=lambda t, res: None)
+
+
+@pytest.mark.parametrize(
+    "noise, engine",
+    [((), "qutip"), (("dephasing",), "qutip"), ((), "propagator")],
+)
+def test_stack_states(reg, noise, engine, tmp_path):
+    seq = Sequence(reg, MockDevice)
+    seq.declare_channel("ryd", "rydberg_global")
+    seq.add(Pulse.ConstantPulse(100, 1, 0, 0), "ryd")
+    seq.add(Pulse.ConstantPulse(60, 2, -1, 0), "ryd")
+    sim = QutipEmulator.from_sequence(
+        seq, config=SimConfig(noise=noise, dephasing_rate=0.1)
+    )
+    results = sim.run(engine=engine)
+    obs = [
+        sim.build_operator([("sigma_rr", ["control1"])]),
+        sim.build_operator([("sigma_gr", "global")]),
+    ]
+    streamed_times = []
+    for stack_states in (True, tmp_path / "states.npy"):
+        stacked_results = sim.run(
+            engine=engine,
+            stack_states=stack_states,
+            state_callback=lambda t, res: streamed_times.append(t),
+        )
+        assert isinstance(stacked_results._results, StackedQutipResults)
+        assert stacked_results._results.is_ket == (noise == ())
+        assert len(stacked_results) == len(results)
+        np.testing.assert_array_equal(
+            stacked_results._sim_times, results._sim_times
+        )
+        # The callback is still called with each state
+        assert streamed_times == list(results._sim_times)
+        streamed_times.clear()
+        for res, stacked_res in zip(
+            results.expect(obs), stacked_results.expect(obs)
+        ):
+            np.testing.assert_allclose(stacked_res, res, atol=1e-9)
+        t = results._sim_times[1]
+        np.testing.assert_allclose(
+            stacked_results.get_state(t).full(),
+            results.get_state(t).full(),
+            atol=1e-9,
+        )
+        np.random.seed(123)
+        samples = stacked_results.sample_state(t)
+        np.random.seed(123)
+        assert samples == results.sample_state(t)
+    # The states were written to the file
+    np.testing.assert_array_equal(
+        np.load(tmp_path / "states.npy"), stacked_results._results.states
+    )
+
+    with pytest.raises(ValueError, match="can't be combined with a `cache`"):
+        sim.run(stack_states=True, cache=ResultsCache(tmp_path / "cache"))
+    sim.set_config(SimConfig(noise="doppler"))
+    with pytest.raises(NotImplementedError, match="can only be stacked"):
+        sim.run(stack_states=True)
+
+
+def test_noisy_run_counts(reg):
+    seq = Sequence(reg, MockDevice)
+    seq.declare_channel("ryd", "rydberg_global")
+    seq.add(Pulse.ConstantPulse(100, 1, 0, 0), "ryd")
+    sim = QutipEmulator.from_sequence(
+        seq,
+        config=SimConfig(noise="doppler", runs=3, samples_per_run=10),
+        evaluation_times=0.5,
+    )
+    np.random.seed(4)
+    counts = sim._run_noisy_realisation(None, 10, qutip.Options())
+    assert counts.shape == (len(sim.evaluation_times), 2**3)
+    np.testing.assert_array_equal(counts.sum(axis=1), 10)
+    # The counts of each time match the samples of the coherent results
+    np.random.seed(4)
+    sim._hamiltonian._construct_hamiltonian()
+    coherent_results = sim._run_solver(qutip.Options())
+    for t_index, t in enumerate(sim.evaluation_times):
+        samples = coherent_results.sample_state(t, n_samples=10)
+        row = counts.getrow(t_index)
+        assert samples == {
+            np.binary_repr(i, 3): c for i, c in zip(row.indices, row.data)
+        }
+
+    results = sim.run()
+    assert isinstance(results, NoisyResults)
+    assert results.n_measures == 30
+    assert all(sum(res.bitstring_counts.values()) == 30 for res in results)
+
+
+def test_average_probabilities(reg):
+    seq = Sequence(reg, MockDevice)
+    seq.declare_channel("ryd", "rydberg_global")
+    seq.add(Pulse.ConstantPulse(1000, 3, 0, 0), "ryd")
+    sim = QutipEmulator.from_sequence(
+        seq,
+        config=SimConfig(
+            noise=("doppler", "SPAM"),
+            eta=0,
+            epsilon=0.1,
+            epsilon_prime=0.05,
+            runs=4,
+            samples_per_run=5,
+        ),
+        evaluation_times=0.5,
+    )
+    meas_errors = {"epsilon": 0.1, "epsilon_prime": 0.05}
+    np.random.seed(3)
+    results = sim.run(average_probabilities=True)
+    assert isinstance(results, NoisyResults)
+    assert results.n_measures == 20
+    assert all(isinstance(res, NoiseAveragedResult) for res in results)
+
+    # The probabilities are the mean of those of each realisation
+    np.random.seed(3)
+    run_probs = []
+    for _ in range(4):
+        sim._hamiltonian._construct_hamiltonian()
+        run_probs.append(
+            sim._run_solver(
+                qutip.Options(max_step=0.5), meas_errors=meas_errors
+            )._get_meas_probabilities()
+        )
+    for t_index, res in enumerate(results):
+        np.testing.assert_allclose(
+            res._to_dense(res.probabilities),
+            np.mean(run_probs, axis=0)[t_index],
+        )
+        np.testing.assert_allclose(
+            res._to_dense(res.errors),
+            np.std(run_probs, axis=0)[t_index] / 2,
+            atol=1e-8,
+        )
+        assert res.sampling_dist == pytest.approx(
+            {
+                np.binary_repr(i, 3): p
+                for i, p in enumerate(res.probabilities)
+                if p > 0
+            }
+        )
+        assert set(res.sampling_errors) == set(res.sampling_dist)
+    # Shots are only drawn on request
+    assert sum(results[-1].get_samples(100).values()) == 100
+
+    # The error bars come from the errors of the probabilities
+    obs = qutip.tensor([qutip.sigmaz()] * 3)
+    with patch("matplotlib.pyplot.errorbar") as errorbar:
+        results.plot(obs)
+    _, values, errors = errorbar.call_args.args
+    np.testing.assert_allclose(values, results.expect([obs])[0])
+    # |r> is the first basis state, so the bitstrings are in reverse order
+    np.testing.assert_allclose(
+        errors,
+        [
+            np.sqrt(
+                np.sum((res._to_dense(res.errors)[::-1] * obs.diag()) ** 2)
+            )
+            for res in results
+        ],
+    )
+
+    # The measurement errors flip each bit independently
+    coherent_results = QutipEmulator.from_sequence(
+        seq, evaluation_times=[0.0]
+    ).run()
+    coherent_results._meas_errors = meas_errors
+    probs = coherent_results._get_meas_probabilities()[0]
+    assert probs[0] == pytest.approx(0.9**3)
+    assert probs[0b011] == pytest.approx(0.9 * 0.1**2)
+    assert np.sum(probs) == pytest.approx(1)
+
+
+def test_average_probabilities_blockade():
+    reg = Register.rectangle(2, 3, spacing=5, prefix="q")
+    seq = Sequence(reg, MockDevice)
+    seq.declare_channel("ryd", "rydberg_global")
+    seq.add(Pulse.ConstantPulse(1000, 1, -1, 0), "ryd")
+    sim = QutipEmulator.from_sequence(
+        seq,
+        config=SimConfig(noise="doppler", runs=3, samples_per_run=1),
+        evaluation_times=0.5,
+        blockade_radius="auto",
+    )
+    np.random.seed(5)
+    results = sim.run(average_probabilities=True)
+    # Only the bitstrings of the blockade subspace are stored
+    allowed = [0] + [2**i for i in range(6)]
+    for res in results:
+        assert set(res.indices) <= set(allowed)
+        assert len(res.probabilities) == len(res.errors) == len(res.indices)
+    run_count = sim._run_noisy_realisation(
+        None, 1, qutip.Options(max_step=0.5), average_probabilities=True
+    )
+    assert run_count.shape == (2 * len(results), 2**6)
+    assert set(run_count.indices) <= set(allowed)
+
+    # The probabilities are the mean of those of each realisation
+    np.random.seed(5)
+    run_probs = []
+    for _ in range(3):
+        sim._hamiltonian._construct_hamiltonian()
+        run_probs.append(
+            sim._run_solver(
+                qutip.Options(max_step=0.5)
+            )._get_meas_probabilities()
+        )
+    for t_index, res in enumerate(results):
+        np.testing.assert_allclose(
+            res._weights(), np.mean(run_probs, axis=0)[t_index]
+        )
+        np.testing.assert_allclose(
+            res._to_dense(res.errors),
+            np.std(run_probs, axis=0)[t_index] / np.sqrt(3),
+            atol=1e-8,
+        )
+    assert all(
+        bitstr.count("1") <= 1 for bitstr in results[-1].get_samples(100)
+    )
+
+
+@pytest.mark.parametrize(
+    "noise_sampler", ["stratified", "sobol", "halton", "antithetic"]
+)
+def test_noise_sampler(reg, noise_sampler):
+    seq = Sequence(reg, MockDevice)
+    seq.declare_channel("ryd", "rydberg_global")
+    seq.add(Pulse.ConstantPulse(100, 1, 0, 0), "ryd")
+    seq.add(Pulse.ConstantPulse(100, 2, 0, 0), "ryd")
+    config = SimConfig(
+        noise=("SPAM", "doppler", "amplitude"),
+        eta=0.3,
+        runs=8,
+        samples_per_run=1,
+        noise_sampler=noise_sampler,
+    )
+    sim = QutipEmulator.from_sequence(seq, config=config)
+    ham = sim._hamiltonian
+    # 3 preparation errors, 3 detunings and 1 amplitude per pulse
+    assert ham._noise_dims() == (3, 3, 2)
+    np.random.seed(1)
+    points = ham._draw_noise_points(8)
+    assert points.shape == (8, 8)
+    assert np.all((points > 0) & (points < 1))
+    if noise_sampler == "stratified":
+        # Each run falls in a different eighth of every dimension
+        np.testing.assert_array_equal(
+            np.sort(np.floor(points * 8), axis=0),
+            np.tile(np.arange(8)[:, None], (1, 8)),
+        )
+    if noise_sampler == "antithetic":
+        np.testing.assert_allclose(points[1::2], 1 - points[::2])
+
+    ham._construct_hamiltonian(noise_point=points[0])
+    assert list(ham._bad_atoms.values()) == list(points[0, :3] < 0.3)
+    detunings = np.array(list(ham._doppler_detune.values()))
+    np.testing.assert_allclose(
+        scipy.stats.norm.cdf(detunings / config.doppler_sigma), points[0, 3:6]
+    )
+    np.testing.assert_allclose(
+        scipy.stats.norm.cdf((ham._amp_fluctuations - 1) / config.amp_sigma),
+        points[0, 6:],
+    )
+
+    # The runs are reproducible and use the sampled points
+    np.random.seed(1)
+    res1 = sim.run()
+    np.random.seed(1)
+    res2 = sim.run()
+    assert res1[-1].bitstring_counts == res2[-1].bitstring_counts
+    assert res1.n_measures == 8
+    with patch.object(
+        sim._hamiltonian,
+        "_update_noise",
+        wraps=sim._hamiltonian._update_noise,
+    ) as update_noise:
+        sim.run()
+    used_points = [call.args[0] for call in update_noise.call_args_list]
+    assert len(used_points) == 8
+    assert all(point.shape == (8,) for point in used_points)
+
+    # Without Doppler nor amplitude noise, only the preparation errors
+    # are sampled
+    sim.set_config(
+        SimConfig(noise="SPAM", eta=0.3, runs=8, noise_sampler=noise_sampler)
+    )
+    assert sim._hamiltonian._noise_dims() == (3, 0, 0)
+    assert isinstance(sim.run(), NoisyResults)
+
+
+def test_target_error(reg):
+    seq = Sequence(reg, MockDevice)
+    seq.declare_channel("ryd", "rydberg_global")
+    seq.add(Pulse.ConstantPulse(1000, 3, 0, 0), "ryd")
+    sim = QutipEmulator.from_sequence(
+        seq,
+        config=SimConfig(
+            noise="doppler", temperature=300, runs=4, samples_per_run=1
+        ),
+        evaluation_times=0.5,
+    )
+    with pytest.raises(ValueError, match="`target_error` must be"):
+        sim.run(target_error=0)
+    with pytest.raises(ValueError, match="`max_runs` must be"):
+        sim.run(target_error=0.1, max_runs=0)
+    for max_runs in (0, "5", 2.0):
+        with pytest.raises(ValueError, match="`max_runs` must be"):
+            sim.run(max_runs=max_runs)
+    with pytest.raises(ValueError, match="only be given along with a"):
+        sim.run(max_runs=5)
+    with pytest.raises(NotImplementedError, match="requires multiple runs"):
+        QutipEmulator.from_sequence(seq).run(target_error=0.1)
+
+    results = sim.run()
+    assert results.n_runs == 4
+    assert results.standard_error is None
+
+    # Without reaching the target, batches of runs are added until the
+    # maximum number of runs
+    np.random.seed(2)
+    with patch.object(
+        sim, "_run_noisy_realisation", wraps=sim._run_noisy_realisation
+    ) as run_realisation:
+        results = sim.run(
+            target_error=1e-9, max_runs=10, average_probabilities=True
+        )
+    assert run_realisation.call_count == 10
+    assert results.n_runs == 10
+    assert results.n_measures == 10
+    # The standard error is the largest among the final probabilities
+    np.random.seed(2)
+    run_probs = []
+    for _ in range(10):
+        sim._hamiltonian._construct_hamiltonian()
+        run_probs.append(
+            sim._run_solver(
+                qutip.Options(max_step=0.5)
+            )._get_meas_probabilities()[-1]
+        )
+    assert results.standard_error == pytest.approx(
+        np.max(np.std(run_probs, axis=0, ddof=1)) / np.sqrt(10)
+    )
+    # ...or among the values of the observables
+    obs = qutip.tensor([qutip.sigmaz()] * 3)
+    np.random.seed(2)
+    results = sim.run(
+        target_error=1e-9,
+        max_runs=10,
+        average_probabilities=True,
+        error_observables=[obs],
+    )
+    # |r> is the first basis state, so a "1" contributes a -1
+    run_values = np.array(run_probs) @ obs.diag()[::-1]
+    assert results.standard_error == pytest.approx(
+        np.std(run_values, ddof=1) / np.sqrt(10)
+    )
+    with pytest.raises(ValueError, match="non-diagonal"):
+        sim.run(
+            target_error=0.1,
+            error_observables=[qutip.tensor([qutip.sigmax()] * 3)],
+        )
+
+    # The runs stop as soon as the target is reached
+    def standard_error(values):
+        return np.std(values, ddof=1) / np.sqrt(len(values))
+
+    target_error = standard_error(run_values[:8]) * (1 + 1e-6)
+    n_runs = 4 if standard_error(run_values[:4]) <= target_error else 8
+    np.random.seed(2)
+    results = sim.run(
+        target_error=target_error,
+        max_runs=10,
+        average_probabilities=True,
+        error_observables=[obs],
+    )
+    assert results.n_runs == n_runs
+    assert results.standard_error == pytest.approx(
+        standard_error(run_values[:n_runs])
+    )
+
+    # The runs sharing the badly prepared atoms count separately
+    sim.set_config(SimConfig(noise="SPAM", eta=0.5, runs=6))
+    results = sim.run(target_error=1e-9, max_runs=12)
+    assert results.n_runs == 12
+    assert results.n_measures == 12 * 5
+    assert sum(results[-1].bitstring_counts.values()) == 12 * 5
+
+    # With a correlated noise sampler, the error comes from the spread of
+    # the batches' means
+    sim.set_config(
+        SimConfig(
+            noise="doppler",
+            temperature=300,
+            runs=4,
+            samples_per_run=1,
+            noise_sampler="stratified",
+        )
+    )
+    run_counts = []
+
+    def run_realisation(*args, **kwargs):
+        run_counts.append(sim_run_realisation(*args, **kwargs))
+        return run_counts[-1]
+
+    sim_run_realisation = sim._run_noisy_realisation
+    with patch.object(sim, "_run_noisy_realisation", run_realisation):
+        # A single batch isn't enough to estimate the error
+        results = sim.run(
+            target_error=1e-9, max_runs=4, average_probabilities=True
+        )
+        assert results.n_runs == 4 and results.standard_error is None
+        run_counts.clear()
+        results = sim.run(
+            target_error=1e-9,
+            max_runs=12,
+            average_probabilities=True,
+            error_observables=[obs],
+        )
+    assert results.n_runs == 12
+    # The sums of the probabilities at the final time, in a single run
+    run_values = np.array(
+        [
+            count.getrow(count.shape[0] // 2 - 1).toarray()[0]
+            for count in run_counts
+        ]
+    ) @ (obs.diag()[::-1])
+    batch_means = run_values.reshape(3, 4).mean(axis=1)
+    assert results.standard_error == pytest.approx(standard_error(batch_means))